@@ -0,0 +1,77 @@
+"""Micro-benchmark cached NIC attribute access (legacy __getattr__ dispatch versus property descriptors).
+
+Run from the repository root::
+
+    python -m benchmarks.bench_attribute_access [accesses]
+
+"""
+
+import math
+import sys
+import time
+import timeit
+
+from benchmarks.scenarios import synthetic_host
+from win_nic import NetworkAdapters, Nic
+
+
+class LegacyNic:
+
+    """NIC attribute cache read the way Nic.__getattr__ used to read it (before property descriptors)."""
+
+    _wmic_properties = Nic._wmic_properties
+
+    def __init__(self, nic):
+        self.index = nic.index
+        self._cache = dict(nic._cache)  # pylint: disable=protected-access
+
+    def __getattr__(self, item):
+        if item not in self._wmic_properties:
+            raise AttributeError(f"'Nic' object has no attribute '{item}'")
+
+        try:
+            retval, expires = self._cache[item]
+        except KeyError:
+            pass
+        else:
+            if time.monotonic() < expires:
+                if retval is None:
+                    raise AttributeError(f"wmic did not return value for attribute "
+                                         f"'{self._wmic_properties[item][0]}'")
+                return retval
+        raise LookupError(item)
+
+    def __setattr__(self, key, value):
+        if key in self._wmic_properties:
+            raise AttributeError(f"'Nic' attribute '{key}' is not settable")
+
+        object.__setattr__(self, key, value)
+
+
+def main(access_count=200000, repeat=5):
+    """Print the best-of-N nanoseconds per cached access of each attribute."""
+    snapshot = NetworkAdapters(backend=synthetic_host(1)).nic_table[0]
+    nic = Nic(snapshot.index, cache_ttls=dict.fromkeys(Nic._wmic_properties, math.inf), snapshot=snapshot)
+    legacy_nic = LegacyNic(nic)
+    items = [item for item, (value, _) in nic._cache.items()  # pylint: disable=protected-access
+             if item in Nic._wmic_properties and value is not None]
+
+    def best(statement, namespace):
+        return min(timeit.repeat(statement, globals=namespace, number=access_count, repeat=repeat)) / access_count * 1e9
+
+    print(f'{access_count} cached accesses per attribute, best of {repeat} (ns per access)')
+    print(f'{"attribute":<28}{"__getattr__":>12}{"descriptor":>12}')
+    totals = [0.0, 0.0]
+    for item in items:
+        legacy = best(f'nic.{item}', {'nic': legacy_nic})
+        descriptor = best(f'nic.{item}', {'nic': nic})
+        totals[0] += legacy
+        totals[1] += descriptor
+        print(f'{item:<28}{legacy:>12.1f}{descriptor:>12.1f}')
+    print(f'{"mean":<28}{totals[0] / len(items):>12.1f}{totals[1] / len(items):>12.1f}')
+    print(f'{"set index":<28}{best("nic.index = 0", {"nic": legacy_nic}):>12.1f}'
+          f'{best("nic.index = 0", {"nic": nic}):>12.1f}')
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:2]])
@@ -0,0 +1,71 @@
+"""Benchmark memory per adapter and filter time of NIC inventory representations.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_nic_table [hosts] [adapters per host]
+
+"""
+
+import sys
+import timeit
+import tracemalloc
+
+from benchmarks.scenarios import synthetic_host
+from win_nic import NetworkAdapters, NicTable
+from win_nic.enums.nic_net_connection_status import NicNetConnectionStatus
+
+
+def _traced_size(build):
+    """Get the result of a callable and the bytes it allocated (and kept)."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return result, size
+
+
+def _enumerate(hosts):
+    return [NetworkAdapters(backend=host) for host in hosts]
+
+
+def main(host_count=250, adapter_count=40, repeat=5):
+    """Print the memory per adapter and filter time of each representation."""
+    hosts = [synthetic_host(adapter_count) for _ in range(host_count)]
+    total = host_count * adapter_count
+    representations = [
+        ('dicts of strings', lambda: [{field: str(value) for field, value in snapshot._asdict().items()}
+                                      for adapters in _enumerate(hosts) for snapshot in adapters.nic_table.values()]),
+        ('Nic objects', lambda: [nic for adapters in _enumerate(hosts) for nic in adapters.get_nics()]),
+        ('NicSnapshot list', lambda: [snapshot for adapters in _enumerate(hosts)
+                                      for snapshot in adapters.nic_table.values()]),
+        ('NicTable', lambda: NicTable(snapshot for adapters in _enumerate(hosts)
+                                      for snapshot in adapters.nic_table.values())),
+    ]
+    print(f'{host_count} hosts x {adapter_count} adapters')
+    print(f'{"representation":<20}{"bytes/adapter":>14}')
+    inventories = {}
+    for name, build in representations:
+        inventories[name], size = _traced_size(build)
+        print(f'{name:<20}{size / total:>14.0f}')
+
+    connected = NicNetConnectionStatus.CONNECTED
+    dicts, snapshots, table = inventories['dicts of strings'], inventories['NicSnapshot list'], inventories['NicTable']
+    filters = [
+        ('dicts of strings', lambda: [row for row in dicts if row['physical_adapter'] == 'True'
+                                      and row['net_connection_status'] == str(connected)]),
+        ('NicSnapshot list', lambda: [snapshot for snapshot in snapshots if snapshot.physical_adapter
+                                      and snapshot.net_connection_status == connected]),
+        ('NicTable (cold)', lambda: NicTable(snapshots).where(physical_adapter=True, net_connection_status=connected)),
+        ('NicTable (warm)', lambda: table.where(physical_adapter=True, net_connection_status=connected)),
+        ('NicTable (warm, rows)', lambda: list(table.where(physical_adapter=True, net_connection_status=connected))),
+        ('NicTable count', lambda: table.count(physical_adapter=True, net_connection_status=connected)),
+    ]
+    print(f'\n{"filter (physical and connected)":<32}{"best time":>12}')
+    for name, run_filter in filters:
+        best = min(timeit.repeat(run_filter, number=1, repeat=repeat))
+        print(f'{name:<32}{best * 1000:>9.2f} ms')
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:3]])
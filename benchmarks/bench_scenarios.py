@@ -0,0 +1,30 @@
+"""Benchmark process counts and wall time of the Nic and NetworkAdapters API scenarios.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_scenarios [adapter count] [simulated latency per process in ms]
+
+Exits with status 1 if a scenario launches more processes than its budget.
+
+"""
+
+import sys
+
+from benchmarks.scenarios import SCENARIOS, run_scenario
+
+
+def main(adapter_count=40, latency_ms=20.0):
+    """Print the process count and wall time of every scenario."""
+    print(f'{adapter_count} adapters, {latency_ms:g} ms simulated latency per process')
+    print(f'{"scenario":<30}{"processes":>10}{"budget":>8}{"wall time":>12}')
+    over_budget = False
+    for name in SCENARIOS:
+        processes, wall_time, budget = run_scenario(name, adapter_count, latency_ms / 1000)
+        over_budget = over_budget or processes > budget
+        print(f'{name:<30}{processes:>10}{budget:>8}{wall_time * 1000:>10.1f} ms'
+              + ('  OVER BUDGET' if processes > budget else ''))
+    return 1 if over_budget else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(*[int(arg) for arg in sys.argv[1:2]], *[float(arg) for arg in sys.argv[2:3]]))
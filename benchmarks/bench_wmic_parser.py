@@ -0,0 +1,52 @@
+"""Micro-benchmark WMIC output parsing (legacy whitespace splitting versus streaming parsers).
+
+Run from the repository root::
+
+    python -m benchmarks.bench_wmic_parser [rows]
+
+"""
+
+import sys
+import timeit
+
+from win_nic._wmic_parser import iter_csv_rows, iter_value_records
+
+
+def legacy_parse(wmic_resp):
+    """Parse fixed-width WMIC output the way NetworkAdapters.dump() used to."""
+    rows = [line.strip() for line in wmic_resp.split('\n') if line.strip() != ''][1:]
+    return [list(filter(None, row.split('  '))) for row in rows]
+
+
+def synthetic_outputs(row_count):
+    """Build equivalent fixed-width, CSV and value outputs with the given number of rows."""
+    rows = [(str(index), f'Hyper-V Virtual Ethernet Adapter #{index}', f'vEthernet {index}',
+             f'{{"10.0.{index // 256}.{index % 256}","fe80::{index:x}"}}') for index in range(row_count)]
+    fixed_width = 'Index  Name                                   NetConnectionID  IPAddress\r\r\n' + ''.join(
+        f'{index:<7}{name:<39}{connection_id:<17}{addresses}\r\r\n' for index, name, connection_id, addresses in rows)
+    csv_output = '\r\r\nNode,Index,Name,NetConnectionID,IPAddress\r\r\n' + ''.join(
+        f'PC,{index},{name},{connection_id},{addresses.replace(",", ";").replace(chr(34), "")}\r\r\n'
+        for index, name, connection_id, addresses in rows)
+    value_output = ''.join(
+        f'\r\r\n\r\r\nIndex={index}\r\r\nName={name}\r\r\nNetConnectionID={connection_id}\r\r\nIPAddress={addresses}\r\r\n'
+        for index, name, connection_id, addresses in rows)
+    return fixed_width, csv_output, value_output
+
+
+def main(row_count=5000, repeat=5):
+    """Print the best-of-N time of each parser."""
+    fixed_width, csv_output, value_output = synthetic_outputs(row_count)
+    converters = {'Index': int}
+    cases = [
+        ('legacy whitespace split', lambda: legacy_parse(fixed_width)),
+        ('iter_csv_rows', lambda: list(iter_csv_rows(csv_output.splitlines(), converters))),
+        ('iter_value_records', lambda: list(iter_value_records(value_output.splitlines(), converters))),
+    ]
+    print(f'{row_count} rows, best of {repeat}')
+    for label, func in cases:
+        best = min(timeit.repeat(func, number=1, repeat=repeat))
+        print(f'{label:<26}{best * 1000:9.2f} ms')
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:2]])
@@ -0,0 +1,99 @@
+"""Benchmark scenarios covering the Nic and NetworkAdapters API on a synthetic host.
+
+Each scenario is recorded once against an in-memory host and then replayed with a simulated
+process launch latency per request, so the number of requests equals the number of ``wmic`` and
+``netsh`` processes the scenario would launch with the default backend.
+
+"""
+
+import contextlib
+import io
+import time
+
+from win_nic import FakeBackend, NetworkAdapters, Nic, RecordingBackend, ReplayBackend
+
+
+def synthetic_host(adapter_count=40):
+    """Build an in-memory host with physical, Hyper-V, VPN and loopback style adapters."""
+    kinds = ['Intel(R) Ethernet Connection', 'Hyper-V Virtual Ethernet Adapter', 'WAN Miniport (IKEv2)',
+             'Microsoft KM-TEST Loopback Adapter']
+    adapters, configurations = [], []
+    for index in range(adapter_count):
+        kind = kinds[index % len(kinds)]
+        adapters.append({
+            'Index': str(index), 'AdapterTypeID': '0', 'Availability': '3', 'Caption': f'[{index:08}] {kind} #{index}',
+            'ConfigManagerErrorCode': '0', 'ConfigManagerUserConfig': 'FALSE', 'Description': f'{kind} #{index}',
+            'DeviceID': str(index), 'ErrorCleared': '', 'ErrorDescription': '', 'GUID': f'{{{index:08X}-0000-0000-0000-000000000000}}',
+            'Installed': 'TRUE', 'InterfaceIndex': str(index + 10), 'LastErrorCode': '', 'MACAddress': f'00:15:5D:00:00:{index:02X}',
+            'Manufacturer': 'Acme Corporation', 'Name': f'{kind} #{index}', 'NetConnectionID': f'Ethernet {index}',
+            'NetConnectionStatus': '2', 'PhysicalAdapter': 'TRUE' if index % len(kinds) == 0 else 'FALSE',
+            'PNPDeviceID': f'ROOT\\NET\\{index:04}', 'PowerManagementSupported': 'FALSE', 'ProductName': kind,
+            'ServiceName': 'netsvc', 'Speed': '1000000000',
+        })
+        configurations.append({'Index': str(index), 'IPAddress': (f'10.0.0.{index + 1}', f'fe80::{index + 1:x}')})
+    return FakeBackend({'win32_networkadapter': adapters, 'win32_networkadapterconfiguration': configurations})
+
+
+def enumerate_adapters(backend, adapter_count):  # pylint: disable=unused-argument
+    """Enumerate every adapter."""
+    NetworkAdapters(backend=backend)
+
+
+def read_all_properties(backend, adapter_count):  # pylint: disable=unused-argument
+    """Enumerate every adapter and read every attribute of each through get_nic."""
+    for nic in NetworkAdapters(backend=backend).get_nics():
+        _read_every_attribute(nic)
+
+
+def read_all_properties_uncached(backend, adapter_count):
+    """Read every attribute of every adapter through Nic instances without a snapshot."""
+    for index in range(adapter_count):
+        _read_every_attribute(Nic(index, backend=backend))
+
+
+def dump(backend, adapter_count):  # pylint: disable=unused-argument
+    """Enumerate every adapter and print the adapter table."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        NetworkAdapters(backend=backend).dump()
+
+
+def bulk_reconfigure(backend, adapter_count):  # pylint: disable=unused-argument
+    """Enumerate every adapter and give each a static address in one bulk operation."""
+    operations = [(nic, 'set_static_address', (f'192.168.{nic.index}.2', '255.255.255.0', f'192.168.{nic.index}.1'))
+                  for nic in NetworkAdapters(backend=backend).get_nics()]
+    NetworkAdapters.bulk(operations)
+
+
+def _read_every_attribute(nic):
+    for item in Nic._wmic_properties:  # pylint: disable=protected-access
+        try:
+            getattr(nic, item)
+        except AttributeError:
+            pass
+
+
+# Map each scenario to its process budget as a function of the number of adapters.
+SCENARIOS = {
+    'enumerate_adapters': (enumerate_adapters, lambda adapter_count: 2),
+    'read_all_properties': (read_all_properties, lambda adapter_count: 2),
+    'read_all_properties_uncached': (read_all_properties_uncached,
+                                     lambda adapter_count: adapter_count * len(Nic._wmic_properties)),  # pylint: disable=protected-access
+    'dump': (dump, lambda adapter_count: 2),
+    'bulk_reconfigure': (bulk_reconfigure, lambda adapter_count: 2 + adapter_count),
+}
+
+
+def run_scenario(name, adapter_count=40, latency=0.0):
+    """Record a scenario and replay it with the given per-process latency.
+
+    :returns: (number of processes, wall time in seconds, process budget)
+
+    """
+    scenario, budget = SCENARIOS[name]
+    recording_backend = RecordingBackend(synthetic_host(adapter_count))
+    scenario(recording_backend, adapter_count)
+    replay_backend = ReplayBackend(recording_backend.recording, latency)
+    start = time.perf_counter()
+    scenario(replay_backend, adapter_count)
+    wall_time = time.perf_counter() - start
+    return replay_backend.call_count, wall_time, budget(adapter_count)
@@ -0,0 +1,18 @@
+"""Module containing process count budget tests of the benchmark scenarios."""
+
+from unittest import TestCase
+
+from benchmarks.scenarios import SCENARIOS, run_scenario
+
+
+class TestCallCounts(TestCase):
+
+    """Fail when a scenario launches more processes than its budget."""
+
+    def test_call_counts(self):
+        """Test that every scenario stays within its process budget."""
+        for name in SCENARIOS:
+            for adapter_count in (1, 40):
+                with self.subTest(scenario=name, adapter_count=adapter_count):
+                    processes, _, budget = run_scenario(name, adapter_count)
+                    self.assertLessEqual(processes, budget)
@@ -30,5 +30,5 @@ setuptools.setup(
         'Topic :: System :: Networking',
         ],
     license          = 'MIT License',
-    packages=setuptools.find_packages()
+    packages=setuptools.find_packages(exclude=['benchmarks', 'benchmarks.*'])
 )
\ No newline at end of file
@@ -1,4 +1,99 @@
 ﻿"""Interface with network interface cards (NICs) on Windows-based computers."""
 
-from win_nic._network_adapters import NetworkAdapters
-from win_nic._nic import Nic
+import importlib
+import sys
+
+# Store the module defining each public name. Modules are imported on first access (PEP 562
+# module __getattr__), so that importing the package stays cheap for short-lived processes.
+_exports = {
+    'AsyncNetworkAdapters': '_async_network_adapters',
+    'AsyncNic': '_async_nic',
+    'Backend': '_backends',
+    'BulkResult': '_bulk',
+    'CallEvent': '_profiling',
+    'CircuitOpenError': '_policy',
+    'CoalescingBackend': '_coalescing',
+    'ConfigurationResult': '_configuration',
+    'ExecutionPolicy': '_policy',
+    'FakeBackend': '_backends',
+    'Fleet': '_fleet',
+    'HostResult': '_fleet',
+    'InventoryBackend': '_inventory',
+    'IpConfiguration': '_ip_configuration',
+    'NetworkAdapters': '_network_adapters',
+    'Nic': '_nic',
+    'NicChange': '_watch',
+    'NicConfiguration': '_configuration',
+    'NicSnapshot': '_nic',
+    'NicTable': '_nic_table',
+    'NoCache': '_descriptors',
+    'Profile': '_profiling',
+    'ReconcileAction': '_reconcile',
+    'ReconcileResult': '_reconcile',
+    'RecordingBackend': '_backends',
+    'ReplayBackend': '_backends',
+    'SnapshotCache': '_cache',
+    'StepResult': '_configuration',
+    'TtlCache': '_descriptors',
+    'WmicBackend': '_backends',
+    'WmicProperty': '_descriptors',
+    'WmicWorker': '_worker',
+    'WmicWorkerPool': '_worker',
+    'WorkerError': '_worker',
+    'add_hook': '_profiling',
+    'export_inventory': '_inventory',
+    'instrument': '_profiling',
+    'iter_inventory': '_inventory',
+    'profile': '_profiling',
+    'read_inventory_header': '_inventory',
+    'remove_hook': '_profiling',
+    'set_default_backend': '_backends',
+    'set_default_policy': '_policy',
+}
+
+__all__ = sorted(_exports)
+
+# Declare the public names for linters and type checkers (never true at runtime, so nothing is
+# imported here; typing.TYPE_CHECKING is not used to keep typing out of the package import).
+TYPE_CHECKING = False
+if TYPE_CHECKING:  # pragma: no cover
+    from win_nic._async_network_adapters import AsyncNetworkAdapters
+    from win_nic._async_nic import AsyncNic
+    from win_nic._backends import (Backend, FakeBackend, RecordingBackend, ReplayBackend, WmicBackend,
+                                   set_default_backend)
+    from win_nic._bulk import BulkResult
+    from win_nic._cache import SnapshotCache
+    from win_nic._coalescing import CoalescingBackend
+    from win_nic._configuration import ConfigurationResult, NicConfiguration, StepResult
+    from win_nic._descriptors import NoCache, TtlCache, WmicProperty
+    from win_nic._fleet import Fleet, HostResult
+    from win_nic._inventory import InventoryBackend, export_inventory, iter_inventory, read_inventory_header
+    from win_nic._ip_configuration import IpConfiguration
+    from win_nic._network_adapters import NetworkAdapters
+    from win_nic._nic import Nic, NicSnapshot
+    from win_nic._nic_table import NicTable
+    from win_nic._policy import CircuitOpenError, ExecutionPolicy, set_default_policy
+    from win_nic._profiling import CallEvent, Profile, add_hook, instrument, profile, remove_hook
+    from win_nic._reconcile import ReconcileAction, ReconcileResult
+    from win_nic._watch import NicChange
+    from win_nic._worker import WmicWorker, WmicWorkerPool, WorkerError
+
+
+def __getattr__(name):
+    try:
+        module_name = _exports[name]
+    except KeyError:
+        raise AttributeError(f"module 'win_nic' has no attribute '{name}'") from None
+    value = getattr(importlib.import_module('win_nic.' + module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+if sys.version_info < (3, 7):
+    # Module __getattr__ requires Python 3.7, so import every public name up front instead.
+    for _name in __all__:
+        globals()[_name] = __getattr__(_name)
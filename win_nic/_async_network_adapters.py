@@ -0,0 +1,165 @@
+﻿"""Module containing AsyncNetworkAdapters class."""
+
+import asyncio
+
+from win_nic._async_nic import AsyncNic, _query_snapshots_async
+from win_nic._dump import DUMP_COLUMNS
+from win_nic._network_adapters import NetworkAdapters
+from win_nic._profiling import call_site, traced_async
+from win_nic._watch import WATCHED_FIELDS, WatchSchedule
+
+
+class AsyncNetworkAdapters:
+
+    """Network adapter discoverer class with an asyncio interface.
+
+    Instantiate with ``await AsyncNetworkAdapters.create()``. The NIC table, lookup maps,
+    :meth:`dump`, :meth:`iter_rows` and :meth:`export` are those of a
+    :class:`win_nic.NetworkAdapters` instance filled from the last enumeration (they make no
+    queries).
+
+    :param int concurrency: maximum number of WMIC/netsh processes running at once (across all
+        NICs returned by :meth:`get_nic`)
+    :param win_nic.ExecutionPolicy policy: execution policy of the enumeration and the returned
+        NICs (defaults to the policy set with :func:`win_nic.set_default_policy`)
+
+    """
+
+    def __init__(self, concurrency=8, policy=None):
+        self.concurrency = concurrency
+        self.policy = policy
+        self._semaphore = None
+        self._adapters = NetworkAdapters._from_nic_table({})  # pylint: disable=protected-access
+
+    @property
+    def nic_table(self):
+        """Get the NIC table (index to :class:`win_nic.NicSnapshot`) of the last enumeration.
+
+        :rtype: dict
+
+        """
+        return self._adapters.nic_table
+
+    @property
+    def nic_connection_id_map(self):
+        """Get the map of connection IDs to NIC indexes.
+
+        :rtype: dict
+
+        """
+        return self._adapters.nic_connection_id_map
+
+    @property
+    def nic_guid_map(self):
+        """Get the map of GUIDs to NIC indexes.
+
+        :rtype: dict
+
+        """
+        return self._adapters.nic_guid_map
+
+    @property
+    def nic_mac_address_map(self):
+        """Get the map of MAC addresses to NIC indexes.
+
+        :rtype: dict
+
+        """
+        return self._adapters.nic_mac_address_map
+
+    @property
+    def nic_name_map(self):
+        """Get the map of names to NIC indexes.
+
+        :rtype: dict
+
+        """
+        return self._adapters.nic_name_map
+
+    def dump(self, stream=None, columns=DUMP_COLUMNS, output_format='table', page_size=None):
+        """Write the NICs of the NIC table to a stream (see :meth:`win_nic.NetworkAdapters.dump`)."""
+        self._adapters.dump(stream, columns, output_format, page_size)
+
+    def export(self, path, host=None, append=False):
+        """Save the NIC table to an inventory file (see :meth:`win_nic.NetworkAdapters.export`)."""
+        self._adapters.export(path, host, append)
+
+    def iter_rows(self, columns=DUMP_COLUMNS):
+        """Iterate over rows of NIC table attribute values (see :meth:`win_nic.NetworkAdapters.iter_rows`)."""
+        return self._adapters.iter_rows(columns)
+
+    def _set_nic_table(self, nic_table):
+        self._adapters = NetworkAdapters._from_nic_table(nic_table)  # pylint: disable=protected-access
+
+    @classmethod
+    async def create(cls, concurrency=8, policy=None):
+        """Instantiate and enumerate network adapters.
+
+        :param int concurrency: maximum number of WMIC/netsh processes running at once
+        :param win_nic.ExecutionPolicy policy: execution policy of the enumeration and the returned NICs
+        :rtype: win_nic.AsyncNetworkAdapters
+
+        """
+        adapters = cls(concurrency, policy)
+        await adapters.refresh()
+        return adapters
+
+    @traced_async
+    async def refresh(self):
+        """Re-enumerate all NICs (querying each Windows class concurrently) and rebuild the lookup maps."""
+        self._set_nic_table(await _query_snapshots_async(semaphore=self._get_semaphore()))
+
+    def _get_semaphore(self):
+        # Create the semaphore lazily so that it belongs to the running event loop.
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._semaphore
+
+    # pylint: disable=too-many-arguments
+    def get_nic(self, index=None, name=None, connection_id=None, guid=None, mac_address=None, interface_index=None,
+                pnp_device_id=None):
+        """Get the specified NIC instance (see :meth:`win_nic.NetworkAdapters.get_nic`).
+
+        :rtype: win_nic.AsyncNic
+
+        """
+        # pylint: disable=protected-access
+        nic_index = self._adapters._lookup_index(index=index, name=name, connection_id=connection_id, guid=guid,
+                                                 mac_address=mac_address, interface_index=interface_index,
+                                                 pnp_device_id=pnp_device_id)
+        return AsyncNic(nic_index, self._get_semaphore(), self.policy)
+
+    def get_nics(self, **criteria):
+        """Get every NIC matching all given criteria (see :meth:`win_nic.NetworkAdapters.get_nics`).
+
+        NICs share this instance's concurrency limit.
+
+        :rtype: list of win_nic.AsyncNic
+
+        """
+        indexes = self._adapters._match_indexes(criteria)  # pylint: disable=protected-access
+        return [AsyncNic(index, self._get_semaphore(), self.policy) for index in indexes]
+
+    # pylint: disable=too-many-arguments
+    async def watch(self, interval=1.0, max_interval=30.0, backoff=1.5, fields=WATCHED_FIELDS, max_failures=3,
+                    max_polls=None):
+        """Poll all NICs and yield their changes (see :meth:`win_nic.NetworkAdapters.watch`)::
+
+            >>> async for change in adapters.watch():
+            ...     print(change.kind, change.index, change.field, change.old, change.new)
+
+        :rtype: async generator of win_nic.NicChange
+
+        """
+        schedule = WatchSchedule(self.nic_table, self._set_nic_table, interval=interval, max_interval=max_interval,
+                                 backoff=backoff, fields=fields, max_failures=max_failures, max_polls=max_polls)
+        for delay in schedule:
+            await asyncio.sleep(delay)
+            try:
+                with call_site('AsyncNetworkAdapters.watch', self.policy):
+                    nic_table = await _query_snapshots_async(semaphore=self._get_semaphore())
+            except Exception as error:  # pylint: disable=broad-except
+                schedule.failed(error)
+            else:
+                for change in schedule.update(nic_table):
+                    yield change
@@ -0,0 +1,170 @@
+﻿"""Module containing AsyncNic class."""
+
+import asyncio
+
+from win_nic.enums.nic_net_connection_status import NicNetConnectionStatus
+
+from win_nic._nic import Nic, _attribute_wmic_args, _build_snapshots, _parse_attribute_response, _snapshot_queries
+from win_nic._profiling import call_site, traced_async
+from win_nic._utils import run_netsh_command_async, run_wmic_command_async, run_wmic_query_async
+from win_nic._wmic_parser import parse_return_value
+
+
+class AsyncNic:
+
+    """Windows network interface card (NIC) class with an asyncio interface.
+
+    Attributes are the same as those of :class:`win_nic.Nic` but reading one returns an awaitable
+    (e.g. ``await nic.speed``). Every WMIC and netsh invocation runs as an asyncio subprocess.
+
+    :param int index: index number of the network adapter (as stored in the system registry)
+    :param asyncio.Semaphore semaphore: semaphore limiting the number of concurrent processes
+        (shared by all NICs of an :class:`win_nic.AsyncNetworkAdapters` instance)
+    :param win_nic.ExecutionPolicy policy: timeouts, retries and circuit breaking of the WMIC and
+        netsh invocations made for the NIC (defaults to the policy set with
+        :func:`win_nic.set_default_policy`)
+
+    .. note:: On Windows, asyncio subprocesses require the proactor event loop (the default
+              since Python 3.8).
+
+    """
+
+    _wmic_properties = Nic._wmic_properties  # pylint: disable=protected-access
+
+    def __init__(self, index, semaphore=None, policy=None):
+        self.index = index
+        self._semaphore = semaphore
+        self.policy = policy
+
+    def __getattr__(self, item):
+        if item not in self._wmic_properties:
+            raise AttributeError(f"'AsyncNic' object has no attribute '{item}'")
+
+        return self._query_attribute(item)
+
+    def __setattr__(self, key, value):
+        if key in self._wmic_properties:
+            raise AttributeError(f"'AsyncNic' attribute '{key}' is not settable")
+
+        object.__setattr__(self, key, value)
+
+    def __dir__(self):
+        return [key for key in self.__dict__ if not key.startswith('_')] + list(self._wmic_properties)
+
+    def __repr__(self):
+        return f"<'win_nic.AsyncNic(index={self.index})'>"
+
+    async def _query_attribute(self, item):
+        with call_site(f'AsyncNic.{item}', self.policy):
+            wmic_resp_list = await run_wmic_command_async(_attribute_wmic_args(self.index, item), self._semaphore)
+        return _parse_attribute_response(item, wmic_resp_list)
+
+    async def _call_win32_networkadapter(self, call):
+        wmic_args = ['path', 'win32_networkadapter', 'where', f'index={self.index}', 'call', call]
+        return parse_return_value(await run_wmic_command_async(wmic_args, self._semaphore))
+
+    @traced_async
+    async def add_dns_server(self, dns_server):
+        """Add a DNS server entry.
+
+        :param str dns_server: DNS server address
+
+        .. note:: To add a DNS entry, the Python process must be running as administrator.
+
+        """
+        net_connection_id = await self.net_connection_id
+        return await run_netsh_command_async('add dnsserver name="' + net_connection_id + '" ' + dns_server,
+                                             self._semaphore)
+
+    @traced_async
+    async def disable(self):
+        """Call the Disable method of Win32_NetworkAdapter.
+
+        .. note:: To disable a NIC, the Python process must be running as administrator.
+
+        """
+        return await self._call_win32_networkadapter('Disable')
+
+    @traced_async
+    async def enable(self):
+        """Call the Enable method of Win32_NetworkAdapter.
+
+        .. note:: To enable a NIC, the Python process must be running as administrator.
+
+        """
+        return await self._call_win32_networkadapter('Enable')
+
+    @property
+    async def enabled_ctrl_panel(self):
+        """Check if NIC is enabled (as it appears in Control Panel).
+
+        :returns: True if enabled, false if disabled.
+        :rtype: bool
+
+        """
+        return await self.net_connection_status != NicNetConnectionStatus.DISCONNECTED
+
+    async def get(self, *items):
+        """Read several attributes concurrently (one WMIC process per attribute).
+
+        :param str items: names of the attributes to read
+        :returns: attribute values in the order requested
+        :rtype: list
+
+        """
+        return list(await asyncio.gather(*[self._query_attribute(item) for item in items]))
+
+    @property
+    async def ip_addresses(self):
+        """Get the IPAddress property of Win32_NetworkAdapterConfiguration.
+
+        :rtype: str[]
+
+        """
+        return list(await self._ip_address_raw)
+
+    @traced_async
+    async def set_static_address(self, ip_addr, subnet_mask, gateway):
+        """Set a static IP address configuration.
+
+        :param str ip_addr: static IP adress
+        :param str subnet_mask: static subnet mask
+        :param str gateway: static default gateway
+
+        .. note:: To set a static address, the Python process must be running as administrator.
+
+        """
+        net_connection_id = await self.net_connection_id
+        netsh_args = ('set address name="' + net_connection_id + '" static ' + ip_addr + ' '
+                      + subnet_mask + ' ' + gateway)
+        return await run_netsh_command_async(netsh_args, self._semaphore)
+
+    @traced_async
+    async def snapshot(self):
+        """Get every attribute of the NIC with concurrent WMIC calls (one per Windows class).
+
+        :rtype: win_nic.NicSnapshot
+
+        """
+        try:
+            return (await _query_snapshots_async(self.index, self._semaphore))[self.index]
+        except KeyError:
+            raise AttributeError(f"wmic did not return NIC with index {self.index}") from None
+
+    @traced_async
+    async def use_dhcp(self):
+        """Use DHCP for IP address configuration.
+
+        .. note:: To set a static address, the Python process must be running as administrator.
+
+        """
+        net_connection_id = await self.net_connection_id
+        netsh_args = 'set address name="' + net_connection_id + '" source=dhcp'
+        return await run_netsh_command_async(netsh_args, self._semaphore)
+
+
+async def _query_snapshots_async(index=None, semaphore=None):
+    """Asynchronous equivalent of :func:`win_nic._nic._query_snapshots` (classes queried concurrently)."""
+    queries = _snapshot_queries(index)
+    results = await asyncio.gather(*[run_wmic_query_async(*query, semaphore=semaphore) for query in queries])
+    return _build_snapshots([(query[0], records) for query, records in zip(queries, results)])
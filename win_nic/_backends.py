@@ -0,0 +1,427 @@
+﻿"""Module containing query backends (transports) used by Nic and NetworkAdapters."""
+
+import contextlib
+import re
+import threading
+import time
+
+from collections import deque
+
+from win_nic._profiling import instrument
+from win_nic._utils import (iter_wmic_query, run_netsh_command, run_netsh_script, run_wmic_command, run_wmic_query,
+                            wmic_node_args)
+from win_nic._wmic_parser import apply_converter, parse_return_value, parse_value
+from win_nic._wql import compile_where
+
+
+class Backend:
+
+    """Interface of a query backend (the transport reaching WMI and netsh).
+
+    Subclass and implement every method to plug a new transport into :class:`win_nic.Nic` and
+    :class:`win_nic.NetworkAdapters` (via their ``backend`` parameter).
+
+    """
+
+    def query(self, windows_class, windows_names, where=None, converters=None):
+        """Query properties of every instance of a Windows class matching a WQL condition.
+
+        :param str windows_class: Windows class (e.g. ``win32_networkadapter``)
+        :param list windows_names: Windows property names
+        :param str where: WQL condition (e.g. ``index=0``, all instances if ``None``)
+        :param dict converters: Windows property name to callable applied to non-empty values
+        :returns: one dictionary per instance mapping Windows property name to its parsed value
+            (``None`` if empty, a tuple for arrays)
+        :rtype: list of dict
+
+        """
+        raise NotImplementedError
+
+    def iter_query(self, windows_class, windows_names, where=None, converters=None):
+        """Iterate over the records of :meth:`query` as they arrive.
+
+        The default implementation iterates over the records returned by :meth:`query`.
+
+        :rtype: iterator of dict
+
+        """
+        return iter(self.query(windows_class, windows_names, where, converters))
+
+    def get_property(self, windows_class, where, windows_name):
+        """Get one property of the instance of a Windows class matching a WQL condition.
+
+        :returns: parsed value (``None`` if WMI returned no value, a tuple for arrays)
+
+        """
+        raise NotImplementedError
+
+    def call_method(self, windows_class, where, method):
+        """Call a method of the instance of a Windows class matching a WQL condition.
+
+        :returns: ``ReturnValue`` of the method
+        :rtype: int
+
+        """
+        raise NotImplementedError
+
+    def run_netsh(self, netsh_args):
+        """Run a ``netsh interface ipv4`` command.
+
+        :param str netsh_args: arguments following ``netsh interface ipv4``
+        :returns: exit code
+        :rtype: int
+
+        """
+        raise NotImplementedError
+
+    def run_netsh_script(self, netsh_args_list):
+        """Run ``netsh interface ipv4`` commands as one batch, stopping at the first failure.
+
+        The default implementation runs each command with :meth:`run_netsh`.
+
+        :param list netsh_args_list: arguments following ``netsh interface ipv4`` of each command
+        :returns: exit code (of the first failed command, 0 if all succeeded)
+        :rtype: int
+
+        """
+        for netsh_args in netsh_args_list:
+            exit_code = self.run_netsh(netsh_args)
+            if exit_code:
+                return exit_code
+        return 0
+
+
+class WmicBackend(Backend):
+
+    """Backend launching ``wmic`` and ``netsh`` processes (the default backend).
+
+    Local WMIC queries are routed through an installed :class:`win_nic.WmicWorkerPool`, if any.
+
+    :param str node: remote computer (name or address) reached with the WMIC ``/node`` switch and
+        ``netsh -r`` (the local computer if ``None``)
+
+    """
+
+    def __init__(self, node=None):
+        self.node = node
+
+    def query(self, windows_class, windows_names, where=None, converters=None):
+        return run_wmic_query(windows_class, windows_names, where, converters, self.node)
+
+    def iter_query(self, windows_class, windows_names, where=None, converters=None):
+        return iter_wmic_query(windows_class, windows_names, where, converters, self.node)
+
+    def get_property(self, windows_class, where, windows_name):
+        wmic_resp_list = run_wmic_command(wmic_node_args(self.node)
+                                          + ['path', windows_class, 'where', where, 'get', windows_name])
+        return parse_value(wmic_resp_list[0]) if wmic_resp_list else None
+
+    def call_method(self, windows_class, where, method):
+        return parse_return_value(run_wmic_command(wmic_node_args(self.node)
+                                                   + ['path', windows_class, 'where', where, 'call', method]))
+
+    def run_netsh(self, netsh_args):
+        return run_netsh_command(netsh_args, self.node)
+
+    def run_netsh_script(self, netsh_args_list):
+        return run_netsh_script(netsh_args_list, self.node)
+
+
+class FakeBackend(Backend):
+
+    """In-memory backend for tests and benchmarks (no processes are launched).
+
+    Instances are dictionaries mapping Windows property name to raw value (as WMIC prints it,
+    with arrays as tuples) and must include ``Index``. WQL conditions are evaluated in memory (the
+    subset built by :meth:`win_nic.NetworkAdapters.query`: comparisons with ``=``, ``<>``,
+    ``IS NULL`` and ``LIKE`` combined with ``AND``, ``OR`` and ``NOT``). Calling
+    ``Disable``/``Enable`` sets ``NetConnectionStatus`` to 0/2, and successful ``set address``,
+    ``add address``, ``set dnsservers`` and ``add dnsservers`` netsh commands update the
+    Win32_NetworkAdapterConfiguration instance of the adapter. Scripts stop at the first failed
+    command. Every call is appended to :attr:`calls`.
+
+    :param dict instances: Windows class name to list of instance dictionaries
+    :param dict method_return_values: method name to ``ReturnValue`` (default 0)
+    :param dict netsh_exit_codes: netsh arguments to exit code (default 0)
+    :param float latency: seconds each call sleeps (to simulate process launch or network latency)
+
+    """
+
+    # Match index conditions (the conditions NICs use) without compiling a WQL predicate.
+    _where_rx = re.compile(r'^\s*index\s*=\s*\d+(\s+or\s+index\s*=\s*\d+)*\s*$', re.IGNORECASE)
+    _netsh_rx = re.compile(r'^(?P<command>set address|add address|set dnsservers?|add dnsservers?) '
+                           r'name="(?P<name>[^"]*)"'
+                           r'(?P<args>.*)$')
+
+    def __init__(self, instances, method_return_values=None, netsh_exit_codes=None, latency=0.0):
+        self.instances = {windows_class.lower(): [dict(instance) for instance in class_instances]
+                          for windows_class, class_instances in instances.items()}
+        self.method_return_values = dict(method_return_values or {})
+        self.netsh_exit_codes = dict(netsh_exit_codes or {})
+        self.latency = latency
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def _match(self, windows_class, where):
+        instances = self.instances.get(windows_class.lower(), [])
+        if where is None:
+            return instances
+        if self._where_rx.match(where):
+            indexes = {int(index) for index in re.findall(r'\d+', where)}
+            return [instance for instance in instances if int(instance['Index']) in indexes]
+        predicate = compile_where(where)
+        return [instance for instance in instances if predicate(instance)]
+
+    def query(self, windows_class, windows_names, where=None, converters=None):
+        with self._instrument_request(('query', windows_class, tuple(windows_names), where)) as invocation:
+            instances = self._match(windows_class, where)
+            invocation.exit_code = 0
+        converters = converters or {}
+        return [{windows_name: apply_converter(_fake_value(instance.get(windows_name)),
+                                               converters.get(windows_name))
+                 for windows_name in windows_names} for instance in instances]
+
+    def get_property(self, windows_class, where, windows_name):
+        with self._instrument_request(('get_property', windows_class, windows_name, where)) as invocation:
+            instances = self._match(windows_class, where)
+            invocation.exit_code = 0
+        return _fake_value(instances[0].get(windows_name)) if instances else None
+
+    def call_method(self, windows_class, where, method):
+        with self._instrument_request(('call_method', windows_class, method, where)) as invocation:
+            with self._lock:
+                for instance in self._match(windows_class, where):
+                    if method in ('Disable', 'Enable'):
+                        instance['NetConnectionStatus'] = '0' if method == 'Disable' else '2'
+            invocation.exit_code = 0
+        return self.method_return_values.get(method, 0)
+
+    def run_netsh(self, netsh_args):
+        with self._instrument_request(('run_netsh', netsh_args)) as invocation:
+            invocation.exit_code = self._apply_netsh(netsh_args)
+        return invocation.exit_code
+
+    def run_netsh_script(self, netsh_args_list):
+        with self._instrument_request(('run_netsh_script', tuple(netsh_args_list))) as invocation:
+            invocation.exit_code = 0
+            for netsh_args in netsh_args_list:
+                invocation.exit_code = self._apply_netsh(netsh_args)
+                if invocation.exit_code:
+                    break
+        return invocation.exit_code
+
+    def _apply_netsh(self, netsh_args):
+        """Get the exit code of a netsh command and apply its effect on the adapter configuration."""
+        exit_code = self.netsh_exit_codes.get(netsh_args, 0)
+        match = self._netsh_rx.match(netsh_args)
+        if exit_code or match is None:
+            return exit_code
+        with self._lock:
+            adapters = [instance for instance in self.instances.get('win32_networkadapter', [])
+                        if instance.get('NetConnectionID') == match.group('name')]
+            if not adapters:
+                return 1
+            configurations = self.instances.setdefault('win32_networkadapterconfiguration', [])
+            configuration = next((instance for instance in configurations
+                                  if int(instance['Index']) == int(adapters[0]['Index'])), None)
+            if configuration is None:
+                configuration = {'Index': adapters[0]['Index']}
+                configurations.append(configuration)
+            _apply_netsh_effect(configuration, match.group('command'), match.group('args').split())
+        return exit_code
+
+    @contextlib.contextmanager
+    def _instrument_request(self, request):
+        with self._lock:
+            self.calls.append(request)
+        with instrument(_request_kind(request), request) as invocation:
+            if self.latency:
+                time.sleep(self.latency)
+            yield invocation
+
+
+class RecordingBackend(Backend):
+
+    """Backend recording the requests and (unconverted) results of another backend.
+
+    Save the recording with :meth:`save` and serve it later with :class:`ReplayBackend`.
+
+    :param win_nic.Backend backend: backend whose calls are recorded (default
+        :class:`WmicBackend`)
+
+    """
+
+    def __init__(self, backend=None):
+        self.backend = backend or WmicBackend()
+        self.recording = []
+        self._lock = threading.Lock()
+
+    def _record(self, key, result):
+        with self._lock:
+            self.recording.append({'request': list(key), 'result': result})
+        return result
+
+    def query(self, windows_class, windows_names, where=None, converters=None):
+        records = self._record(('query', windows_class, list(windows_names), where),
+                               self.backend.query(windows_class, windows_names, where))
+        return _apply_converters(records, converters)
+
+    def get_property(self, windows_class, where, windows_name):
+        return self._record(('get_property', windows_class, where, windows_name),
+                            self.backend.get_property(windows_class, where, windows_name))
+
+    def call_method(self, windows_class, where, method):
+        return self._record(('call_method', windows_class, where, method),
+                            self.backend.call_method(windows_class, where, method))
+
+    def run_netsh(self, netsh_args):
+        return self._record(('run_netsh', netsh_args), self.backend.run_netsh(netsh_args))
+
+    def run_netsh_script(self, netsh_args_list):
+        return self._record(('run_netsh_script', list(netsh_args_list)),
+                            self.backend.run_netsh_script(netsh_args_list))
+
+    def save(self, path):
+        """Save the recording as JSON."""
+        import json  # pylint: disable=import-outside-toplevel
+
+        with open(path, 'w', encoding='utf-8') as recording_file:
+            json.dump(self.recording, recording_file, indent=1)
+
+
+class ReplayBackend(Backend):
+
+    """Backend answering requests from a recording made by :class:`RecordingBackend`.
+
+    Repeated requests are answered with successive recorded results; once those run out, the last
+    one is repeated. Every answered request is counted in :attr:`call_count` (each would have been
+    one process launch with :class:`WmicBackend`).
+
+    :param recording: recording (list of request/result dictionaries) or path of a saved recording
+    :param float latency: seconds each request sleeps (to simulate process launch latency)
+    :raises LookupError: when a request was never recorded
+
+    """
+
+    def __init__(self, recording, latency=0.0):
+        self.latency = latency
+        self.call_count = 0
+        if isinstance(recording, str):
+            import json  # pylint: disable=import-outside-toplevel
+
+            with open(recording, encoding='utf-8') as recording_file:
+                recording = json.load(recording_file)
+        self._results = {}
+        for entry in recording:
+            self._results.setdefault(_freeze(entry['request']), deque()).append(
+                _from_json(entry['request'][0], entry['result']))
+        self._lock = threading.Lock()
+
+    def _replay(self, key):
+        with instrument(_request_kind(key), key) as invocation:
+            with self._lock:
+                try:
+                    results = self._results[_freeze(key)]
+                except KeyError:
+                    raise LookupError(f"request {list(key)} was not recorded") from None
+                self.call_count += 1
+                result = results.popleft() if len(results) > 1 else results[0]
+            if self.latency:
+                time.sleep(self.latency)
+            invocation.exit_code = result if _request_kind(key) == 'netsh' else 0
+        return result
+
+    def query(self, windows_class, windows_names, where=None, converters=None):
+        records = self._replay(('query', windows_class, list(windows_names), where))
+        return _apply_converters([dict(record) for record in records], converters)
+
+    def get_property(self, windows_class, where, windows_name):
+        return self._replay(('get_property', windows_class, where, windows_name))
+
+    def call_method(self, windows_class, where, method):
+        return self._replay(('call_method', windows_class, where, method))
+
+    def run_netsh(self, netsh_args):
+        return self._replay(('run_netsh', netsh_args))
+
+    def run_netsh_script(self, netsh_args_list):
+        return self._replay(('run_netsh_script', list(netsh_args_list)))
+
+
+# Store the backend used by NICs and network adapters created without an explicit backend.
+default_backend = WmicBackend()  # pylint: disable=invalid-name
+
+
+def set_default_backend(backend):
+    """Set the backend used by NICs and network adapters created without an explicit backend.
+
+    :param win_nic.Backend backend: new default backend (``None`` restores :class:`WmicBackend`)
+
+    """
+    global default_backend  # pylint: disable=global-statement, invalid-name
+    default_backend = backend or WmicBackend()
+
+
+def _apply_converters(records, converters):
+    """Apply converters to unconverted query records."""
+    if not converters:
+        return records
+    return [{windows_name: apply_converter(value, converters.get(windows_name))
+             for windows_name, value in record.items()} for record in records]
+
+
+def _fake_value(raw_value):
+    """Parse a raw FakeBackend value the way WMIC output would be parsed."""
+    if raw_value is None or isinstance(raw_value, tuple):
+        return raw_value
+    return parse_value(str(raw_value))
+
+
+def _from_json(kind, result):
+    """Restore the tuples (arrays) of a recorded result that JSON serialization turned into lists."""
+    if kind == 'query':
+        return [{windows_name: _tuple(value) for windows_name, value in record.items()} for record in result]
+    return _tuple(result)
+
+
+def _freeze(request):
+    """Get a hashable key of a request (with lists, e.g. from JSON, turned into tuples)."""
+    return tuple(_freeze(item) if isinstance(item, (list, tuple)) else item for item in request)
+
+
+def _request_kind(request):
+    """Get the kind of process (``'wmic'`` or ``'netsh'``) a backend request stands in for."""
+    return 'netsh' if request[0].startswith('run_netsh') else 'wmic'
+
+
+def _apply_netsh_effect(configuration, command, args):
+    """Apply a netsh address or DNS server command to a fake Win32_NetworkAdapterConfiguration instance."""
+    options = dict(arg.split('=', 1) for arg in args if '=' in arg)
+    positional = [arg for arg in args if '=' not in arg]
+    if command == 'set address':
+        if options.get('source') == 'dhcp':
+            configuration.update(DHCPEnabled='TRUE', IPAddress=None, IPSubnet=None, DefaultIPGateway=None)
+        elif positional[:1] == ['static']:
+            address, mask, gateway = (positional[1:] + [None, None, None])[:3]
+            configuration.update(DHCPEnabled='FALSE', IPAddress=(address,), IPSubnet=(mask,),
+                                 DefaultIPGateway=(gateway,) if gateway not in (None, 'none') else None)
+    elif command == 'add address':
+        if 'address' in options:
+            configuration.update(IPAddress=tuple(configuration.get('IPAddress') or ()) + (options['address'],),
+                                 IPSubnet=tuple(configuration.get('IPSubnet') or ()) + (options.get('mask'),))
+        if 'gateway' in options:
+            configuration['DefaultIPGateway'] = (tuple(configuration.get('DefaultIPGateway') or ())
+                                                 + (options['gateway'],))
+    elif command.startswith('set dnsserver'):
+        address = options.get('address')
+        configuration['DNSServerSearchOrder'] = (address,) if options.get('source') == 'static' and \
+            address not in (None, 'none') else None
+    else:
+        address = options.get('address', positional[0] if positional else None)
+        servers = list(configuration.get('DNSServerSearchOrder') or ())
+        servers.insert(int(options.get('index', len(servers) + 1)) - 1, address)
+        configuration['DNSServerSearchOrder'] = tuple(servers)
+
+
+def _tuple(value):
+    return tuple(value) if isinstance(value, list) else value
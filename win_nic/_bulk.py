@@ -0,0 +1,92 @@
+﻿"""Module containing bulk (thread pool) execution of NIC operations."""
+
+import time
+
+from collections import namedtuple, OrderedDict
+
+
+class BulkResult(namedtuple('BulkResult', ['nic', 'operation', 'args', 'return_value', 'exception', 'skipped',
+                                           'start', 'duration'])):
+
+    """Result of one operation executed by :meth:`win_nic.NetworkAdapters.bulk`.
+
+    :param nic: NIC the operation ran on
+    :param str operation: name of the NIC method called
+    :param tuple args: positional arguments passed to the method
+    :param return_value: value returned by the method (e.g. the Windows ``ReturnValue`` code)
+    :param exception: exception raised by the method (``None`` if it returned)
+    :param bool skipped: whether the operation was skipped because an earlier operation on the
+        same NIC failed (only with ``stop_on_error``)
+    :param float start: seconds from the start of the batch until the operation started
+    :param float duration: seconds the operation took
+
+    """
+
+    __slots__ = ()
+
+    @property
+    def succeeded(self):
+        """Check if the operation ran, raised no exception and returned a zero status code.
+
+        :rtype: bool
+
+        """
+        return (not self.skipped and self.exception is None
+                and not (isinstance(self.return_value, int) and self.return_value != 0))
+
+
+def run_bulk(operations, max_workers=8, stop_on_error=False):
+    """Run NIC operations in a bounded thread pool.
+
+    Operations on the same NIC (by index) run one after another in the order given, so a
+    disable followed by an enable of one adapter keeps its order. Operations on different NICs run
+    in parallel.
+
+    :param operations: iterable of (nic, operation name, argument tuple) tuples (the argument tuple
+        may be omitted)
+    :param int max_workers: maximum number of NICs operated on at once
+    :param bool stop_on_error: skip the remaining operations on a NIC after one fails (raises an
+        exception or returns a non-zero status code)
+    :returns: one result per operation, in the order given
+    :rtype: list of win_nic.BulkResult
+
+    """
+    from concurrent.futures import ThreadPoolExecutor  # pylint: disable=import-outside-toplevel
+
+    operations_by_nic = OrderedDict()
+    for position, operation in enumerate(operations):
+        nic, name = operation[0], operation[1]
+        args = tuple(operation[2]) if len(operation) > 2 else ()
+        if name.startswith('_') or not callable(getattr(type(nic), name, None)):
+            raise ValueError(f"'{name}' is not a NIC operation")
+        operations_by_nic.setdefault(nic.index, []).append((position, nic, name, args))
+
+    batch_start = time.monotonic()
+    results = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_run_nic_operations, nic_operations, batch_start, stop_on_error)
+                   for nic_operations in operations_by_nic.values()]
+        for future in futures:
+            results.update(future.result())
+
+    return [results[position] for position in sorted(results)]
+
+
+def _run_nic_operations(nic_operations, batch_start, stop_on_error):
+    """Run the operations of one NIC sequentially and map their positions to results."""
+    results = {}
+    failed = False
+    for position, nic, name, args in nic_operations:
+        start = time.monotonic()
+        if failed and stop_on_error:
+            results[position] = BulkResult(nic, name, args, None, None, True, start - batch_start, 0.0)
+            continue
+        return_value = exception = None
+        try:
+            return_value = getattr(nic, name)(*args)
+        except Exception as error:  # pylint: disable=broad-except
+            exception = error
+        results[position] = BulkResult(nic, name, args, return_value, exception, False, start - batch_start,
+                                       time.monotonic() - start)
+        failed = failed or not results[position].succeeded
+    return results
@@ -0,0 +1,128 @@
+﻿"""Module containing the opt-in on-disk cache of network adapter enumerations."""
+
+import math
+import os
+import re
+import socket
+import tempfile
+import threading
+import time
+
+from win_nic._inventory import export_inventory, iter_inventory, read_inventory_header
+from win_nic._nic import Nic, _query_snapshots
+from win_nic._profiling import call_site, current_policy
+
+
+class SnapshotCache:
+
+    """On-disk cache of the NIC table of :class:`win_nic.NetworkAdapters` (opt-in via its ``cache`` parameter).
+
+    The NIC table of each host is stored as an inventory file (see :meth:`win_nic.NetworkAdapters.export`)
+    named after the host. Before a cached table is used, one lightweight query of the adapter indexes
+    validates it; a mismatch (adapter added or removed) falls back to a full enumeration. A valid table
+    older than ``max_age`` is used right away and re-enumerated in a background thread that rewrites
+    the cache file for the next process::
+
+        >>> adapters = NetworkAdapters(cache=SnapshotCache())
+
+    :param str directory: cache directory (defaults to ``%LOCALAPPDATA%\\win-nic`` or ``~/.cache/win-nic``)
+    :param str host: host name the cache is keyed by (defaults to the local host name)
+    :param float max_age: seconds after which a cached table is refreshed in the background
+    :param bool validate: validate cached tables with the adapter index query (skip it to launch no
+        process at all when the cache is fresh)
+    :param tuple nic_attributes: attributes pre-filled from the cache into NICs returned by
+        :meth:`win_nic.NetworkAdapters.get_nic` (defaults to the attributes that never expire, as cached
+        volatile values such as the connection status may be outdated)
+
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, directory=None, host=None, max_age=3600.0, validate=True, nic_attributes=None):
+        self.directory = directory or _default_directory()
+        self.host = host or socket.gethostname()
+        self.max_age = max_age
+        self.validate = validate
+        self.nic_attributes = tuple(item for item, ttl in Nic._cache_ttls.items() if math.isinf(ttl)) \
+            if nic_attributes is None else tuple(nic_attributes)
+        self.refresh_error = None
+        self._refresh_thread = None
+
+    @property
+    def path(self):
+        """Get the path of the cache file of the host.
+
+        :rtype: str
+
+        """
+        return os.path.join(self.directory, re.sub(r'[^\w.-]', '_', self.host) + '.jsonl')
+
+    def load(self, backend):
+        """Get the cached NIC table if it is valid (refreshing it in the background if stale).
+
+        :param win_nic.Backend backend: backend used for validation and background refreshes
+        :returns: NIC table (index to :class:`win_nic.NicSnapshot`), ``None`` if missing or invalid
+        :rtype: dict
+
+        """
+        self.refresh_error = None
+        try:
+            metadata = read_inventory_header(self.path).get('metadata') or {}
+            nic_table = {snapshot.index: snapshot for _, snapshot in iter_inventory(self.path)}
+        except (OSError, ValueError):
+            return None
+
+        if self.validate and metadata.get('indexes') != _query_indexes(backend):
+            return None
+        if time.time() - metadata.get('created', 0) > self.max_age:
+            self._refresh_in_background(backend)
+        return nic_table
+
+    def save(self, nic_table):
+        """Write a NIC table to the cache file (atomically replacing the previous one)."""
+        os.makedirs(self.directory, exist_ok=True)
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        os.close(file_descriptor)
+        try:
+            export_inventory(nic_table.values(), temporary_path, self.host,
+                             metadata={'created': time.time(), 'indexes': sorted(nic_table)})
+            os.replace(temporary_path, self.path)
+        except OSError:
+            os.remove(temporary_path)
+            raise
+
+    def clear(self):
+        """Delete the cache file of the host (if any)."""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def wait(self, timeout=None):
+        """Wait for a background refresh (if any) to finish."""
+        if self._refresh_thread is not None:
+            self._refresh_thread.join(timeout)
+
+    def _refresh_in_background(self, backend):
+        # The thread is not a daemon so that a short-lived process still rewrites the cache at exit. It
+        # runs under the execution policy of the call site loading the cache.
+        self._refresh_thread = threading.Thread(target=self._refresh, args=(backend, current_policy()))
+        self._refresh_thread.start()
+
+    def _refresh(self, backend, policy):
+        # A failed refresh leaves the stale cache in place (it is retried by the next process).
+        try:
+            with call_site('SnapshotCache.refresh', policy):
+                nic_table = _query_snapshots(backend=backend)
+            self.save(nic_table)
+        except Exception as error:  # pylint: disable=broad-except
+            self.refresh_error = error
+
+
+def _query_indexes(backend):
+    """Query the sorted indexes of all network adapters (one lightweight WMIC call)."""
+    return sorted(record['Index'] for record in backend.query('win32_networkadapter', ['Index'], None, {'Index': int}))
+
+
+def _default_directory():
+    base_directory = os.environ.get('LOCALAPPDATA') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base_directory, 'win-nic')
@@ -0,0 +1,134 @@
+﻿"""Module containing the coalescing (request merging and single-flight) backend."""
+
+import re
+import threading
+import time
+
+from concurrent.futures import Future
+
+from win_nic._backends import Backend, WmicBackend, _apply_converters
+
+_index_where_rx = re.compile(r'^\s*index\s*=\s*(\d+)\s*$', re.IGNORECASE)
+
+
+class CoalescingBackend(Backend):
+
+    """Backend merging concurrent property reads into multi-property queries of another backend.
+
+    Property reads (e.g. of :class:`win_nic.Nic` attributes read by several threads at once)
+    arriving within ``window`` seconds of the first one are merged into one query per Windows
+    class (covering every requested property and ``index=N`` condition), and its results are
+    fanned back out to the waiting callers::
+
+        >>> backend = CoalescingBackend(window=0.01)
+        >>> nic = Nic(0, backend=backend)  # read nic.caption, nic.speed and nic.mac_address in threads
+
+    Identical property reads and queries already in flight are not repeated but wait for the
+    result of the first one (single-flight). Method calls and netsh commands are passed through.
+
+    :param win_nic.Backend backend: backend the merged queries run on (default
+        :class:`win_nic.WmicBackend`)
+    :param float window: seconds property reads are collected before their query runs
+
+    """
+
+    def __init__(self, backend=None, window=0.005):
+        self.backend = backend or WmicBackend()
+        self.window = window
+        self.request_count = 0
+        self.query_count = 0
+        self._pending = {}
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def query(self, windows_class, windows_names, where=None, converters=None):
+        key = ('query', windows_class.lower(), tuple(windows_names), where)
+        with self._lock:
+            self.request_count += 1
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = self._in_flight[key] = Future()
+        if leader:
+            try:
+                future.set_result(self._query(windows_class, windows_names, where))
+            except Exception as error:  # pylint: disable=broad-except
+                future.set_exception(error)
+            finally:
+                self._retire([key])
+        return _apply_converters([dict(record) for record in future.result()], converters)
+
+    def get_property(self, windows_class, where, windows_name):
+        key = ('get_property', windows_class.lower(), where, windows_name)
+        with self._lock:
+            self.request_count += 1
+            future = self._in_flight.get(key)
+            leader = False
+            if future is None:
+                future = self._in_flight[key] = Future()
+                batch = self._pending.get(key[1])
+                leader = batch is None
+                if leader:
+                    batch = self._pending[key[1]] = []
+                batch.append((key, future))
+        if leader:
+            time.sleep(self.window)
+            with self._lock:
+                batch = self._pending.pop(key[1])
+            self._run_batch(windows_class, batch)
+        return future.result()
+
+    def call_method(self, windows_class, where, method):
+        return self.backend.call_method(windows_class, where, method)
+
+    def run_netsh(self, netsh_args):
+        return self.backend.run_netsh(netsh_args)
+
+    def run_netsh_script(self, netsh_args_list):
+        return self.backend.run_netsh_script(netsh_args_list)
+
+    def _query(self, windows_class, windows_names, where=None, converters=None):
+        with self._lock:
+            self.query_count += 1
+        return self.backend.query(windows_class, windows_names, where, converters)
+
+    def _run_batch(self, windows_class, batch):
+        """Query the properties of a batch of property reads of one Windows class and fan the values out."""
+        for where, group in _group_batch(batch):
+            windows_names = sorted({key[3] for _, key, _ in group} | {'Index'})
+            try:
+                records = self._query(windows_class, windows_names, where, {'Index': int})
+            except Exception as error:  # pylint: disable=broad-except
+                for _, _, future in group:
+                    future.set_exception(error)
+            else:
+                records_by_index = {record['Index']: record for record in records}
+                for match, key, future in group:
+                    record = records_by_index.get(int(match.group(1))) if match else next(iter(records), None)
+                    future.set_result(record.get(key[3]) if record is not None else None)
+            finally:
+                self._retire([key for _, key, _ in group])
+
+    def _retire(self, keys):
+        """Forget requests that are no longer in flight."""
+        with self._lock:
+            for key in keys:
+                self._in_flight.pop(key, None)
+
+
+def _group_batch(batch):
+    """Group the property reads of a batch by the where clause querying them.
+
+    :returns: list of (where clause, list of (index match, key, future) tuples) tuples
+
+    """
+    entries = [(_index_where_rx.match(key[2]), key, future) for key, future in batch]
+    if all(match for match, _, _ in entries):
+        # Merge the index conditions, telling the records apart by index.
+        indexes = sorted({int(match.group(1)) for match, _, _ in entries})
+        return [(' or '.join(f'index={index}' for index in indexes), entries)]
+
+    groups = {}
+    for entry in entries:
+        groups.setdefault(entry[1][2], []).append(entry)
+    return list(groups.items())
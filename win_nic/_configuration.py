@@ -0,0 +1,217 @@
+﻿"""Module containing the transactional NIC IP configuration builder."""
+
+import contextlib
+
+from collections import namedtuple
+
+from win_nic._policy import CircuitOpenError
+from win_nic._profiling import traced
+
+# Store the Win32_NetworkAdapterConfiguration properties captured before and after a configuration.
+_STATE_PROPERTIES = ['Index', 'DHCPEnabled', 'IPAddress', 'IPSubnet', 'DefaultIPGateway', 'DNSServerSearchOrder']
+
+
+class StepResult(namedtuple('StepResult', ['description', 'netsh_args', 'applied'])):
+
+    """Result of one step of a :class:`win_nic.NicConfiguration`.
+
+    :param str description: description of the step (e.g. ``'static address 192.168.0.3'``)
+    :param list netsh_args: arguments (following ``netsh interface ipv4``) of the step's commands
+    :param bool applied: whether the step's change was found in the configuration read back after
+        the batch (``None`` if the configuration was not verified)
+
+    """
+
+    __slots__ = ()
+
+
+class ConfigurationResult(namedtuple('ConfigurationResult', ['steps', 'exit_code', 'rolled_back',
+                                                             'rollback_exit_code'])):
+
+    """Result of :meth:`win_nic.NicConfiguration.apply`.
+
+    :param list steps: one :class:`win_nic.StepResult` per step, in order
+    :param int exit_code: exit code of the netsh batch
+    :param bool rolled_back: whether the prior configuration was restored after a failure
+    :param int rollback_exit_code: exit code of the rollback batch (``None`` if not rolled back)
+
+    """
+
+    __slots__ = ()
+
+    @property
+    def succeeded(self):
+        """Check if the batch succeeded and no step was found missing.
+
+        :rtype: bool
+
+        """
+        return self.exit_code == 0 and all(step.applied is not False for step in self.steps)
+
+
+class NicConfiguration:
+
+    """Builder of a NIC IP configuration applied as one netsh batch (see :meth:`win_nic.Nic.configure`).
+
+    Steps are collected with the chainable methods and applied together by :meth:`apply`::
+
+        >>> result = (nic.configure()
+        ...           .static_address('192.168.0.3', '255.255.255.0', '192.168.0.1')
+        ...           .dns_servers('192.168.0.1', '8.8.8.8', '8.8.4.4')
+        ...           .apply())
+
+    :param win_nic.Nic nic: NIC to configure
+
+    """
+
+    def __init__(self, nic):
+        self.nic = nic
+        self.policy = nic.policy
+        self._steps = []
+
+    def static_address(self, ip_addr, subnet_mask, gateway=None):
+        """Set a static IP address (and default gateway)."""
+        return self._add_step(f'static address {ip_addr}', [' '.join(
+            ['set address name="{name}" static', ip_addr, subnet_mask] + ([gateway] if gateway else []))],
+                              _verify_static_address(ip_addr, gateway))
+
+    def dhcp(self):
+        """Use DHCP to obtain the IP address."""
+        return self._add_step('DHCP address', ['set address name="{name}" source=dhcp'],
+                              lambda state: state.get('DHCPEnabled') is True)
+
+    def dns_servers(self, *dns_servers):
+        """Replace the DNS servers with static ones (in order of preference)."""
+        netsh_args = [f'set dnsservers name="{{name}}" source=static address={dns_servers[0]} register=primary '
+                      f'validate=no'] if dns_servers else ['set dnsservers name="{name}" source=static address=none']
+        netsh_args += [f'add dnsservers name="{{name}}" address={dns_server} index={position} validate=no'
+                       for position, dns_server in enumerate(dns_servers[1:], 2)]
+        return self._add_step(f'DNS servers {", ".join(dns_servers) or "none"}', netsh_args,
+                              lambda state: tuple(state.get('DNSServerSearchOrder') or ()) == dns_servers)
+
+    def dns_dhcp(self):
+        """Use DHCP to obtain the DNS servers."""
+        return self._add_step('DHCP DNS servers', ['set dnsservers name="{name}" source=dhcp'], None)
+
+    def add_dns_server(self, dns_server):
+        """Add a DNS server entry (after the existing ones)."""
+        return self._add_step(f'add DNS server {dns_server}',
+                              [f'add dnsservers name="{{name}}" address={dns_server} validate=no'],
+                              lambda state: dns_server in (state.get('DNSServerSearchOrder') or ()))
+
+    def _add_step(self, description, netsh_args, verify):
+        self._steps.append((description, netsh_args, verify))
+        return self
+
+    def commands(self):
+        """Get the netsh commands (arguments following ``netsh interface ipv4``) of all steps.
+
+        :rtype: list of str
+
+        """
+        name = self.nic.net_connection_id
+        return [netsh_args.format(name=name) for _, step_args, _ in self._steps for netsh_args in step_args]
+
+    @traced
+    def apply(self, rollback=True, verify=True):
+        """Apply all steps with one netsh batch (one process).
+
+        The adapter's configuration is read before the batch (to roll back to) and after it (to
+        verify each step). If the batch fails or a step is missing from the resulting configuration,
+        the parts of the captured configuration the steps change (address, DNS servers) are restored
+        with a second batch. If the batch raises (e.g. it timed out), the configuration is restored
+        before the exception is re-raised.
+
+        .. note:: To configure a NIC, the Python process must be running as administrator.
+
+        :param bool rollback: restore the prior configuration on failure
+        :param bool verify: read the configuration back to check each step
+        :rtype: win_nic.ConfigurationResult
+        :raises AttributeError: if ``rollback`` is set and the configuration to roll back to could
+            not be read (nothing is applied)
+
+        """
+        name = self.nic.net_connection_id
+        backend = self.nic._backend  # pylint: disable=protected-access
+        prior_state = self._query_state() if rollback else None
+        if rollback and not prior_state:
+            raise AttributeError(f"wmic did not return the configuration of NIC with index {self.nic.index} "
+                                 f"to roll back to")
+        restore_commands = _restore_commands(name, prior_state, self.commands()) if rollback else None
+        try:
+            exit_code = backend.run_netsh_script(self.commands())
+        except CircuitOpenError:
+            raise
+        except Exception:
+            # The batch may have stopped part-way (e.g. a timeout): restore, then re-raise the
+            # batch's exception even if restoring fails too.
+            if rollback:
+                with contextlib.suppress(Exception):
+                    backend.run_netsh_script(restore_commands)
+            self.nic.invalidate(*self.nic._address_affects)  # pylint: disable=protected-access
+            raise
+        state = self._query_state() if verify else None
+        steps = [StepResult(description, [netsh_args.format(name=name) for netsh_args in step_args],
+                            None if state is None or check is None else bool(check(state)))
+                 for description, step_args, check in self._steps]
+        result = ConfigurationResult(steps, exit_code, False, None)
+        if rollback and not result.succeeded:
+            result = result._replace(rolled_back=True, rollback_exit_code=backend.run_netsh_script(restore_commands))
+        self.nic.invalidate(*self.nic._address_affects)  # pylint: disable=protected-access
+        return result
+
+    def _query_state(self):
+        """Query the adapter's address and DNS configuration (one WMIC call)."""
+        records = self.nic._backend.query(  # pylint: disable=protected-access
+            'win32_networkadapterconfiguration', _STATE_PROPERTIES, f'index={self.nic.index}',
+            {'DHCPEnabled': lambda wmic_resp: wmic_resp == 'TRUE'})
+        return records[0] if records else {}
+
+
+def _verify_static_address(ip_addr, gateway):
+    def verify(state):
+        return (state.get('DHCPEnabled') is False and ip_addr in (state.get('IPAddress') or ())
+                and (gateway is None or gateway in (state.get('DefaultIPGateway') or ())))
+    return verify
+
+
+def _restore_commands(name, state, commands):
+    """Get the netsh commands restoring the parts (address, DNS servers) of a configuration that commands change."""
+    restore_commands = []
+    if any(' address ' in f' {command} ' for command in commands):
+        restore_commands += _restore_address_commands(name, state)
+    if any('dnsserver' in command for command in commands):
+        restore_commands += _restore_dns_commands(name, state)
+    return restore_commands
+
+
+def _restore_address_commands(name, state):
+    """Get the netsh commands restoring a captured address configuration."""
+    if state.get('DHCPEnabled'):
+        return [f'set address name="{name}" source=dhcp']
+    ipv4 = [(address, mask) for address, mask in zip(state.get('IPAddress') or (), state.get('IPSubnet') or ())
+            if ':' not in address]
+    gateways = [gateway for gateway in state.get('DefaultIPGateway') or () if ':' not in gateway]
+    commands = [' '.join([f'set address name="{name}" static', ipv4[0][0], ipv4[0][1]] + gateways[:1])] \
+        if ipv4 else []
+    commands += [f'add address name="{name}" address={address} mask={mask}' for address, mask in ipv4[1:]]
+    commands += [f'add address name="{name}" gateway={gateway} gwmetric=0' for gateway in gateways[1:]]
+    return commands
+
+
+def _restore_dns_commands(name, state):
+    """Get the netsh commands restoring captured DNS servers.
+
+    WMI does not report where DNS servers come from, so the DNS servers of an adapter whose
+    address comes from DHCP are taken to come from DHCP too (and are restored with
+    ``source=dhcp`` instead of being pinned as static servers).
+
+    """
+    if state.get('DHCPEnabled'):
+        return [f'set dnsservers name="{name}" source=dhcp']
+    dns_servers = [server for server in state.get('DNSServerSearchOrder') or () if ':' not in server]
+    commands = [f'set dnsservers name="{name}" source=static address={dns_servers[0] if dns_servers else "none"} '
+                f'register=primary validate=no']
+    commands += [f'add dnsservers name="{name}" address={dns_server} index={position} validate=no'
+                 for position, dns_server in enumerate(dns_servers[1:], 2)]
+    return commands
@@ -0,0 +1,147 @@
+﻿"""Module containing the descriptors of NIC attributes read from Windows class properties."""
+
+import functools
+import time
+
+from enum import EnumMeta
+
+from win_nic._profiling import call_site
+from win_nic._wmic_parser import apply_converter
+
+
+class TtlCache:
+
+    """Caching strategy keeping attribute values in the NIC's attribute cache until they expire.
+
+    Time-to-live values come from :meth:`win_nic.Nic._cache_attribute` (the ``cache_ttls``
+    overrides of the NIC, then the class defaults).
+
+    """
+
+    __slots__ = ()
+
+    @staticmethod
+    def lookup(nic, name):
+        """Get an unexpired cached value.
+
+        :raises KeyError: if no value is cached or the value expired
+
+        """
+        value, expires = nic._cache[name]  # pylint: disable=protected-access
+        if time.monotonic() >= expires:
+            raise KeyError(name)
+        return value
+
+    @staticmethod
+    def store(nic, name, value):
+        """Cache a value (unless the attribute's time-to-live is 0)."""
+        nic._cache_attribute(name, value)  # pylint: disable=protected-access
+
+
+class NoCache:
+
+    """Caching strategy fetching the attribute on every access."""
+
+    __slots__ = ()
+
+    @staticmethod
+    def lookup(nic, name):  # pylint: disable=unused-argument
+        """Report every value as missing."""
+        raise KeyError(name)
+
+    @staticmethod
+    def store(nic, name, value):  # pylint: disable=unused-argument
+        """Discard the value."""
+
+
+def fetch_property(nic, prop):
+    """Fetch strategy querying one property of the NIC through its backend (one WMIC call).
+
+    :raises AttributeError: if WMIC returned no value
+
+    """
+    value = nic._backend.get_property(prop.windows_class, f'index={nic.index}',  # pylint: disable=protected-access
+                                      prop.windows_name)
+    if value is None:
+        raise AttributeError(prop.missing_message)
+    return apply_converter(value, prop.converter)
+
+
+@functools.lru_cache(maxsize=None)
+def compile_converter(python_type):
+    """Get a callable casting a WMIC string to a Python type of the NIC property table.
+
+    Enumeration members are looked up by their WMIC string in a table (built once per type).
+
+    """
+    if isinstance(python_type, EnumMeta):
+        members = {str(member.value): member for member in python_type}
+
+        def convert(wmic_resp):
+            try:
+                return members[wmic_resp]
+            except KeyError:
+                return python_type(int(wmic_resp))
+        return convert
+
+    if python_type == bool:
+        return lambda wmic_resp: wmic_resp == 'TRUE'
+
+    return python_type
+
+
+class WmicProperty:
+
+    """Read-only NIC attribute backed by a property of a Windows class.
+
+    Read on the class, the descriptor itself is returned for introspection (e.g.
+    ``Nic.speed.windows_name``). Read on a NIC, the cached value is returned or, when no unexpired
+    value is cached, fetched, converted and cached.
+
+    :param str name: attribute name
+    :param str windows_name: Windows property name (e.g. ``'NetConnectionStatus'``, ``None`` for
+        attributes that ``fetch`` builds from several properties)
+    :param str windows_class: Windows class name (e.g. ``'win32_networkadapter'``)
+    :param type python_type: Python type of the attribute (``str``, ``int``, ``bool`` or an
+        enumeration)
+    :param fetch: callable getting the converted value of the attribute of a NIC from the NIC and
+        the descriptor (defaults to one WMIC query through the NIC's backend)
+    :param cache: caching strategy with ``lookup(nic, name)`` and ``store(nic, name, value)``
+        methods (defaults to :class:`TtlCache`)
+
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, name, windows_name, windows_class, python_type, fetch=None, cache=None):
+        self.name = name
+        self.windows_name = windows_name
+        self.windows_class = windows_class
+        self.python_type = python_type
+        self.converter = compile_converter(python_type)
+        self.fetch = fetch or fetch_property
+        self.cache = cache or TtlCache()
+        self.call_site = f'Nic.{name}'
+        self.missing_message = f"wmic did not return value for attribute '{windows_name or name}'"
+
+    def __repr__(self):
+        return (f"<WmicProperty {self.name} ({self.windows_class}.{self.windows_name}, "
+                f"{getattr(self.python_type, '__name__', self.python_type)})>")
+
+    def __get__(self, nic, owner=None):
+        if nic is None:
+            return self
+
+        try:
+            value = self.cache.lookup(nic, self.name)
+        except KeyError:
+            with call_site(self.call_site, nic.policy):
+                value = self.fetch(nic, self)
+            self.cache.store(nic, self.name, value)
+            return value
+
+        if value is None:
+            raise AttributeError(self.missing_message)
+        return value
+
+    def __set__(self, nic, value):
+        raise AttributeError(f"'{type(nic).__name__}' attribute '{self.name}' is not settable")
@@ -0,0 +1,110 @@
+﻿"""Module containing row streaming and formatting for NetworkAdapters.dump."""
+
+from enum import Enum
+from itertools import islice
+
+from win_nic._descriptors import compile_converter
+from win_nic._nic import _wmic_properties
+
+# Store the columns dumped by default and the titles of columns not titled after their attribute.
+DUMP_COLUMNS = ('index', 'name', 'net_connection_id')
+_COLUMN_TITLES = {'net_connection_id': 'Connection ID'}
+
+# Store the supported output formats (JSON lines and NDJSON are the same format).
+DUMP_FORMATS = ('table', 'csv', 'jsonl', 'ndjson')
+
+
+def check_columns(columns):
+    """Validate dump columns (``index`` and public :class:`win_nic.Nic` attributes of Win32_NetworkAdapter).
+
+    :returns: columns as a tuple
+    :raises ValueError: if a column is not a dumpable attribute
+
+    """
+    columns = tuple(columns)
+    for column in columns:
+        if column != 'index' and (column.startswith('_') or column not in _wmic_properties
+                                  or _wmic_properties[column][1] != 'win32_networkadapter'):
+            raise ValueError(f"'{column}' is not a dumpable NIC attribute")
+    return columns
+
+
+def row_query(columns):
+    """Get the Win32_NetworkAdapter property names and converters querying the columns (in one query)."""
+    converters = {'Index': int}
+    for column in columns:
+        if column != 'index':
+            windows_name, _, python_type = _wmic_properties[column]
+            converters[windows_name] = compile_converter(python_type)
+    return list(converters), converters
+
+
+def row_from_record(record, columns):
+    """Get the row of a Win32_NetworkAdapter query record."""
+    return tuple(record['Index'] if column == 'index' else record[_wmic_properties[column][0]]
+                 for column in columns)
+
+
+def write_rows(rows, columns, stream, output_format='table', page_size=None):
+    """Write rows to a stream as they arrive (only the rows of one table page are held at once).
+
+    :param rows: iterable of row tuples
+    :param tuple columns: column attribute names
+    :param stream: writable text stream
+    :param str output_format: ``'table'``, ``'csv'``, ``'jsonl'`` or ``'ndjson'``
+    :param int page_size: rows per table (one table of all rows if ``None``)
+
+    """
+    if output_format == 'table':
+        _write_tables(rows, columns, stream, page_size)
+    elif output_format == 'csv':
+        import csv  # pylint: disable=import-outside-toplevel
+
+        writer = csv.writer(stream, lineterminator='\n')
+        writer.writerow(columns)
+        for row in rows:
+            writer.writerow([_text(value) for value in row])
+    elif output_format in ('jsonl', 'ndjson'):
+        import json  # pylint: disable=import-outside-toplevel
+
+        for row in rows:
+            stream.write(json.dumps(dict(zip(columns, (_json(value) for value in row)))) + '\n')
+    else:
+        raise ValueError(f"'{output_format}' is not one of the dump formats {DUMP_FORMATS}")
+
+
+def _write_tables(rows, columns, stream, page_size):
+    import texttable  # pylint: disable=import-outside-toplevel
+
+    header = [_COLUMN_TITLES.get(column, column.replace('_', ' ').title()) for column in columns]
+    rows = iter(rows)
+    while True:
+        page = [[_text(value) for value in row] for row in islice(rows, page_size)]
+        if not page and page_size is not None:
+            return
+        table = texttable.Texttable()
+        table.set_cols_dtype(['t'] * len(columns))
+        table.add_rows([header] + page)
+        stream.write(table.draw() + '\n')
+        if page_size is None:
+            return
+
+
+def _text(value):
+    """Format a value for a table or CSV cell."""
+    if value is None:
+        return ''
+    if isinstance(value, Enum):
+        return value.name
+    if isinstance(value, tuple):
+        return ','.join(value)
+    return str(value)
+
+
+def _json(value):
+    """Format a value for a JSON object."""
+    if isinstance(value, Enum):
+        return value.name
+    if isinstance(value, tuple):
+        return list(value)
+    return value
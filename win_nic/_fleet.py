@@ -0,0 +1,151 @@
+﻿"""Module containing fleet (multi-host) execution over remote transports."""
+
+import queue
+import threading
+import time
+
+from collections import namedtuple
+
+from win_nic._backends import WmicBackend
+from win_nic._network_adapters import NetworkAdapters
+
+
+class HostResult(namedtuple('HostResult', ['host', 'value', 'exception', 'start', 'duration'])):
+
+    """Result of running a function on one host of a :class:`win_nic.Fleet`.
+
+    :param str host: host the function ran on
+    :param value: value returned by the function (``None`` if it raised an exception)
+    :param exception: exception raised by the transport or the function (a :class:`TimeoutError`
+        if the host did not finish within the fleet's timeout, ``None`` if it returned)
+    :param float start: seconds from the start of the fleet run until the host started
+    :param float duration: seconds the host took (until the timeout, if it timed out)
+
+    """
+
+    __slots__ = ()
+
+    @property
+    def succeeded(self):
+        """Check if the function returned (and did not time out).
+
+        :rtype: bool
+
+        """
+        return self.exception is None
+
+
+class Fleet:
+
+    """Hosts whose network adapters are enumerated and operated on in parallel.
+
+    Each host is reached through a transport: a callable mapping the host to a
+    :class:`win_nic.Backend` (by default :class:`win_nic.WmicBackend` with the WMIC ``/node``
+    switch). Plug in WinRM, SSH or other transports by returning a custom backend::
+
+        >>> fleet = Fleet(['host-1', 'host-2'], max_workers=32, timeout=30.0)
+        >>> for result in fleet.adapters():
+        ...     print(result.host, result.value.nic_connection_id_map if result.succeeded else result.exception)
+
+    At most ``max_workers`` hosts run at once. A host still running after ``timeout`` seconds is
+    reported with a :class:`TimeoutError` and its slot is handed to the next host; its calls finish
+    in the background (their results are discarded).
+
+    :param list hosts: host names or addresses
+    :param transport: callable returning the :class:`win_nic.Backend` reaching a host
+    :param int max_workers: maximum number of hosts running at once
+    :param float timeout: seconds each host may take (no limit if ``None``)
+    :param policy: execution policy of the WMIC and netsh invocations made on every host (e.g. to
+        kill hung WMIC processes of timed-out hosts). Each host runs under its own copy (see
+        :meth:`win_nic.ExecutionPolicy.copy`), so that unreachable hosts open only their own
+        circuit breakers. Pass a callable mapping a host to its policy to create them yourself.
+
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, hosts, transport=None, max_workers=16, timeout=None, policy=None):
+        self.hosts = list(hosts)
+        self.transport = transport or WmicBackend
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.policy = policy
+        self.policies = {}
+        self._policies_lock = threading.Lock()
+
+    def adapters(self):
+        """Enumerate the network adapters of every host.
+
+        :returns: one result per host (with a :class:`win_nic.NetworkAdapters` value), in the order
+            the hosts finish
+        :rtype: iterator of win_nic.HostResult
+
+        """
+        return self.run(lambda adapters: adapters)
+
+    def run(self, function):
+        """Run a function on the network adapters of every host::
+
+            >>> results = fleet.run(lambda adapters: adapters.get_nic(connection_id='Ethernet').disable())
+
+        :param function: callable accepting the :class:`win_nic.NetworkAdapters` of a host
+        :returns: one result per host, in the order the hosts finish
+        :rtype: iterator of win_nic.HostResult
+
+        """
+        fleet_start = time.monotonic()
+        results = queue.Queue()
+        pending = iter(enumerate(self.hosts))
+        running = {}
+
+        def start_next():
+            for position, host in pending:
+                running[position] = (host, time.monotonic())
+                threading.Thread(target=self._run_host, args=(position, host, function, fleet_start, results),
+                                 daemon=True).start()
+                return
+
+        for _ in range(self.max_workers):
+            start_next()
+        while running:
+            wait = None
+            if self.timeout is not None:
+                wait = max(0.0, min(start for _, start in running.values()) + self.timeout - time.monotonic())
+            try:
+                position, result = results.get(timeout=wait)
+            except queue.Empty:
+                now = time.monotonic()
+                for position, (host, start) in list(running.items()):
+                    if now - start >= self.timeout:
+                        del running[position]
+                        yield HostResult(host, None, TimeoutError(f"host '{host}' did not finish within "
+                                                                  f"{self.timeout} seconds"),
+                                         start - fleet_start, now - start)
+                        start_next()
+                continue
+            if running.pop(position, None) is not None:
+                yield result
+                start_next()
+
+    def host_policy(self, host):
+        """Get the execution policy of a host (created on first use and kept across runs).
+
+        :returns: policy of the host (``None`` if the fleet has no policy)
+        :rtype: win_nic.ExecutionPolicy
+
+        """
+        if self.policy is None:
+            return None
+        with self._policies_lock:
+            if host not in self.policies:
+                self.policies[host] = self.policy(host) if callable(self.policy) else self.policy.copy()
+            return self.policies[host]
+
+    def _run_host(self, position, host, function, fleet_start, results):
+        """Run the function on one host and put its position and result in the queue (host thread)."""
+        start = time.monotonic()
+        value = exception = None
+        try:
+            value = function(NetworkAdapters(backend=self.transport(host), policy=self.host_policy(host)))
+        except Exception as error:  # pylint: disable=broad-except
+            exception = error
+        results.put((position, HostResult(host, value, exception, start - fleet_start, time.monotonic() - start)))
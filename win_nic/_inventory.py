@@ -0,0 +1,192 @@
+﻿"""Module containing the NIC inventory file format (export, streaming import and offline backend)."""
+
+import json
+import mmap
+import os
+
+from enum import Enum
+
+from win_nic._backends import FakeBackend
+from win_nic._nic import NicSnapshot, _intern, _snapshot_field, _wmic_properties
+
+# Inventory files are JSON lines: a header object naming the format, the snapshot fields and
+# (optionally) the host, followed by one JSON array of field values per NIC. Several exports may
+# be concatenated into one multi-host file.
+INVENTORY_FORMAT = 'win-nic-inventory'
+INVENTORY_VERSION = 1
+
+# Store the Windows class, Windows name and Python type of each snapshot field.
+_field_properties = {_snapshot_field(item): (windows_class, windows_name, python_type)
+                     for item, (windows_name, windows_class, python_type) in _wmic_properties.items()}
+
+
+def export_inventory(snapshots, path, host=None, append=False, metadata=None):
+    """Write NIC snapshots to an inventory file.
+
+    :param snapshots: iterable of :class:`win_nic.NicSnapshot`
+    :param str path: path of the inventory file
+    :param str host: name of the host the snapshots were taken on (stored in the header)
+    :param bool append: append a section to an existing (multi-host) inventory file
+    :param dict metadata: JSON-serializable data stored in the header
+
+    """
+    with open(path, 'a' if append else 'w', encoding='utf-8') as inventory_file:
+        header = {'format': INVENTORY_FORMAT, 'version': INVENTORY_VERSION, 'host': host,
+                  'fields': list(NicSnapshot._fields)}
+        if metadata is not None:
+            header['metadata'] = metadata
+        inventory_file.write(json.dumps(header, separators=(',', ':')) + '\n')
+        for snapshot in snapshots:
+            inventory_file.write(json.dumps([_to_json(value) for value in snapshot], separators=(',', ':')) + '\n')
+
+
+def iter_inventory(path, host=None, use_mmap=True):
+    """Lazily read NIC snapshots from an inventory file.
+
+    :param str path: path of the inventory file
+    :param str host: only read the sections of this host (all sections if ``None``)
+    :param bool use_mmap: read the file through a memory map (avoids buffered copies of large files)
+    :returns: (host, snapshot) tuples in file order
+    :raises ValueError: if the file is not an inventory file
+
+    """
+    with open(path, 'rb') as inventory_file:
+        if use_mmap and os.fstat(inventory_file.fileno()).st_size:
+            with mmap.mmap(inventory_file.fileno(), 0, access=mmap.ACCESS_READ) as inventory_map:
+                yield from _iter_sections(iter(inventory_map.readline, b''), host)
+        else:
+            yield from _iter_sections(inventory_file, host)
+
+
+def read_inventory_header(path):
+    """Read the header of the first section of an inventory file.
+
+    :returns: header (with ``format``, ``version``, ``host``, ``fields`` and optional ``metadata`` keys)
+    :rtype: dict
+    :raises ValueError: if the file is not an inventory file
+
+    """
+    with open(path, 'rb') as inventory_file:
+        header = json.loads(inventory_file.readline() or b'null')
+    if not isinstance(header, dict) or header.get('format') != INVENTORY_FORMAT \
+            or header.get('version') != INVENTORY_VERSION:
+        raise ValueError(f"{path} is not a version {INVENTORY_VERSION} inventory file")
+    return header
+
+
+def _iter_sections(lines, host):
+    """Parse the lines of an inventory file into (host, snapshot) tuples."""
+    section_host, build = None, None
+    for line in lines:
+        entry = json.loads(line)
+        if isinstance(entry, dict):
+            if entry.get('format') != INVENTORY_FORMAT or entry.get('version') != INVENTORY_VERSION:
+                raise ValueError(f"unsupported inventory header: {line.decode('utf-8').strip()}")
+            section_host, build = entry.get('host'), _snapshot_builder(entry['fields'])
+            continue
+        if build is None:
+            raise ValueError("inventory file does not start with a header")
+        if host is None or section_host == host:
+            yield section_host, build(entry)
+
+
+def _snapshot_builder(fields):
+    """Get a callable building a snapshot from a row of JSON values of the given fields."""
+    parsers = [(position, _json_parser(field)) for position, field in enumerate(fields)
+               if field in _field_properties]
+
+    complete = fields == list(NicSnapshot._fields)
+
+    def build(row):
+        for position, parser in parsers:
+            if row[position] is not None:
+                row[position] = parser(row[position])
+        if complete:
+            return NicSnapshot._make(row)
+        values = dict.fromkeys(NicSnapshot._fields)
+        values.update((field, value) for field, value in zip(fields, row) if field in values)
+        return NicSnapshot(**values)
+    return build
+
+
+def _to_json(value):
+    """Convert a snapshot value to its JSON representation (enumerations as their integer value)."""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, tuple):
+        return list(value)
+    return value
+
+
+def _json_parser(field):
+    """Get a callable restoring the Python type of a (non-null) snapshot field value from JSON."""
+    python_type = _field_properties[field][2]
+    if issubclass(python_type, Enum):
+        return python_type
+    return _from_json
+
+
+def _from_json(value):
+    """Restore arrays (JSON lists) as tuples and intern strings."""
+    if isinstance(value, list):
+        return tuple(map(_intern, value))
+    return _intern(value)
+
+
+class InventoryBackend(FakeBackend):
+
+    """Read-only offline backend answering queries from NIC snapshots (e.g. a loaded inventory).
+
+    Method calls and netsh commands raise :class:`NotImplementedError`.
+
+    :param snapshots: iterable of :class:`win_nic.NicSnapshot`
+
+    """
+
+    def __init__(self, snapshots):
+        super().__init__({})
+        self.snapshots = list(snapshots)
+        self._instances_built = False
+
+    def _match(self, windows_class, where):
+        # Build the raw instances on first use, so that loading an inventory costs no conversion.
+        if not self._instances_built:
+            self.instances = _raw_instances(self.snapshots)
+            self._instances_built = True
+        return super()._match(windows_class, where)
+
+    def call_method(self, windows_class, where, method):
+        raise NotImplementedError(f"cannot call {method} on an offline inventory")
+
+    def run_netsh(self, netsh_args):
+        raise NotImplementedError("cannot run netsh on an offline inventory")
+
+    def run_netsh_script(self, netsh_args_list):
+        raise NotImplementedError("cannot run netsh on an offline inventory")
+
+
+def _raw_instances(snapshots):
+    """Convert snapshots to FakeBackend instances (Windows class to list of raw value dictionaries)."""
+    instances = {}
+    for snapshot in snapshots:
+        class_instances = {}
+        for field, value in zip(NicSnapshot._fields, snapshot):
+            if field in _field_properties and value is not None:
+                windows_class, windows_name, _ = _field_properties[field]
+                class_instances.setdefault(windows_class, {'Index': str(snapshot.index)})[windows_name] = _to_raw(value)
+        # Snapshots always have a Win32_NetworkAdapter row (see win_nic._nic._build_snapshots).
+        class_instances.setdefault('win32_networkadapter', {'Index': str(snapshot.index)})
+        for windows_class, instance in class_instances.items():
+            instances.setdefault(windows_class, []).append(instance)
+    return instances
+
+
+def _to_raw(value):
+    """Convert a snapshot value to the raw value WMIC would print (as FakeBackend instances store it)."""
+    if isinstance(value, bool):
+        return 'TRUE' if value else 'FALSE'
+    if isinstance(value, Enum):
+        return str(value.value)
+    if isinstance(value, tuple):
+        return value
+    return str(value)
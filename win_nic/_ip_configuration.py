@@ -0,0 +1,100 @@
+﻿"""Module containing the IP configuration model of NICs (Win32_NetworkAdapterConfiguration)."""
+
+from collections import namedtuple
+
+from win_nic._wmic_parser import as_array
+
+# Store the Win32_NetworkAdapterConfiguration properties read (in one query) for IP configurations.
+IP_CONFIGURATION_PROPERTIES = ['Index', 'DefaultIPGateway', 'DHCPEnabled', 'DHCPServer', 'DNSServerSearchOrder',
+                               'IPAddress', 'IPSubnet']
+
+
+class IpConfiguration(namedtuple('IpConfiguration', ['index', 'interfaces', 'gateways', 'dns_servers', 'dhcp_enabled',
+                                                     'dhcp_server'])):
+
+    """IP configuration of a NIC (see :attr:`win_nic.Nic.ip_configuration`).
+
+    :param int index: index of the NIC
+    :param tuple interfaces: IPv4 and IPv6 addresses paired with their prefixes (from IPAddress and
+        IPSubnet), as :class:`ipaddress.IPv4Interface` and :class:`ipaddress.IPv6Interface` objects
+    :param tuple gateways: default gateway addresses (:mod:`ipaddress` objects)
+    :param tuple dns_servers: DNS server addresses in order of preference (:mod:`ipaddress` objects)
+    :param bool dhcp_enabled: whether DHCP assigns the addresses (``None`` if unknown)
+    :param dhcp_server: DHCP server address (``None`` if none)
+
+    """
+
+    __slots__ = ()
+
+    @property
+    def addresses(self):
+        """Get the IP addresses (without prefixes).
+
+        :rtype: list of ipaddress.IPv4Address or ipaddress.IPv6Address
+
+        """
+        return [interface.ip for interface in self.interfaces]
+
+    @property
+    def ipv4_interfaces(self):
+        """Get the IPv4 addresses paired with their prefixes.
+
+        :rtype: list of ipaddress.IPv4Interface
+
+        """
+        return [interface for interface in self.interfaces if interface.version == 4]
+
+    @property
+    def ipv6_interfaces(self):
+        """Get the IPv6 addresses paired with their prefixes.
+
+        :rtype: list of ipaddress.IPv6Interface
+
+        """
+        return [interface for interface in self.interfaces if interface.version == 6]
+
+
+def query_ip_configurations(backend, index=None):
+    """Query the IP configuration of one NIC (or of all NICs if no index is given) with one query.
+
+    :returns: dictionary mapping index to :class:`IpConfiguration`
+
+    """
+    where = f'index={index}' if index is not None else None
+    records = backend.query('win32_networkadapterconfiguration', IP_CONFIGURATION_PROPERTIES, where,
+                            {'Index': int, 'DHCPEnabled': lambda wmic_resp: wmic_resp.upper() == 'TRUE'})
+    return {record['Index']: build_ip_configuration(record) for record in records}
+
+
+def build_ip_configuration(record):
+    """Build an IP configuration from a Win32_NetworkAdapterConfiguration query record.
+
+    :rtype: IpConfiguration
+
+    """
+    subnets = as_array(record.get('IPSubnet'))
+    interfaces = tuple(_interface(address, subnets[position] if position < len(subnets) else None)
+                       for position, address in enumerate(as_array(record.get('IPAddress'))))
+    dhcp_server = record.get('DHCPServer')
+    return IpConfiguration(record['Index'], interfaces, _addresses(record.get('DefaultIPGateway')),
+                           _addresses(record.get('DNSServerSearchOrder')), record.get('DHCPEnabled'),
+                           _address(dhcp_server) if dhcp_server else None)
+
+
+def _address(value):
+    """Parse an IP address, dropping an IPv6 zone (e.g. ``%12``)."""
+    import ipaddress  # pylint: disable=import-outside-toplevel
+    return ipaddress.ip_address(value.split('%', 1)[0].strip())
+
+
+def _addresses(value):
+    return tuple(_address(element) for element in as_array(value))
+
+
+def _interface(address, subnet):
+    """Pair an address with its subnet (an IPv4 mask or an IPv6 prefix length)."""
+    import ipaddress  # pylint: disable=import-outside-toplevel
+    address = _address(address)
+    if subnet is None:
+        return ipaddress.ip_interface(address)
+    return ipaddress.ip_interface(f'{address}/{subnet.strip()}')
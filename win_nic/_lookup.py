@@ -0,0 +1,98 @@
+﻿"""Module containing the NIC lookup index used by the network adapter classes."""
+
+import bisect
+import fnmatch
+import re
+
+from collections import OrderedDict
+
+# Store the lookup keys (keyword arguments of get_nic and get_nics) as a dictionary mapping the
+# keyword to the snapshot field it is looked up in.
+LOOKUP_FIELDS = OrderedDict([
+    ('index', 'index'),
+    ('name', 'name'),
+    ('connection_id', 'net_connection_id'),
+    ('guid', 'guid'),
+    ('mac_address', 'mac_address'),
+    ('interface_index', 'interface_index'),
+    ('pnp_device_id', 'pnp_device_id'),
+])
+
+_glob_rx = re.compile(r'[*?\[]')
+_mac_separator_rx = re.compile(r'[-:.]')
+
+
+class NicLookup:
+
+    """Index of NIC snapshots by every lookup key, built once per enumeration.
+
+    String keys are matched case-insensitively (MAC addresses also ignore ``-``, ``:`` and ``.``
+    separators) and may be glob patterns (``'Hyper-V*'``). Prefix patterns are answered from a
+    sorted key list without scanning every NIC.
+
+    :param dict nic_table: NIC table (index to :class:`win_nic.NicSnapshot`)
+
+    """
+
+    def __init__(self, nic_table):
+        self.indexes = sorted(nic_table)
+        self._exact = {key: {} for key in LOOKUP_FIELDS}
+        self._normalized = {key: {} for key in LOOKUP_FIELDS}
+        for index, snapshot in nic_table.items():
+            for key, field in LOOKUP_FIELDS.items():
+                value = getattr(snapshot, field)
+                if value is not None:
+                    self._exact[key].setdefault(value, index)
+                    self._normalized[key].setdefault(_normalize(key, value), []).append(index)
+        self._sorted_keys = {key: sorted(normalized) for key, normalized in self._normalized.items()
+                             if all(isinstance(value, str) for value in normalized)}
+
+    def find(self, key, value):
+        """Get the index of the NIC whose key equals the value.
+
+        Exact matches take precedence, otherwise the value must match a single NIC
+        case-insensitively.
+
+        :raises KeyError: if no NIC (or more than one NIC) matches
+
+        """
+        try:
+            return self._exact[key][value]
+        except KeyError:
+            indexes = self._normalized[key].get(_normalize(key, value), [])
+            if len(indexes) != 1:
+                raise
+            return indexes[0]
+
+    def match(self, key, pattern):
+        """Get the indexes of the NICs whose key matches a value or glob pattern.
+
+        :rtype: set of int
+
+        """
+        normalized = self._normalized[key]
+        pattern = _normalize(key, pattern)
+        if not isinstance(pattern, str) or not _glob_rx.search(pattern):
+            return set(normalized.get(pattern, ()))
+
+        prefix = pattern[:-1]
+        if pattern.endswith('*') and not _glob_rx.search(prefix) and key in self._sorted_keys:
+            sorted_keys = self._sorted_keys[key]
+            start = bisect.bisect_left(sorted_keys, prefix)
+            end = start
+            while end < len(sorted_keys) and sorted_keys[end].startswith(prefix):
+                end += 1
+            matched_keys = sorted_keys[start:end]
+        else:
+            pattern_rx = re.compile(fnmatch.translate(pattern))
+            matched_keys = [value for value in normalized if isinstance(value, str) and pattern_rx.match(value)]
+        return {index for value in matched_keys for index in normalized[value]}
+
+
+def _normalize(key, value):
+    """Normalize a lookup value (or pattern) for case-insensitive matching."""
+    if not isinstance(value, str):
+        return value
+    if key == 'mac_address':
+        value = _mac_separator_rx.sub('', value)
+    return value.casefold()
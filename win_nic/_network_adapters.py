@@ -1,51 +1,353 @@
 ﻿"""Module containing NetworkAdapters class."""
 
-import texttable
+import functools
+import sys
+import time
+import types
 
-from win_nic._nic import Nic
-from win_nic._utils import run_wmic_command
+from win_nic._bulk import run_bulk
+from win_nic import _backends
+from win_nic._dump import DUMP_COLUMNS, check_columns, row_from_record, row_query, write_rows
+from win_nic._ip_configuration import query_ip_configurations
+from win_nic._lookup import LOOKUP_FIELDS, NicLookup
+from win_nic._nic import Nic, _query_snapshots, _wmic_properties
+from win_nic._profiling import call_site, traced
+from win_nic._reconcile import RECONCILE_KEYS, ReconcileResult, check_settings, plan_actions, query_connection_statuses
+from win_nic._watch import WATCHED_FIELDS, WatchSchedule
+from win_nic._wql import build_where
+
+
+class _ClassOrInstanceMethod:  # pylint: disable=too-few-public-methods
+
+    """Method descriptor binding to the instance or, when read from the class, to the class."""
+
+    def __init__(self, function):
+        self.__func__ = function
+        functools.update_wrapper(self, function)
+
+    def __get__(self, instance, owner=None):
+        return types.MethodType(self.__func__, owner if instance is None else instance)
 
 
-# pylint: disable=too-few-public-methods
 class NetworkAdapters:
 
-    """Network adapter discoverer class."""
+    """Network adapter discoverer class.
+
+    All attributes of all NICs are enumerated up front with one WMIC call per Windows class. The
+    resulting table of :class:`win_nic.NicSnapshot` instances (keyed by index) backs NIC lookup,
+    :meth:`dump`, and the attribute caches of NICs returned by :meth:`get_nic`.
 
-    def __init__(self):
+    :param win_nic.Backend backend: transport used for enumeration and by the NICs returned by
+        :meth:`get_nic` (defaults to launching ``wmic`` and ``netsh`` processes)
+    :param win_nic.SnapshotCache cache: on-disk cache the NIC table is loaded from (when valid) and
+        saved to, instead of enumerating on every instantiation
+    :param win_nic.ExecutionPolicy policy: timeouts, retries and circuit breaking of the WMIC and
+        netsh invocations made for the adapters and the NICs returned by :meth:`get_nic` (defaults
+        to the policy set with :func:`win_nic.set_default_policy`)
+
+    """
+
+    def __init__(self, backend=None, cache=None, policy=None):
+        self.backend = backend or _backends.default_backend
+        self.cache = cache
+        self.policy = policy
+        self.nic_table = {}
         self.nic_connection_id_map = {}
+        self.nic_guid_map = {}
+        self.nic_mac_address_map = {}
         self.nic_name_map = {}
+        self._nic_attributes = None
+        self._enumerated_at = None
+        with call_site('NetworkAdapters.__init__', policy):
+            nic_table = cache.load(self.backend) if cache is not None else None
+        if nic_table is None:
+            self.refresh()
+        else:
+            self._set_nic_table(nic_table)
+            self._nic_attributes = cache.nic_attributes
 
-        # Get the index and name of each NIC.
-        nic_rows = run_wmic_command(['nic', 'get', 'Index,' 'Name'])
-        for nic in nic_rows:
-            index = int(nic.split(' ')[0])
-            name = ' '.join(nic.split(' ')[1:]).strip()
-            self.nic_name_map[name] = index
+    @staticmethod
+    def bulk(operations, max_workers=8, stop_on_error=False):
+        """Run NIC operations (e.g. ``disable``, ``set_static_address``) in a bounded thread pool.
 
-        # Get the index and net connection ID of each NIC.
-        nic_rows = run_wmic_command(['nic', 'get', 'Index,' 'NetConnectionID'])
-        for nic in nic_rows:
-            index = int(nic.split(' ')[0])
-            name = ' '.join(nic.split(' ')[1:]).strip()
-            self.nic_connection_id_map[name] = index
+        Operations on the same NIC run one after another in the order given; operations on
+        different NICs run in parallel::
 
-    @staticmethod
-    def dump():
-        """Print a table of NICs to the console."""
-        table_header = ['Index', 'Name', 'Connection ID']
-        nic_list_raw = [list(filter(None, row.split('  ')))
-                        for row in run_wmic_command(['nic', 'get', 'Index,', 'Name,',
-                                                     'NetConnectionID'])]
-        nic_list_filled = [entry + [''] if len(entry) == 2 else entry for entry in nic_list_raw]
-        nic_list_filled.insert(0, table_header)
-        table = texttable.Texttable()
-        table.add_rows(nic_list_filled)
-        print(table.draw())  # pylint: disable=superfluous-parens
-
-    def get_nic(self, index=None, name=None, connection_id=None):
+            >>> adapters.bulk([(nic_a, 'disable'), (nic_a, 'enable'),
+            ...                (nic_b, 'set_static_address', ('192.168.0.3', '255.255.255.0', '192.168.0.1'))])
+
+        :param operations: iterable of (nic, operation name, argument tuple) tuples (the argument
+            tuple may be omitted)
+        :param int max_workers: maximum number of NICs operated on at once
+        :param bool stop_on_error: skip the remaining operations on a NIC after one fails
+        :returns: one result per operation (with return value and timing), in the order given
+        :rtype: list of win_nic.BulkResult
+
+        """
+        return run_bulk(operations, max_workers, stop_on_error)
+
+    @_ClassOrInstanceMethod
+    def dump(self, stream=None, columns=DUMP_COLUMNS, output_format='table', page_size=None, refresh=False):
+        """Write NICs to a stream (the console by default) as a table, CSV or JSON lines.
+
+        CSV and JSON lines rows are written as soon as they arrive (see :meth:`iter_rows`); a table
+        is written once all its rows arrived, so use ``page_size`` to write large tables in pages::
+
+            >>> adapters.dump(log_file, columns=['index', 'name', 'mac_address', 'speed'],
+            ...               output_format='ndjson', refresh=True)
+
+        Called on the class (``NetworkAdapters.dump()``, as in earlier releases), the rows are queried
+        through the default backend without enumerating NICs.
+
+        :param stream: writable text stream (defaults to ``sys.stdout``)
+        :param list columns: ``index`` and names of NIC attributes (see :meth:`iter_rows`)
+        :param str output_format: ``'table'``, ``'csv'``, ``'jsonl'`` or ``'ndjson'``
+        :param int page_size: rows per table (one table of all NICs if ``None``)
+        :param bool refresh: stream the rows from a new query instead of the NIC table
+
+        """
+        columns = check_columns(columns)
+        if isinstance(self, type):
+            with call_site('NetworkAdapters.dump'):
+                rows = _query_rows(_backends.default_backend, columns)
+                write_rows(rows, columns, stream or sys.stdout, output_format, page_size)
+            return
+        write_rows(self.iter_rows(columns, refresh), columns, stream or sys.stdout, output_format, page_size)
+
+    def export(self, path, host=None, append=False):
+        """Save the NIC table to an inventory file (JSON lines, see :meth:`load`).
+
+        :param str path: path of the inventory file
+        :param str host: name of the host (to tell sections of a multi-host inventory apart)
+        :param bool append: append a section to an existing (multi-host) inventory file
+
+        """
+        from win_nic._inventory import export_inventory  # pylint: disable=import-outside-toplevel
+
+        export_inventory(self.nic_table.values(), path, host, append)
+
+    @traced
+    def ip_configurations(self):
+        """Get the IP configuration of every NIC with one WMIC call (see :attr:`win_nic.Nic.ip_configuration`).
+
+        :returns: dictionary mapping NIC index to IP configuration (NICs without one are left out)
+        :rtype: dict of win_nic.IpConfiguration
+
+        """
+        return {index: configuration for index, configuration in sorted(query_ip_configurations(self.backend).items())
+                if index in self.nic_table}
+
+    def iter_rows(self, columns=DUMP_COLUMNS, refresh=False):
+        """Iterate over rows of NIC attribute values (ordered by index).
+
+        :param list columns: ``index`` and names of NIC attributes of Win32_NetworkAdapter (e.g.
+            ``name``, ``mac_address``, ``net_connection_status``)
+        :param bool refresh: query all columns with one WMIC call and yield each row as WMIC prints
+            it (without holding the whole output), instead of reading the NIC table
+        :returns: tuples of attribute values (``None`` where WMIC returned no value)
+        :raises ValueError: if a column is not a dumpable attribute
+
+        """
+        columns = check_columns(columns)
+        if not refresh:
+            return (tuple(getattr(snapshot, column) for column in columns) for snapshot in self.nic_table.values())
+        with call_site('NetworkAdapters.iter_rows', self.policy):
+            return _query_rows(self.backend, columns)
+
+    @classmethod
+    def load(cls, path, host=None, use_mmap=True):
+        """Instantiate from an inventory file saved by :meth:`export` without querying WMI.
+
+        NICs returned by :meth:`get_nic` read their attributes from the inventory (an offline
+        :class:`win_nic.InventoryBackend`), and calling their methods raises
+        :class:`NotImplementedError`.
+
+        :param str path: path of the inventory file
+        :param str host: host whose sections are loaded (required if the file has several hosts)
+        :param bool use_mmap: read the file through a memory map
+        :rtype: win_nic.NetworkAdapters
+        :raises ValueError: if ``host`` is ``None`` and the file has sections of several hosts
+
+        """
+        # pylint: disable=import-outside-toplevel
+        from win_nic._inventory import InventoryBackend, iter_inventory
+
+        def iter_snapshots():
+            hosts = set()
+            for snapshot_host, snapshot in iter_inventory(path, host, use_mmap):
+                hosts.add(snapshot_host)
+                if len(hosts) > 1:
+                    raise ValueError(f"{path} has sections of several hosts ({', '.join(sorted(map(str, hosts)))}), "
+                                     f"pass the host to load")
+                yield snapshot
+
+        backend = InventoryBackend(iter_snapshots())
+        return cls._from_nic_table({snapshot.index: snapshot for snapshot in backend.snapshots}, backend)
+
+    @classmethod
+    def _from_nic_table(cls, nic_table, backend=None):
+        """Instantiate with a NIC table filled straight from snapshots instead of enumerating through the backend."""
+        adapters = cls.__new__(cls)
+        adapters.backend, adapters.cache, adapters.policy, adapters._nic_attributes = backend, None, None, None
+        adapters._set_nic_table(nic_table)
+        return adapters
+
+    @classmethod
+    def query(cls, columns=DUMP_COLUMNS, backend=None, policy=None, **predicates):
+        """Get the NICs matching attribute predicates with one WMIC call, filtering inside WMI.
+
+        Predicates are turned into a WQL where clause (no adapters are enumerated client-side)::
+
+            >>> NetworkAdapters.query(physical_adapter=True,
+            ...                       net_connection_status=NicNetConnectionStatus.CONNECTED,
+            ...                       columns=['index', 'name', 'mac_address'])
+
+        :param list columns: ``index`` and names of NIC attributes of Win32_NetworkAdapter fetched by
+            the query into the attribute caches of the returned NICs
+        :param win_nic.Backend backend: transport used for the query and by the returned NICs
+        :param win_nic.ExecutionPolicy policy: execution policy of the query and the returned NICs
+        :param predicates: ``index`` or NIC attribute of Win32_NetworkAdapter to value (a string,
+            which may be a glob pattern, a number, a bool, an enumeration member, ``None`` to match
+            empty attributes, or a list of values to match any of them)
+        :returns: NIC instances ordered by index
+        :rtype: list of win_nic.Nic
+        :raises TypeError: if a predicate is not on a Win32_NetworkAdapter attribute
+
+        """
+        columns = check_columns(columns)
+        try:
+            check_columns(predicates)
+        except ValueError as error:
+            raise TypeError(f"unsupported NIC query predicate: {error}") from None
+        where = build_where((_wmic_properties[name][0] if name != 'index' else 'Index', value)
+                            for name, value in predicates.items())
+        backend = backend or _backends.default_backend
+        windows_names, converters = row_query(columns)
+        with call_site('NetworkAdapters.query', policy):
+            records = backend.query('win32_networkadapter', windows_names, where, converters)
+        nics = []
+        for record in sorted(records, key=lambda record: record['Index']):
+            nic = Nic(record['Index'], backend=backend, policy=policy)
+            for column, value in zip(columns, row_from_record(record, columns)):
+                if column != 'index':
+                    nic._cache_attribute(column, value)  # pylint: disable=protected-access
+            nics.append(nic)
+        return nics
+
+    @traced
+    def reconcile(self, spec, dry_run=False, max_workers=8):
+        """Bring NICs to a desired state, calling only the NIC methods needed.
+
+        The current state of every NIC is read up front (one WMIC call for the IP configurations,
+        plus one for the connection statuses if any desired state sets ``enabled``) and compared
+        with the desired states. NICs already in their desired state cost no further calls::
+
+            >>> result = adapters.reconcile({
+            ...     'Local Area Connection': {'address': '192.168.0.10/24', 'gateway': '192.168.0.1',
+            ...                               'dns_servers': ['192.168.0.1', '8.8.8.8']},
+            ...     'Wireless Area Connection': {'enabled': False},
+            ... }, dry_run=True)
+            >>> print(result.plan())
+
+        Desired state settings (all optional):
+
+        * ``enabled`` (bool): whether the NIC is enabled (see :attr:`win_nic.Nic.enabled_ctrl_panel`)
+        * ``dhcp`` (bool): use DHCP for the IP address (when true)
+        * ``address`` (str): static IPv4 address with prefix length or subnet mask (``'192.168.0.10/24'``)
+        * ``gateway`` (str): static default gateway (with ``address``)
+        * ``dns_servers`` (list of str): DNS servers in order of preference (missing servers are
+          appended if the current servers come first, otherwise all servers are replaced)
+
+        .. note:: To change NICs, the Python process must be running as administrator.
+
+        :param dict spec: dictionary mapping NIC connection ID, GUID or MAC address to a dictionary
+            of desired state settings
+        :param bool dry_run: plan the calls without making them
+        :param int max_workers: maximum number of NICs changed at once (calls on one NIC run in
+            order and stop at the first failure)
+        :rtype: win_nic.ReconcileResult
+        :raises KeyError: if a key matches no NIC
+        :raises TypeError: if a desired state has unknown settings
+
+        """
+        targets = [(key, self._reconcile_index(key), check_settings(key, settings)) for key, settings in spec.items()]
+        configurations = query_ip_configurations(self.backend)
+        statuses = (query_connection_statuses(self.backend)
+                    if any(settings.get('enabled') is not None for _, _, settings in targets) else {})
+        actions = [action for key, index, settings in targets
+                   for action in plan_actions(key, self._new_nic(index), settings, configurations.get(index),
+                                              statuses.get(index))]
+        if dry_run:
+            return ReconcileResult(actions, None)
+        return ReconcileResult(actions, run_bulk([(action.nic, action.operation, action.args) for action in actions],
+                                                 max_workers, stop_on_error=True))
+
+    def _reconcile_index(self, key):
+        for lookup_key in RECONCILE_KEYS:
+            try:
+                return self._nic_lookup.find(lookup_key, key)
+            except KeyError:
+                pass
+        raise KeyError(f"no NIC has connection ID, GUID or MAC address '{key}'")
+
+    @traced
+    def refresh(self):
+        """Re-enumerate all NICs and rebuild the NIC table and lookup maps (and update the cache, if any)."""
+        self._set_nic_table(_query_snapshots(backend=self.backend))
+        self._nic_attributes = None
+        if self.cache is not None:
+            self.cache.save(self.nic_table)
+
+    # pylint: disable=too-many-arguments
+    def watch(self, interval=1.0, max_interval=30.0, backoff=1.5, fields=WATCHED_FIELDS, max_failures=3,
+              max_polls=None):
+        """Poll all NICs and yield their changes (adapters added or removed and field changes).
+
+        Each poll is one batched enumeration (one WMIC call per Windows class, regardless of the
+        number of NICs) compared against the previous one. The NIC table and lookup maps are
+        updated after every poll::
+
+            >>> for change in adapters.watch():
+            ...     print(change.kind, change.index, change.field, change.old, change.new)
+
+        :param float interval: seconds between polls while changes are being detected
+        :param float max_interval: seconds between polls after a long quiet period
+        :param float backoff: factor the interval grows by after each quiet or failed poll
+        :param tuple fields: names of the :class:`win_nic.NicSnapshot` fields (or properties) compared
+        :param int max_failures: number of consecutive failed polls after which the exception
+            raised by the last one propagates
+        :param int max_polls: number of polls after which the generator stops (unlimited if ``None``)
+        :rtype: generator of win_nic.NicChange
+
+        """
+        schedule = WatchSchedule(self.nic_table, self._set_nic_table, interval=interval, max_interval=max_interval,
+                                 backoff=backoff, fields=fields, max_failures=max_failures, max_polls=max_polls)
+        for delay in schedule:
+            time.sleep(delay)
+            try:
+                with call_site('NetworkAdapters.watch', self.policy):
+                    nic_table = _query_snapshots(backend=self.backend)
+            except Exception as error:  # pylint: disable=broad-except
+                schedule.failed(error)
+            else:
+                yield from schedule.update(nic_table)
+
+    def _set_nic_table(self, nic_table):
+        self.nic_table = nic_table
+        self._enumerated_at = time.monotonic()
+        self.nic_connection_id_map = _build_map(self.nic_table, 'net_connection_id')
+        self.nic_guid_map = _build_map(self.nic_table, 'guid')
+        self.nic_mac_address_map = _build_map(self.nic_table, 'mac_address')
+        self.nic_name_map = _build_map(self.nic_table, 'name')
+        self._nic_lookup = NicLookup(self.nic_table)
+
+    # pylint: disable=too-many-arguments
+    def get_nic(self, index=None, name=None, connection_id=None, guid=None, mac_address=None, interface_index=None,
+                pnp_device_id=None):
         """Get the specified NIC instance.
 
-        Note that only one parameter is used to discover the NIC.
+        Note that only one parameter is used to discover the NIC. String parameters fall back to a
+        case-insensitive match when no NIC matches exactly.
 
         :param int index:
             index number of the network adapter (as stored in the system registry)
@@ -57,19 +359,86 @@ class NetworkAdapters:
             name of the network connection as it appears in the Network Connections
             Control Panel program
 
+        :param str guid:
+            globally unique identifier for the connection
+
+        :param str mac_address:
+            media access control address for this network adapter (with any separators)
+
+        :param int interface_index:
+            index value that uniquely identifies the local network interface
+
+        :param str pnp_device_id:
+            Windows Plug and Play device identifier of the logical device
+
         :returns:
             Windows network interface card (NIC) instance
 
         :rtype: win_nic.Nic
 
         """
-        if index:
-            nic_instance = Nic(index)
-        elif name:
-            nic_instance = Nic(self.nic_name_map[name])
-        elif connection_id:
-            nic_instance = Nic(self.nic_connection_id_map[connection_id])
-        else:
-            raise NameError("no NIC identifier specified")
+        nic_index = self._lookup_index(index=index, name=name, connection_id=connection_id, guid=guid,
+                                       mac_address=mac_address, interface_index=interface_index,
+                                       pnp_device_id=pnp_device_id)
+        return self._new_nic(nic_index)
+
+    def get_nics(self, **criteria):
+        """Get every NIC matching all given criteria (every enumerated NIC if none are given).
+
+        Criteria are the parameters of :meth:`get_nic`. String criteria match case-insensitively and
+        may be glob patterns::
+
+            >>> adapters.get_nics(name='Hyper-V*', connection_id='vEthernet (*)')
+
+        :returns: NIC instances ordered by index
+        :rtype: list of win_nic.Nic
+
+        """
+        return [self._new_nic(index) for index in self._match_indexes(criteria)]
+
+    def _new_nic(self, index):
+        """Instantiate a NIC with its attribute cache filled from the NIC table.
+
+        Cached values expire as if they had been fetched when the NIC table was enumerated.
+
+        """
+        snapshot = self.nic_table.get(index)
+        nic = Nic(index, backend=self.backend, policy=self.policy)
+        if snapshot is not None:
+            # Only the attributes configured on the cache are trusted from a table loaded from disk.
+            nic._fill_cache(snapshot, self._nic_attributes, self._enumerated_at)  # pylint: disable=protected-access
+        return nic
+
+    def _lookup_index(self, **criteria):
+        for key in LOOKUP_FIELDS:
+            value = criteria.get(key)
+            if value is None:
+                continue
+            if key == 'index':
+                return value
+            return self._nic_lookup.find(key, value)
+
+        raise NameError("no NIC identifier specified")
+
+    def _match_indexes(self, criteria):
+        unknown = set(criteria) - set(LOOKUP_FIELDS)
+        if unknown:
+            raise TypeError(f"unknown NIC lookup criteria: {', '.join(sorted(unknown))}")
+        indexes = set(self._nic_lookup.indexes)
+        for key, pattern in criteria.items():
+            if pattern is not None:
+                indexes &= self._nic_lookup.match(key, pattern)
+        return sorted(indexes)
+
+
+def _query_rows(backend, columns):
+    """Query rows of NIC attribute values with one WMIC call, yielding each row as WMIC prints it."""
+    windows_names, converters = row_query(columns)
+    return (row_from_record(record, columns)
+            for record in backend.iter_query('win32_networkadapter', windows_names, None, converters))
+
 
-        return nic_instance
+def _build_map(nic_table, field):
+    """Map the (non-empty) values of a snapshot field to NIC indexes."""
+    return {getattr(snapshot, field): index for index, snapshot in nic_table.items()
+            if getattr(snapshot, field) is not None}
@@ -1,15 +1,30 @@
 ﻿"""Module containing Nic class."""
 
-import re
+import math
+import sys
+import time
 
-from enum import EnumMeta
+from collections import namedtuple
 
 from win_nic.enums.nic_adapter_type import NicAdapterType
 from win_nic.enums.nic_availability import NicAvailability
 from win_nic.enums.nic_config_manager_error_code import NicConfigManagerErrorCode
 from win_nic.enums.nic_net_connection_status import NicNetConnectionStatus
 
-from win_nic._utils import parse_array, run_netsh_command, run_wmic_command
+from win_nic import _backends
+from win_nic._configuration import NicConfiguration
+from win_nic._descriptors import WmicProperty, compile_converter
+from win_nic._ip_configuration import IpConfiguration, query_ip_configurations
+from win_nic._profiling import traced
+from win_nic._wmic_parser import apply_converter, as_array, parse_value
+
+
+def _fetch_ip_configuration(nic, prop):  # pylint: disable=unused-argument
+    """Fetch strategy of :attr:`Nic.ip_configuration` querying every property it needs (one WMIC call)."""
+    try:
+        return query_ip_configurations(nic._backend, nic.index)[nic.index]  # pylint: disable=protected-access
+    except KeyError:
+        raise AttributeError(f"wmic did not return IP configuration of NIC with index {nic.index}") from None
 
 
 class Nic:
@@ -17,6 +32,16 @@ class Nic:
     """Windows network interface card (NIC) class.
 
     :param int index: index number of the network adapter (as stored in the system registry)
+    :param bool prefetch: fetch all attributes up front with :meth:`snapshot` (one WMIC call per
+        Windows class) to fill the attribute cache
+    :param dict cache_ttls: attribute name to cache time-to-live (in seconds) overrides, use ``0`` to
+        disable caching of an attribute
+    :param win_nic.NicSnapshot snapshot: previously fetched snapshot used to fill the attribute cache
+    :param win_nic.Backend backend: transport used for queries, method calls and netsh commands
+        (defaults to launching ``wmic`` and ``netsh`` processes)
+    :param win_nic.ExecutionPolicy policy: timeouts, retries and circuit breaking of the WMIC and
+        netsh invocations made for the NIC (defaults to the policy set with
+        :func:`win_nic.set_default_policy`)
 
     """
 
@@ -50,58 +75,100 @@ class Nic:
         'speed': ('Speed', 'win32_networkadapter', int),
     }
 
-    def __init__(self, index):
-        self.index = index
-
-    def __getattr__(self, item):
-        if item not in self._wmic_properties:
-            raise AttributeError(f"'Nic' object has no attribute '{item}'")
-
-        windows_name = self._wmic_properties[item][0]
-        windows_class = self._wmic_properties[item][1]
-        python_type = self._wmic_properties[item][2]
-
-        wmic_resp_list = run_wmic_command([
-            'path', windows_class, 'where', f'index={self.index}', 'get', windows_name])
-
-        try:
-            wmic_resp = wmic_resp_list[0]
-        except IndexError:
-            raise AttributeError(f"wmic did not return value for attribute '{windows_name}'")
-
-        if isinstance(python_type, EnumMeta):
-            # Convert response to integer before casting to enumeration.
-            wmic_resp = int(wmic_resp)
+    # Declare one WmicProperty descriptor per entry of the table (in the class body, so that linters
+    # and IDEs see the attributes).
+    adapter_type = WmicProperty('adapter_type', *_wmic_properties['adapter_type'])
+    availability = WmicProperty('availability', *_wmic_properties['availability'])
+    caption = WmicProperty('caption', *_wmic_properties['caption'])
+    config_manager_error_code = WmicProperty('config_manager_error_code',
+                                             *_wmic_properties['config_manager_error_code'])
+    config_manager_user_config = WmicProperty('config_manager_user_config',
+                                              *_wmic_properties['config_manager_user_config'])
+    description = WmicProperty('description', *_wmic_properties['description'])
+    device_id = WmicProperty('device_id', *_wmic_properties['device_id'])
+    error_cleared = WmicProperty('error_cleared', *_wmic_properties['error_cleared'])
+    error_description = WmicProperty('error_description', *_wmic_properties['error_description'])
+    guid = WmicProperty('guid', *_wmic_properties['guid'])
+    installed = WmicProperty('installed', *_wmic_properties['installed'])
+    interface_index = WmicProperty('interface_index', *_wmic_properties['interface_index'])
+    _ip_address_raw = WmicProperty('_ip_address_raw', *_wmic_properties['_ip_address_raw'])
+    last_error_code = WmicProperty('last_error_code', *_wmic_properties['last_error_code'])
+    mac_address = WmicProperty('mac_address', *_wmic_properties['mac_address'])
+    manufacturer = WmicProperty('manufacturer', *_wmic_properties['manufacturer'])
+    name = WmicProperty('name', *_wmic_properties['name'])
+    net_connection_id = WmicProperty('net_connection_id', *_wmic_properties['net_connection_id'])
+    net_connection_status = WmicProperty('net_connection_status', *_wmic_properties['net_connection_status'])
+    physical_adapter = WmicProperty('physical_adapter', *_wmic_properties['physical_adapter'])
+    pnp_device_id = WmicProperty('pnp_device_id', *_wmic_properties['pnp_device_id'])
+    power_management_supported = WmicProperty('power_management_supported',
+                                              *_wmic_properties['power_management_supported'])
+    product_name = WmicProperty('product_name', *_wmic_properties['product_name'])
+    service_name = WmicProperty('service_name', *_wmic_properties['service_name'])
+    speed = WmicProperty('speed', *_wmic_properties['speed'])
+
+    # Store attribute cache time-to-live values (in seconds). Attributes not listed here use the
+    # default time-to-live. Static attributes never expire and volatile attributes expire quickly.
+    _default_cache_ttl = 60.0
+    _cache_ttls = {
+        'adapter_type': math.inf,
+        'device_id': math.inf,
+        'guid': math.inf,
+        'mac_address': math.inf,
+        'manufacturer': math.inf,
+        'physical_adapter': math.inf,
+        'pnp_device_id': math.inf,
+        'product_name': math.inf,
+        'service_name': math.inf,
+        '_ip_address_raw': 2.0,
+        'availability': 2.0,
+        'ip_configuration': 2.0,
+        'net_connection_status': 2.0,
+        'speed': 2.0,
+    }
 
-        if python_type == bool:
-            retval = wmic_resp == 'TRUE'
-        else:
-            retval = python_type(wmic_resp)
+    # Store the attributes affected by each state-changing method (invalidated after the call).
+    _enable_affects = ('_ip_address_raw', 'availability', 'config_manager_error_code', 'ip_configuration',
+                       'net_connection_status', 'speed')
+    _address_affects = ('_ip_address_raw', 'ip_configuration')
 
-        return retval
+    # Get the IP configuration (addresses with prefixes, gateways, DNS servers and DHCP state) of
+    # Win32_NetworkAdapterConfiguration with one WMIC call (not part of snapshots).
+    ip_configuration = WmicProperty('ip_configuration', None, 'win32_networkadapterconfiguration', IpConfiguration,
+                                    fetch=_fetch_ip_configuration)
 
-    def __setattr__(self, key, value):
-        if key in self._wmic_properties:
-            raise AttributeError(f"'Nic' attribute '{key}' is not settable")
+    # Store the attributes read by their own query instead of snapshots (re-queried by refresh()).
+    _query_attributes = ('ip_configuration',)
 
-        object.__setattr__(self, key, value)
+    # pylint: disable=too-many-arguments
+    def __init__(self, index, prefetch=False, cache_ttls=None, snapshot=None, backend=None, policy=None):
+        self.index = index
+        self.policy = policy
+        self._backend = backend or _backends.default_backend
+        self._cache = {}
+        self._instance_cache_ttls = dict(cache_ttls or {})
+        if snapshot is not None:
+            self._fill_cache(snapshot)
+        if prefetch:
+            self.snapshot()
 
     def __dir__(self):
-        return list(self.__dict__) + list(self._wmic_properties)
+        return [key for key in self.__dict__ if not key.startswith('_')] + list(self._wmic_properties)
 
     def __repr__(self):
-        return "<'win_nic.Nic(index=" + str(self.index) + ")'>"
+        return f"<'win_nic.Nic(index={self.index})'>"
 
     def __str__(self):
         return self.caption
 
+    def _cache_attribute(self, item, value, fetched_at=None):
+        ttl = self._instance_cache_ttls.get(item, self._cache_ttls.get(item, self._default_cache_ttl))
+        if ttl > 0:
+            self._cache[item] = (value, (time.monotonic() if fetched_at is None else fetched_at) + ttl)
+
     def _call_win32_networkadapter(self, call):
-        wmic_args = ['path', 'win32_networkadapter', 'where',
-                     'index={}'.format(self.index), 'call', call]
-        raw_response = '\n'.join(run_wmic_command(wmic_args))
-        wmic_return_rx = re.compile(r'ReturnValue = (\d+);')
-        return int(re.findall(wmic_return_rx, raw_response)[0])
+        return self._backend.call_method('win32_networkadapter', f'index={self.index}', call)
 
+    @traced
     def add_dns_server(self, dns_server):
         """Add a DNS server entry.
 
@@ -110,22 +177,36 @@ class Nic:
         .. note:: To add a DNS entry, the Python process must be running as administrator.
 
         """
-        return run_netsh_command('add dnsserver name="' + self.net_connection_id + '" ' + dns_server)
+        return self._backend.run_netsh('add dnsserver name="' + self.net_connection_id + '" ' + dns_server)
+
+    def configure(self):
+        """Start a multi-step IP configuration applied as one netsh batch with rollback on failure.
+
+        :rtype: win_nic.NicConfiguration
+
+        """
+        return NicConfiguration(self)
 
+    @traced
     def disable(self):
         """Call the Disable method of Win32_NetworkAdapter.
 
         .. note:: To disable a NIC, the Python process must be running as administrator.
 
         """
-        return self._call_win32_networkadapter('Disable')
+        retval = self._call_win32_networkadapter('Disable')
+        self.invalidate(*self._enable_affects)
+        return retval
 
+    @traced
     def enable(self):
         """Call the Enable method of Win32_NetworkAdapter.
 
         .. note:: To enable a NIC, the Python process must be running as administrator.
         """
-        return self._call_win32_networkadapter('Enable')
+        retval = self._call_win32_networkadapter('Enable')
+        self.invalidate(*self._enable_affects)
+        return retval
 
     @property
     def enabled_ctrl_panel(self):
@@ -137,6 +218,17 @@ class Nic:
         """
         return self.net_connection_status != NicNetConnectionStatus.DISCONNECTED
 
+    def invalidate(self, *items):
+        """Drop cached attribute values so the next access queries WMIC again.
+
+        :param str items: names of the attributes to invalidate (all attributes if none given)
+
+        """
+        if not items:
+            self._cache.clear()
+        for item in items:
+            self._cache.pop(item, None)
+
     @property
     def ip_addresses(self):
         """Get the NetConnectionStatus property of Win32_NetworkAdapter.
@@ -145,8 +237,60 @@ class Nic:
         :rtype: str[]
 
         """
-        return parse_array(self._ip_address_raw)
+        return list(as_array(self._ip_address_raw))
+
+    @traced
+    def refresh(self, *items):
+        """Invalidate and re-query cached attribute values.
+
+        :param str items: names of the attributes to refresh (all attributes if none given, which
+            costs one WMIC call per Windows class plus one for :attr:`ip_configuration`)
+
+        """
+        if not items:
+            self.snapshot()
+            items = self._query_attributes
+        self.invalidate(*items)
+        for item in items:
+            try:
+                getattr(self, item)
+            except AttributeError:
+                self._cache_attribute(item, None)
+
+    @traced
+    def snapshot(self):
+        """Get every attribute of the NIC using one WMIC call per Windows class.
+
+        The attribute cache is refilled from the returned snapshot.
+
+        :returns: immutable record of all attributes (``None`` where WMIC returned no value)
+        :rtype: win_nic.NicSnapshot
+
+        """
+        try:
+            snapshot = _query_snapshots(self.index, self._backend)[self.index]
+        except KeyError:
+            raise AttributeError(f"wmic did not return NIC with index {self.index}") from None
+        self._fill_cache(snapshot)
+        return snapshot
+
+    def _fill_cache(self, snapshot, items=None, fetched_at=None):
+        """Cache attribute values of a snapshot (expiring their time-to-live after the time it was fetched)."""
+        for item in items or self._wmic_properties:
+            self._cache_attribute(item, getattr(snapshot, _snapshot_field(item)), fetched_at)
+
+    @traced
+    def set_dns_servers(self, *dns_servers):
+        """Replace the DNS server entries with one netsh process.
+
+        :param str dns_servers: DNS server addresses in order of preference (none removes every entry)
+
+        .. note:: To set DNS entries, the Python process must be running as administrator.
+
+        """
+        return self.configure().dns_servers(*dns_servers).apply(rollback=False, verify=False).exit_code
 
+    @traced
     def set_static_address(self, ip_addr, subnet_mask, gateway):
         """Set a static IP address configuration.
 
@@ -159,13 +303,122 @@ class Nic:
         """
         netsh_args = ('set address name="' + self.net_connection_id + '" static ' + ip_addr + ' '
                       + subnet_mask + ' ' + gateway)
-        return run_netsh_command(netsh_args)
+        retval = self._backend.run_netsh(netsh_args)
+        self.invalidate(*self._address_affects)
+        return retval
 
+    @traced
     def use_dhcp(self):
         """Use DHCP for IP address configuration.
 
         .. note:: To set a static address, the Python process must be running as administrator.
 
         """
-        netsh_args = ('set address name="' + self.net_connection_id + '" source=dhcp')
-        return run_netsh_command(netsh_args)
+        netsh_args = 'set address name="' + self.net_connection_id + '" source=dhcp'
+        retval = self._backend.run_netsh(netsh_args)
+        self.invalidate(*self._address_affects)
+        return retval
+
+
+# Store the Windows name, Windows class and Python type of each attribute of the Nic class.
+_wmic_properties = Nic._wmic_properties  # pylint: disable=protected-access
+
+
+def _attribute_wmic_args(index, item):
+    """Get the WMIC arguments querying one attribute of the NIC with the given index."""
+    windows_name, windows_class, _ = _wmic_properties[item]
+    return ['path', windows_class, 'where', f'index={index}', 'get', windows_name]
+
+
+def _parse_attribute_response(item, wmic_resp_list):
+    """Cast the (stripped) WMIC response to an attribute query to the attribute's Python type."""
+    windows_name, _, python_type = _wmic_properties[item]
+
+    try:
+        wmic_resp = wmic_resp_list[0]
+    except IndexError:
+        raise AttributeError(f"wmic did not return value for attribute '{windows_name}'") from None
+
+    return apply_converter(parse_value(wmic_resp), compile_converter(python_type))
+
+
+def _snapshot_field(item):
+    """Get the snapshot field name of an attribute (named tuple fields cannot be private)."""
+    return item.lstrip('_')
+
+
+class NicSnapshot(namedtuple('NicSnapshot', ['index'] + [_snapshot_field(item) for item in _wmic_properties])):
+
+    """Immutable record of every attribute of a NIC.
+
+    Fields are named after the corresponding :class:`win_nic.Nic` attributes. Fields for which
+    WMIC returned no value are ``None``.
+
+    """
+
+    __slots__ = ()
+
+    @property
+    def ip_addresses(self):
+        """Get the IP addresses parsed from the IPAddress property.
+
+        :rtype: str[]
+
+        """
+        return list(as_array(self.ip_address_raw))
+
+
+def _intern(value):
+    """Intern strings (and strings in arrays) so that snapshots of many NICs share repeated values."""
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, tuple):
+        return tuple(_intern(item) for item in value)
+    return value
+
+
+def _query_snapshots(index=None, backend=None):
+    """Query snapshots of one NIC (or all NICs if no index is given) with one query per class.
+
+    :returns: dictionary mapping index to :class:`NicSnapshot`
+
+    """
+    backend = backend or _backends.default_backend
+    return _build_snapshots([(query[0], backend.query(*query)) for query in _snapshot_queries(index)])
+
+
+def _snapshot_queries(index=None):
+    """Get the WMIC query arguments (class, names, where clause, converters) needed for snapshots."""
+    properties_by_class = {}
+    for windows_name, windows_class, python_type in _wmic_properties.values():
+        properties_by_class.setdefault(windows_class, {'Index': int})[windows_name] = compile_converter(python_type)
+
+    where = f'index={index}' if index is not None else None
+    return [(windows_class, list(converters), where, converters)
+            for windows_class, converters in properties_by_class.items()]
+
+
+def _build_snapshots(class_records):
+    """Join query records of each Windows class (on index) into snapshots.
+
+    :param class_records: list of (Windows class, list of record dictionaries) tuples
+    :returns: dictionary mapping index to :class:`NicSnapshot`
+
+    """
+    fields_by_name = {windows_name: _snapshot_field(item)
+                      for item, (windows_name, _, _) in _wmic_properties.items()}
+    adapter_indexes = set()
+    fields_by_index = {}
+    for windows_class, records in class_records:
+        for record in records:
+            row_index = record['Index']
+            if windows_class == 'win32_networkadapter':
+                adapter_indexes.add(row_index)
+            fields = fields_by_index.setdefault(row_index, dict.fromkeys(NicSnapshot._fields))
+            fields['index'] = row_index
+            for windows_name, value in record.items():
+                if windows_name in fields_by_name:
+                    fields[fields_by_name[windows_name]] = _intern(value)
+
+    # Configuration rows without a matching Win32_NetworkAdapter row are not adapters.
+    return {row_index: NicSnapshot(**fields_by_index[row_index]) for row_index in sorted(adapter_indexes)}
@@ -0,0 +1,147 @@
+﻿"""Module containing NicTable class."""
+
+import itertools
+import operator
+
+from win_nic._nic import NicSnapshot
+
+# Map the digits of a binary string to byte values 0 and 1.
+_BIT_VALUES = bytes.maketrans(b'01', b'\x00\x01')
+
+
+class NicTable:
+
+    """Immutable columnar container of NIC snapshots (e.g. the adapters of many hosts).
+
+    Each :class:`win_nic.NicSnapshot` field is stored as one column, so values shared by many
+    NICs (enumeration members, interned strings, small integers) are stored once. Equality filters
+    are answered from per-column bitmap indexes built on first use::
+
+        >>> table = NicTable(adapters.nic_table.values())
+        >>> connected = table.where(physical_adapter=True,
+        ...                         net_connection_status=NicNetConnectionStatus.CONNECTED)
+
+    Building the table and the first filter on a field cost more than scanning a list of
+    snapshots once; later filters on indexed fields are cheaper. Tables returned by :meth:`where`
+    share the columns of the filtered table and gather each of their columns on first access.
+
+    :param snapshots: iterable of :class:`win_nic.NicSnapshot` (rows)
+
+    """
+
+    def __init__(self, snapshots=()):
+        rows = list(snapshots)
+        self._length = len(rows)
+        self._columns = {field: tuple(column) for field, column in zip(NicSnapshot._fields, zip(*rows))} \
+            if rows else dict.fromkeys(NicSnapshot._fields, ())
+        self._bitmaps = {}
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, position):
+        return NicSnapshot(*[self._columns[field][position] for field in NicSnapshot._fields])
+
+    def __iter__(self):
+        return map(NicSnapshot._make, zip(*[self._columns[field] for field in NicSnapshot._fields]))
+
+    def __repr__(self):
+        return f"<'win_nic.NicTable({self._length} NICs)'>"
+
+    def column(self, field):
+        """Get the values of one snapshot field (in row order).
+
+        :param str field: :class:`win_nic.NicSnapshot` field name
+        :rtype: tuple
+
+        """
+        return self._columns[field]
+
+    def count(self, **conditions):
+        """Count the NICs matching all conditions (see :meth:`where`).
+
+        :rtype: int
+
+        """
+        return bin(self._mask(conditions)).count('1')
+
+    def where(self, **conditions):
+        """Get the NICs matching all conditions.
+
+        :param conditions: snapshot field name to value the field must equal, or to callable
+            returning whether a value matches (e.g. ``speed=lambda speed: (speed or 0) >= 10 ** 9``)
+        :returns: matching NICs (in row order)
+        :rtype: win_nic.NicTable
+
+        """
+        positions = _positions(self._mask(conditions))
+        subset = NicTable()
+        subset._length = len(positions)  # pylint: disable=protected-access
+        subset._columns = _GatheredColumns(self._columns, positions)  # pylint: disable=protected-access
+        return subset
+
+    def _mask(self, conditions):
+        """Get the bit mask (bit N set for row N) of the rows matching all conditions."""
+        mask = (1 << self._length) - 1
+        for field, condition in conditions.items():
+            if field not in NicSnapshot._fields:
+                raise AttributeError(f"'NicSnapshot' has no field '{field}'")
+            if callable(condition):
+                mask &= _mask([position for position, value in enumerate(self._columns[field]) if condition(value)],
+                              self._length)
+            else:
+                mask &= self._bitmap(field).get(condition, 0)
+        return mask
+
+    def _bitmap(self, field):
+        """Get (building on first use) the mapping of each value of a field to its row bit mask."""
+        try:
+            return self._bitmaps[field]
+        except KeyError:
+            positions_by_value = {}
+            for position, value in enumerate(self._columns[field]):
+                positions_by_value.setdefault(value, []).append(position)
+            bitmap = {value: _mask(positions, self._length) for value, positions in positions_by_value.items()}
+            self._bitmaps[field] = bitmap
+            return bitmap
+
+
+class _GatheredColumns(dict):
+
+    """Columns of a subset of the rows of other columns, each gathered on first access.
+
+    :param dict columns: columns (snapshot field name to tuple of values) of the filtered table
+    :param list positions: positions of the subset's rows in ``columns`` (in ascending order)
+
+    """
+
+    def __init__(self, columns, positions):
+        super().__init__()
+        if isinstance(columns, _GatheredColumns):
+            # Gather from the underlying columns (not through the columns of each intermediate subset).
+            positions = [columns.positions[position] for position in positions]
+            columns = columns.columns
+        self.columns = columns
+        self.positions = positions
+
+    def __missing__(self, field):
+        # Gather with one (C-level) itemgetter call, which returns a bare value for one position.
+        column = self.columns[field]
+        self[field] = gathered = operator.itemgetter(*self.positions)(column) if len(self.positions) > 1 else tuple(
+            column[position] for position in self.positions)
+        return gathered
+
+
+def _mask(positions, length):
+    """Get the bit mask with the bits at the given positions set."""
+    bits = bytearray(b'0' * (length + 1))
+    for position in positions:
+        bits[length - position] = ord('1')
+    return int(bits, 2)
+
+
+def _positions(mask):
+    """Get the positions of the set bits of a bit mask (in ascending order)."""
+    # Select from the bits of the mask (lowest first) as 0/1 bytes with one C-level compress pass.
+    bits = bin(mask)[:1:-1].encode('ascii').translate(_BIT_VALUES)
+    return list(itertools.compress(range(len(bits)), bits))
@@ -0,0 +1,229 @@
+﻿"""Module containing the execution policy (timeouts, retries and circuit breaking) of WMIC and netsh invocations."""
+
+import random
+import subprocess
+import threading
+import time
+
+from collections import Counter
+
+# Store the WMI error codes (HRESULTs, as WMIC exit codes) worth retrying: generic failure, out of
+# memory, provider load and initialization failures, cancelled calls, and unavailable or failed RPC.
+TRANSIENT_WMI_ERRORS = frozenset([0x80041001, 0x80041006, 0x80041013, 0x80041014, 0x80041032, 0x800706BA,
+                                  0x800706BE])
+
+
+class CircuitOpenError(Exception):
+
+    """Invocation rejected because the execution policy's circuit breaker is open."""
+
+
+class ExecutionPolicy:
+
+    """Timeouts, retries and circuit breaking applied to every WMIC and netsh invocation.
+
+    Set the policy of one :class:`win_nic.Nic` or :class:`win_nic.NetworkAdapters` with their
+    ``policy`` parameter, or of everything else with :func:`win_nic.set_default_policy`::
+
+        >>> policy = ExecutionPolicy(timeout=30.0, deadline=90.0, retries=2, failure_threshold=5)
+        >>> adapters = NetworkAdapters(policy=policy)
+        >>> policy.metrics
+        Counter({'calls': 2, 'attempts': 2})
+
+    A process still running after the timeout is killed along with its child processes and
+    :class:`subprocess.TimeoutExpired` is raised. WMIC invocations that time out or fail with a
+    transient WMI error are retried after a jittered exponential delay; netsh commands are never
+    retried (they may not be idempotent). After ``failure_threshold`` consecutive failed
+    invocations, the circuit opens and invocations raise :class:`win_nic.CircuitOpenError` without
+    launching a process until ``reset_timeout`` seconds have passed; the next invocation then
+    closes the circuit if it succeeds.
+
+    :param float timeout: seconds each attempt may take (no limit if ``None``)
+    :param float deadline: seconds all attempts of an invocation (and the delays between them) may
+        take (no limit if ``None``)
+    :param int retries: maximum number of retries of a WMIC invocation
+    :param float retry_delay: seconds before the first retry (doubled for each further retry)
+    :param float max_retry_delay: maximum seconds between retries
+    :param int failure_threshold: consecutive failed invocations opening the circuit (never opens
+        if ``None``)
+    :param float reset_timeout: seconds the circuit stays open
+
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, timeout=None, deadline=None, retries=0, retry_delay=0.5, max_retry_delay=10.0,
+                 failure_threshold=None, reset_timeout=30.0):
+        self.timeout = timeout
+        self.deadline = deadline
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.metrics = Counter()
+        self._consecutive_failures = 0
+        self._opened_at = None
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return (f"<'win_nic.ExecutionPolicy(timeout={self.timeout}, deadline={self.deadline}, "
+                f"retries={self.retries}, failure_threshold={self.failure_threshold})'>")
+
+    def copy(self):
+        """Get a policy with the same settings but its own circuit breaker and metrics.
+
+        :rtype: win_nic.ExecutionPolicy
+
+        """
+        return ExecutionPolicy(self.timeout, self.deadline, self.retries, self.retry_delay, self.max_retry_delay,
+                               self.failure_threshold, self.reset_timeout)
+
+    @property
+    def circuit_open(self):
+        """Check if invocations are currently rejected by the circuit breaker.
+
+        :rtype: bool
+
+        """
+        return self._opened_at is not None and time.monotonic() - self._opened_at < self.reset_timeout
+
+    def execute(self, kind, args, launch):
+        """Run an invocation under the policy.
+
+        :param str kind: ``'wmic'`` or ``'netsh'``
+        :param list args: command line of the invocation (for error messages)
+        :param launch: callable launching one attempt, accepting its timeout in seconds (``None``
+            for no limit)
+        :returns: value returned by the successful attempt
+
+        """
+        deadline = self._admit(args)
+        attempt = 0
+        while True:
+            try:
+                result = launch(self._attempt_timeout(args, deadline))
+            except Exception as error:  # pylint: disable=broad-except
+                delay = self._retry_delay(kind, error, attempt, deadline)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                attempt += 1
+            else:
+                self._record(True)
+                return result
+
+    async def execute_async(self, kind, args, launch):
+        """Run an invocation under the policy without blocking the event loop (see :meth:`execute`).
+
+        :param launch: coroutine function launching one attempt, accepting its timeout in seconds
+
+        """
+        import asyncio  # pylint: disable=import-outside-toplevel
+
+        deadline = self._admit(args)
+        attempt = 0
+        while True:
+            try:
+                result = await launch(self._attempt_timeout(args, deadline))
+            except Exception as error:  # pylint: disable=broad-except
+                delay = self._retry_delay(kind, error, attempt, deadline)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+            else:
+                self._record(True)
+                return result
+
+    def execute_iter(self, args, launch):
+        """Run a streaming invocation under the policy, yielding the items it yields.
+
+        Items already yielded cannot be taken back, so the invocation is not retried.
+
+        :param launch: generator function launching the invocation, accepting its timeout in seconds
+
+        """
+        deadline = self._admit(args)
+        try:
+            yield from launch(self._attempt_timeout(args, deadline))
+        except Exception as error:
+            if isinstance(error, subprocess.TimeoutExpired):
+                with self._lock:
+                    self.metrics['timeouts'] += 1
+            self._record(False)
+            raise
+        self._record(True)
+
+    def _admit(self, args):
+        """Count an invocation (rejecting it if the circuit is open) and get its deadline."""
+        with self._lock:
+            self.metrics['calls'] += 1
+            if self.circuit_open:
+                self.metrics['rejected'] += 1
+                raise CircuitOpenError(f"circuit open after {self._consecutive_failures} consecutive failures, "
+                                       f"not running {' '.join(args)}")
+        return None if self.deadline is None else time.monotonic() + self.deadline
+
+    def _attempt_timeout(self, args, deadline):
+        """Count an attempt and get its timeout (the policy timeout or the time left until the deadline)."""
+        with self._lock:
+            self.metrics['attempts'] += 1
+        if deadline is None:
+            return self.timeout
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise subprocess.TimeoutExpired(args, self.deadline)
+        return remaining if self.timeout is None else min(self.timeout, remaining)
+
+    def _retry_delay(self, kind, error, attempt, deadline):
+        """Get the seconds to wait before retrying a failed attempt (``None`` to give up)."""
+        if isinstance(error, subprocess.TimeoutExpired):
+            with self._lock:
+                self.metrics['timeouts'] += 1
+        delay = min(self.max_retry_delay, self.retry_delay * 2 ** attempt) * random.uniform(0.5, 1.0)
+        if (kind != 'wmic' or attempt >= self.retries or not is_transient(error)
+                or (deadline is not None and time.monotonic() + delay >= deadline)):
+            self._record(False)
+            return None
+        with self._lock:
+            self.metrics['retries'] += 1
+        return delay
+
+    def _record(self, succeeded):
+        """Update the circuit breaker with the outcome of an invocation."""
+        with self._lock:
+            if succeeded:
+                self._consecutive_failures, self._opened_at = 0, None
+                return
+            self.metrics['failures'] += 1
+            self._consecutive_failures += 1
+            if self.failure_threshold is not None and self._consecutive_failures >= self.failure_threshold:
+                if self._opened_at is None or not self.circuit_open:
+                    self.metrics['circuit_opened'] += 1
+                self._opened_at = time.monotonic()
+
+
+def is_transient(error):
+    """Check if a failed WMIC attempt is worth retrying (it timed out or failed with a transient WMI error).
+
+    :rtype: bool
+
+    """
+    if isinstance(error, subprocess.TimeoutExpired):
+        return True
+    return isinstance(error, subprocess.CalledProcessError) and error.returncode & 0xFFFFFFFF in TRANSIENT_WMI_ERRORS
+
+
+# Store the policy of invocations made outside a NIC or network adapters with their own policy.
+default_policy = ExecutionPolicy()  # pylint: disable=invalid-name
+
+
+def set_default_policy(policy):
+    """Set the execution policy of invocations not made by a NIC or network adapters with their own policy.
+
+    :param win_nic.ExecutionPolicy policy: new default policy (``None`` restores a policy without
+        timeouts, retries or circuit breaking)
+
+    """
+    global default_policy  # pylint: disable=global-statement, invalid-name
+    default_policy = policy or ExecutionPolicy()
@@ -0,0 +1,284 @@
+﻿"""Module containing instrumentation hooks and scoped profiling of WMIC and netsh invocations."""
+
+import contextlib
+import functools
+import math
+import subprocess
+import threading
+import time
+
+from collections import Counter, namedtuple, OrderedDict
+
+# Store the callables invoked with a CallEvent after every instrumented invocation.
+_hooks = []
+_hooks_lock = threading.Lock()
+
+
+
+class _ThreadLocalVar(threading.local):
+
+    """Stand-in for :class:`contextvars.ContextVar` on Python 3.6 (one value per thread)."""
+
+    def __init__(self, name, default):
+        super().__init__()
+        self.name = name
+        self.value = default
+
+    def get(self):
+        """Get the value of the current thread."""
+        return self.value
+
+    def set(self, value):
+        """Set the value of the current thread and return a token restoring the previous one."""
+        token, self.value = self.value, value
+        return token
+
+    def reset(self, token):
+        """Restore the value a token was returned for."""
+        self.value = token
+
+
+try:
+    from contextvars import ContextVar
+except ImportError:  # Python 3.6
+    ContextVar = _ThreadLocalVar
+
+# Store the stack of call sites (e.g. "Nic.disable") and their execution policies of each thread
+# (and of each asyncio task, which runs in a copy of the context it was created in).
+_call_sites = ContextVar('win_nic_call_sites', default=())
+
+
+class CallEvent(namedtuple('CallEvent', ['kind', 'args', 'call_site', 'start', 'duration', 'exit_code',
+                                         'output_size'])):
+
+    """Record of one WMIC or netsh invocation passed to instrumentation hooks.
+
+    :param str kind: ``'wmic'`` or ``'netsh'``
+    :param tuple args: command line (or backend request) of the invocation
+    :param str call_site: :class:`win_nic.Nic` or :class:`win_nic.NetworkAdapters` attribute or
+        method that triggered the invocation (e.g. ``'Nic.disable'``, ``None`` if unknown)
+    :param float start: time the invocation started (seconds since the epoch)
+    :param float duration: seconds the invocation took
+    :param int exit_code: exit code of the process (``None`` if it could not be determined)
+    :param int output_size: number of characters the process printed (``None`` if not captured)
+
+    """
+
+    __slots__ = ()
+
+
+class _Invocation:
+
+    """Mutable result of an invocation in progress, filled in by the instrumented code."""
+
+    __slots__ = ('exit_code', 'output_size')
+
+    def __init__(self):
+        self.exit_code = None
+        self.output_size = None
+
+
+def add_hook(hook):
+    """Register a callable invoked with a :class:`win_nic.CallEvent` after every WMIC and netsh invocation.
+
+    Hooks run in the thread that made the invocation and must not raise exceptions.
+
+    :param hook: callable accepting one :class:`win_nic.CallEvent`
+
+    """
+    with _hooks_lock:
+        _hooks.append(hook)
+
+
+def remove_hook(hook):
+    """Unregister a hook registered with :func:`win_nic.add_hook`."""
+    with _hooks_lock:
+        _hooks.remove(hook)
+
+
+@contextlib.contextmanager
+def call_site(name, policy=None):
+    """Attribute the invocations made within the context (in the current thread or task) to a call site.
+
+    :param str name: call site name
+    :param win_nic.ExecutionPolicy policy: execution policy of the invocations (the policy of the
+        enclosing call site, if ``None``)
+
+    """
+    token = _call_sites.set(_call_sites.get() + ((name, policy),))
+    try:
+        yield
+    finally:
+        _call_sites.reset(token)
+
+
+def traced(method):
+    """Decorate a method so that its invocations are attributed to ``'<class name>.<method name>'``.
+
+    The invocations run under the instance's ``policy`` attribute (if set).
+
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with call_site(f'{type(self).__name__}.{method.__name__}', getattr(self, 'policy', None)):
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+def traced_async(method):
+    """Decorate a coroutine method like :func:`traced` (the call site spans the awaited coroutine)."""
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        with call_site(f'{type(self).__name__}.{method.__name__}', getattr(self, 'policy', None)):
+            return await method(self, *args, **kwargs)
+    return wrapper
+
+
+def current_call_site():
+    """Get the innermost call site of the current thread or task (``None`` if outside any call site)."""
+    stack = _call_sites.get()
+    return stack[-1][0] if stack else None
+
+
+def current_policy():
+    """Get the execution policy of the innermost call site setting one (``None`` if no call site does)."""
+    for _, policy in reversed(_call_sites.get()):
+        if policy is not None:
+            return policy
+    return None
+
+
+@contextlib.contextmanager
+def instrument(kind, args):
+    """Time an invocation and report it to the registered hooks.
+
+    Backends wrap each process launch (or request standing in for one) in this context manager
+    and set the ``exit_code`` and ``output_size`` attributes of the object it yields::
+
+        >>> with instrument('wmic', wmic_args) as invocation:
+        ...     output = run(wmic_args)
+        ...     invocation.exit_code, invocation.output_size = 0, len(output)
+
+    A :class:`subprocess.CalledProcessError` raised within the context sets the exit code.
+
+    :param str kind: ``'wmic'`` or ``'netsh'``
+    :param args: command line (or backend request) of the invocation
+
+    """
+    invocation = _Invocation()
+    if not _hooks:
+        yield invocation
+        return
+
+    start = time.time()
+    timer = time.perf_counter()
+    try:
+        yield invocation
+    except subprocess.CalledProcessError as error:
+        invocation.exit_code = error.returncode
+        raise
+    finally:
+        event = CallEvent(kind, tuple(args), current_call_site(), start, time.perf_counter() - timer,
+                          invocation.exit_code, invocation.output_size)
+        for hook in tuple(_hooks):
+            hook(event)
+
+
+class Profile:
+
+    """Collector of the WMIC and netsh invocations made while it is active (see :func:`win_nic.profile`).
+
+    Invocations made by every thread are collected.
+
+    """
+
+    def __init__(self):
+        self.events = []
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        add_hook(self._collect)
+        return self
+
+    def __exit__(self, *exc_info):
+        remove_hook(self._collect)
+
+    def _collect(self, event):
+        with self._lock:
+            self.events.append(event)
+
+    @property
+    def counters(self):
+        """Get the number of invocations by kind (``'wmic'`` and ``'netsh'``).
+
+        :rtype: collections.Counter
+
+        """
+        return Counter(event.kind for event in self.events)
+
+    @property
+    def total_duration(self):
+        """Get the seconds spent in all invocations.
+
+        :rtype: float
+
+        """
+        return sum(event.duration for event in self.events)
+
+    def histogram(self, bounds=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)):
+        """Count invocations by duration.
+
+        :param tuple bounds: ascending upper bounds (in seconds) of the histogram buckets
+        :returns: dictionary mapping each upper bound (and a final ``math.inf``) to the number of
+            invocations lasting at most that long (and longer than the previous bound)
+        :rtype: collections.OrderedDict
+
+        """
+        buckets = OrderedDict((bound, 0) for bound in tuple(bounds) + (math.inf,))
+        for event in self.events:
+            buckets[next(bound for bound in buckets if event.duration <= bound)] += 1
+        return buckets
+
+    def call_sites(self):
+        """Summarize invocations by call site, slowest (most total time) first.
+
+        :returns: tuples of call site, number of invocations, total seconds and maximum seconds
+        :rtype: list of tuple
+
+        """
+        summary = {}
+        for event in self.events:
+            count, total, longest = summary.get(event.call_site, (0, 0.0, 0.0))
+            summary[event.call_site] = (count + 1, total + event.duration, max(longest, event.duration))
+        return sorted(((site,) + values for site, values in summary.items()), key=lambda row: -row[2])
+
+    def report(self, limit=10):
+        """Render a table of the slowest call sites.
+
+        :param int limit: maximum number of call sites listed
+        :rtype: str
+
+        """
+        import texttable  # pylint: disable=import-outside-toplevel
+
+        table_rows = [['Call Site', 'Calls', 'Total (ms)', 'Mean (ms)', 'Max (ms)']]
+        for site, count, total, longest in self.call_sites()[:limit]:
+            table_rows.append([site or '(unknown)', count, f'{total * 1000:.1f}', f'{total * 1000 / count:.1f}',
+                               f'{longest * 1000:.1f}'])
+        table = texttable.Texttable()
+        table.set_cols_dtype(['t'] * len(table_rows[0]))
+        table.add_rows(table_rows)
+        return table.draw()
+
+
+def profile():
+    """Collect the WMIC and netsh invocations made within a ``with`` block::
+
+        >>> with win_nic.profile() as profiler:
+        ...     adapters = NetworkAdapters()
+        >>> print(profiler.report())
+
+    :rtype: win_nic.Profile
+
+    """
+    return Profile()
@@ -0,0 +1,165 @@
+﻿"""Module containing desired-state reconciliation of NICs (see :meth:`win_nic.NetworkAdapters.reconcile`)."""
+
+from collections import namedtuple
+
+from win_nic.enums.nic_net_connection_status import NicNetConnectionStatus
+from win_nic._ip_configuration import IpConfiguration
+
+# Store the settings of a desired NIC state, in the order their actions run (an adapter is enabled
+# before it is configured and disabled after it).
+DESIRED_STATE_SETTINGS = ('enabled', 'dhcp', 'address', 'gateway', 'dns_servers')
+
+# Store the lookup keys (see win_nic.NetworkAdapters.get_nic) a desired state may be keyed by.
+RECONCILE_KEYS = ('connection_id', 'guid', 'mac_address')
+
+
+class ReconcileAction(namedtuple('ReconcileAction', ['key', 'nic', 'operation', 'args', 'reason'])):
+
+    """NIC method call planned by :meth:`win_nic.NetworkAdapters.reconcile`.
+
+    :param str key: key of the desired state in the specification
+    :param win_nic.Nic nic: NIC the method is called on
+    :param str operation: name of the NIC method
+    :param tuple args: positional arguments of the method
+    :param str reason: difference between the current and the desired state the call resolves
+
+    """
+
+    __slots__ = ()
+
+    def __str__(self):
+        return f"{self.key}: {self.operation}({', '.join(repr(arg) for arg in self.args)})  # {self.reason}"
+
+
+class ReconcileResult(namedtuple('ReconcileResult', ['actions', 'results'])):
+
+    """Plan (and outcome) of :meth:`win_nic.NetworkAdapters.reconcile`.
+
+    :param list actions: planned NIC method calls (:class:`win_nic.ReconcileAction`), empty if
+        every NIC is in its desired state
+    :param list results: results of the calls (:class:`win_nic.BulkResult`, in the order of the
+        actions), ``None`` for a dry run
+
+    """
+
+    __slots__ = ()
+
+    @property
+    def changed(self):
+        """Check if any NIC differed from its desired state.
+
+        :rtype: bool
+
+        """
+        return bool(self.actions)
+
+    @property
+    def succeeded(self):
+        """Check if every executed call succeeded (vacuously true for a dry run).
+
+        :rtype: bool
+
+        """
+        return all(result.succeeded for result in self.results or ())
+
+    def plan(self):
+        """Render the planned calls, one per line.
+
+        :rtype: str
+
+        """
+        return '\n'.join(str(action) for action in self.actions)
+
+
+def check_settings(key, settings):
+    """Check the settings of a desired state.
+
+    :returns: the settings as a dictionary
+    :raises TypeError: if a setting is unknown
+    :raises ValueError: if settings contradict each other
+
+    """
+    settings = dict(settings)
+    unknown = set(settings) - set(DESIRED_STATE_SETTINGS)
+    if unknown:
+        raise TypeError(f"unknown desired state settings of '{key}': {', '.join(sorted(unknown))}")
+    if settings.get('dhcp') and settings.get('address') is not None:
+        raise ValueError(f"desired state of '{key}' sets both DHCP and a static address")
+    if settings.get('gateway') is not None and settings.get('address') is None:
+        raise ValueError(f"desired state of '{key}' sets a gateway without a static address")
+    return settings
+
+
+def query_connection_statuses(backend):
+    """Query the connection status of every NIC with one query.
+
+    :returns: dictionary mapping index to :class:`win_nic.enums.NicNetConnectionStatus`
+
+    """
+    converters = {'Index': int, 'NetConnectionStatus': lambda wmic_resp: NicNetConnectionStatus(int(wmic_resp))}
+    records = backend.query('win32_networkadapter', list(converters), None, converters)
+    return {record['Index']: record.get('NetConnectionStatus') for record in records}
+
+
+def _static_address_mismatch(configuration, interface, gateway):
+    """Get the reason a static address configuration differs from the desired one (``None`` if it does not)."""
+    import ipaddress  # pylint: disable=import-outside-toplevel
+
+    if configuration.dhcp_enabled is not False:
+        return 'DHCP is enabled'
+    if interface not in configuration.interfaces:
+        return f'address {interface} is not assigned'
+    if gateway is not None and ipaddress.ip_address(gateway) not in configuration.gateways:
+        return f'gateway {gateway} is not set'
+    return None
+
+
+def plan_actions(key, nic, settings, configuration=None, status=None):
+    """Plan the NIC method calls bringing a NIC from its current state to the desired one.
+
+    :param str key: key of the desired state
+    :param win_nic.Nic nic: NIC to reconcile
+    :param dict settings: checked desired state settings
+    :param win_nic.IpConfiguration configuration: current IP configuration (``None`` if unknown)
+    :param win_nic.enums.NicNetConnectionStatus status: current connection status (``None`` if
+        unknown)
+    :rtype: list of win_nic.ReconcileAction
+
+    """
+    import ipaddress  # pylint: disable=import-outside-toplevel
+
+    configuration = configuration or IpConfiguration(nic.index, (), (), (), None, None)
+    actions = []
+
+    def plan(operation, args, reason):
+        actions.append(ReconcileAction(key, nic, operation, tuple(args), reason))
+
+    enabled = None if status is None else status != NicNetConnectionStatus.DISCONNECTED
+    if settings.get('enabled') is True and enabled is not True:
+        plan('enable', (), 'NIC is disabled')
+
+    if settings.get('dhcp') and configuration.dhcp_enabled is not True:
+        plan('use_dhcp', (), 'DHCP is disabled')
+
+    if settings.get('address') is not None:
+        interface = ipaddress.ip_interface(settings['address'])
+        gateway = settings.get('gateway')
+        reason = _static_address_mismatch(configuration, interface, gateway)
+        if reason is not None:
+            plan('set_static_address', (str(interface.ip), str(interface.netmask), gateway or 'none'), reason)
+
+    if settings.get('dns_servers') is not None:
+        dns_servers = tuple(ipaddress.ip_address(dns_server) for dns_server in settings['dns_servers'])
+        current = configuration.dns_servers
+        if current and dns_servers[:len(current)] == current and len(dns_servers) > len(current):
+            # Appending the missing servers leaves the existing ones (and name resolution) untouched.
+            for dns_server in dns_servers[len(current):]:
+                plan('add_dns_server', (str(dns_server),), f'DNS server {dns_server} is not set')
+        elif dns_servers != current:
+            plan('set_dns_servers', (str(dns_server) for dns_server in dns_servers),
+                 f"DNS servers are {', '.join(map(str, current)) or 'not set'}")
+
+    if settings.get('enabled') is False and enabled is not False:
+        plan('disable', (), 'NIC is enabled')
+
+    return actions
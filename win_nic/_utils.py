@@ -1,29 +1,286 @@
 ﻿"""Module containing utilities (e.g. parsers and executors)."""
 
+import contextlib
+import functools
+import io
 import os
+import shlex
+import signal
 import subprocess
+import tempfile
+import threading
 
+from win_nic import _policy
+from win_nic._profiling import current_policy, instrument
+from win_nic._wmic_parser import iter_value_records
 
-def run_netsh_command(netsh_args):
-    """Execute a netsh command and return the output."""
-    devnull = open(os.devnull, 'w')
-    command_raw = 'netsh interface ipv4 ' + netsh_args
-    return int(subprocess.call(command_raw, stdout=devnull))
+# Store the installed win_nic.WmicWorkerPool (if any) that synchronous WMIC queries are routed to.
+wmic_worker_pool = None  # pylint: disable=invalid-name
+
+
+def run_netsh_command(netsh_args, node=None):
+    """Execute a netsh command (on a remote computer if a node is given) and return the exit code."""
+    netsh_command = ['netsh'] + _netsh_node_args(node) + ['interface', 'ipv4'] + _split_netsh_args(netsh_args)
+    return _execution_policy().execute('netsh', netsh_command, functools.partial(
+        _call_netsh, netsh_command, netsh_command))
+
+
+def run_netsh_script(netsh_args_list, node=None):
+    """Execute netsh commands as one ``netsh -f`` script (one process) and return the exit code.
+
+    :param list netsh_args_list: arguments following ``netsh interface ipv4`` of each command
+    :param str node: remote computer the commands run on (the local computer if ``None``)
+
+    """
+    file_descriptor, script_path = tempfile.mkstemp(suffix='.netsh', text=True)
+    try:
+        with os.fdopen(file_descriptor, 'w') as script_file:
+            script_file.writelines('interface ipv4 ' + netsh_args + '\n' for netsh_args in netsh_args_list)
+        netsh_command = ['netsh'] + _netsh_node_args(node) + ['-f', script_path]
+        return _execution_policy().execute('netsh', netsh_command, functools.partial(
+            _call_netsh, netsh_command + list(netsh_args_list), netsh_command))
+    finally:
+        os.remove(script_path)
+
+
+def kill_process_tree(process):
+    """Kill a process started with :func:`_process_group_options` along with its descendants.
+
+    :param process: :class:`subprocess.Popen` or :class:`asyncio.subprocess.Process` object
+
+    """
+    if os.name == 'nt':
+        subprocess.call(['taskkill', '/F', '/T', '/PID', str(process.pid)], stdout=subprocess.DEVNULL,
+                        stderr=subprocess.DEVNULL)
+    else:
+        with contextlib.suppress(OSError):
+            os.killpg(process.pid, signal.SIGKILL)  # pylint: disable=no-member
+    with contextlib.suppress(OSError):
+        process.kill()
 
 
 def run_wmic_command(wmic_args):
     """Execute a WMIC command and return the output."""
-    wmic_response = subprocess.check_output(['wmic'] + wmic_args).decode('utf-8')
-    return _strip_wmic_response(wmic_response)
+    return _strip_wmic_response(_check_output_wmic(wmic_args))
+
+
+def run_wmic_query(windows_class, windows_names, where=None, converters=None, node=None):
+    """Execute a WMIC property query and return a list of record dictionaries.
+
+    All requested properties are fetched by a single WMIC process (in ``/value`` format). Each
+    record maps the Windows property name to its parsed value. A node (remote computer name or
+    address) is queried with the WMIC ``/node`` switch.
+
+    """
+    wmic_args = wmic_node_args(node) + _build_wmic_query_args(windows_class, windows_names, where)
+    return list(iter_value_records(_check_output_wmic(wmic_args).splitlines(), converters))
+
+
+def iter_wmic_query(windows_class, windows_names, where=None, converters=None, node=None):
+    """Execute a WMIC property query and lazily yield record dictionaries as WMIC prints them.
+
+    The query runs under the execution policy of the call site this function is called from (not
+    the one the records are consumed in). The policy's timeout applies (from the start of the
+    query), but records already yielded cannot be taken back, so the query is not retried.
+
+    """
+    wmic_args = wmic_node_args(node) + _build_wmic_query_args(windows_class, windows_names, where)
+    return _execution_policy().execute_iter(['wmic'] + wmic_args, functools.partial(_iter_wmic_records, wmic_args,
+                                                                                    converters))
+
+
+def _iter_wmic_records(wmic_args, converters, timeout):
+    with instrument('wmic', ['wmic'] + wmic_args) as invocation:
+        with subprocess.Popen(['wmic'] + wmic_args, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                              **_process_group_options(timeout)) as process:
+            watchdog = None
+            if timeout is not None:
+                watchdog = threading.Timer(timeout, kill_process_tree, [process])
+                watchdog.daemon = True
+                watchdog.start()
+            try:
+                yield from iter_value_records(io.TextIOWrapper(process.stdout, encoding='utf-8'), converters)
+            finally:
+                timed_out = watchdog is not None and watchdog.finished.is_set()
+                if watchdog is not None:
+                    watchdog.cancel()
+        invocation.exit_code = process.returncode
+        if timed_out:
+            raise subprocess.TimeoutExpired(process.args, timeout)
+        if process.returncode:
+            raise subprocess.CalledProcessError(process.returncode, process.args)
+
+
+async def run_netsh_command_async(netsh_args, semaphore=None):
+    """Execute a netsh command without blocking the event loop and return the exit code.
+
+    The command is passed as the same argument list as :func:`run_netsh_command` passes, never
+    through the shell, so connection names containing shell metacharacters reach netsh unchanged.
+
+    """
+    return await _limited(semaphore, _exec_call, ['netsh', 'interface', 'ipv4'] + _split_netsh_args(netsh_args))
+
+
+async def run_wmic_command_async(wmic_args, semaphore=None):
+    """Execute a WMIC command without blocking the event loop and return the output."""
+    return _strip_wmic_response(await _limited(semaphore, _exec_check_output, ['wmic'] + wmic_args))
+
+
+async def run_wmic_query_async(windows_class, windows_names, where=None, converters=None, semaphore=None):
+    """Execute a WMIC property query without blocking the event loop (see :func:`run_wmic_query`)."""
+    wmic_args = _build_wmic_query_args(windows_class, windows_names, where)
+    wmic_response = await _limited(semaphore, _exec_check_output, ['wmic'] + wmic_args)
+    return list(iter_value_records(wmic_response.splitlines(), converters))
+
+
+async def _limited(semaphore, coroutine_function, *args):
+    """Await a coroutine function while holding the semaphore (if any)."""
+    if semaphore is None:
+        return await coroutine_function(*args)
+    async with semaphore:
+        return await coroutine_function(*args)
+
+
+async def _exec_call(args):
+    """Asynchronous equivalent of ``subprocess.call(args, stdout=devnull)``."""
+    return await _execution_policy().execute_async('netsh', args, functools.partial(_exec_call_once, args))
+
+
+async def _exec_call_once(args, timeout):
+    import asyncio  # pylint: disable=import-outside-toplevel
+    with instrument('netsh', args) as invocation:
+        process = await asyncio.create_subprocess_exec(*args, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                                                       **_process_group_options(timeout))
+        invocation.exit_code = await _wait_for(process, process.wait(), timeout, args)
+    return invocation.exit_code
+
+
+async def _exec_check_output(args):
+    """Asynchronous equivalent of ``subprocess.check_output(args).decode('utf-8')``."""
+    return await _execution_policy().execute_async(args[0], args, functools.partial(_exec_check_output_once, args))
+
+
+async def _exec_check_output_once(args, timeout):
+    import asyncio  # pylint: disable=import-outside-toplevel
+    with instrument(args[0], args) as invocation:
+        process = await asyncio.create_subprocess_exec(*args, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                                                       **_process_group_options(timeout))
+        stdout, _ = await _wait_for(process, process.communicate(), timeout, args)
+        if process.returncode:
+            raise subprocess.CalledProcessError(process.returncode, args, stdout)
+        output = stdout.decode('utf-8')
+        invocation.exit_code, invocation.output_size = 0, len(output)
+    return output
+
+
+async def _wait_for(process, awaitable, timeout, args):
+    """Await a process (killing its process tree and raising ``subprocess.TimeoutExpired`` after the timeout)."""
+    import asyncio  # pylint: disable=import-outside-toplevel
+    if timeout is None:
+        return await awaitable
+    try:
+        return await asyncio.wait_for(awaitable, timeout)
+    except asyncio.TimeoutError as error:
+        kill_process_tree(process)
+        await process.wait()
+        raise subprocess.TimeoutExpired(args, timeout) from error
+
+
+def _check_output_wmic(wmic_args):
+    """Run WMIC (on the installed worker pool, if any, for local queries) and return its decoded output."""
+    return _execution_policy().execute('wmic', ['wmic'] + wmic_args, functools.partial(_check_output_wmic_once,
+                                                                                       wmic_args))
+
+
+def _check_output_wmic_once(wmic_args, timeout):
+    with instrument('wmic', ['wmic'] + wmic_args) as invocation:
+        if wmic_worker_pool is not None and not wmic_args[0].startswith('/node:'):
+            output = wmic_worker_pool.run(wmic_args, timeout)
+        else:
+            output = _check_output(['wmic'] + wmic_args, timeout).decode('utf-8')
+        invocation.exit_code, invocation.output_size = 0, len(output)
+    return output
+
+
+def _call_netsh(instrumented_args, command, timeout):
+    with instrument('netsh', instrumented_args) as invocation:
+        invocation.exit_code = int(_call(command, timeout))
+    return invocation.exit_code
+
+
+def _call(command, timeout):
+    """Equivalent of ``subprocess.call(command, stdout=devnull)`` killing the process tree after the timeout."""
+    if timeout is None:
+        return subprocess.call(command, stdout=subprocess.DEVNULL)
+    with subprocess.Popen(command, stdout=subprocess.DEVNULL, **_process_group_options(timeout)) as process:
+        try:
+            return process.wait(timeout)
+        except subprocess.TimeoutExpired:
+            kill_process_tree(process)
+            raise
+
+
+def _check_output(args, timeout):
+    """Equivalent of ``subprocess.check_output(args)`` killing the process tree after the timeout."""
+    if timeout is None:
+        return subprocess.check_output(args)
+    with subprocess.Popen(args, stdout=subprocess.PIPE, **_process_group_options(timeout)) as process:
+        try:
+            output, _ = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            kill_process_tree(process)
+            raise
+    if process.returncode:
+        raise subprocess.CalledProcessError(process.returncode, args, output)
+    return output
+
+
+def _process_group_options(timeout):
+    """Get the process creation options isolating a process tree (to kill on timeout) in its own group."""
+    if timeout is None:
+        return {}
+    if os.name == 'nt':
+        return {'creationflags': subprocess.CREATE_NEW_PROCESS_GROUP}  # pylint: disable=no-member
+    return {'start_new_session': True}
+
+
+def _execution_policy():
+    """Get the execution policy of the current call site (or the default policy)."""
+    return current_policy() or _policy.default_policy
+
+
+def wmic_node_args(node):
+    """Get the WMIC global switch targeting a node (none for the local computer)."""
+    return [f'/node:{node}'] if node else []
+
+
+def _split_netsh_args(netsh_args):
+    """Split netsh arguments into the tokens a Windows command line would give netsh.
+
+    Double quotes group words and are removed (``name="Local Area Connection"`` becomes one
+    ``name=Local Area Connection`` token), and backslashes are kept as they are.
+
+    :param str netsh_args: arguments following ``netsh interface ipv4``
+    :rtype: list of str
+
+    """
+    lexer = shlex.shlex(netsh_args, posix=True)
+    lexer.whitespace_split, lexer.quotes, lexer.escape = True, '"', ''
+    return list(lexer)
+
+
+def _netsh_node_args(node):
+    """Get the netsh option targeting a remote computer (none for the local computer)."""
+    return ['-r', node] if node else []
 
 
-def parse_array(raw_array):
-    """Parse a WMIC array."""
-    array_strip_brackets = raw_array.replace('{', '').replace('}', '')
-    array_strip_spaces = array_strip_brackets.replace('"', '').replace(' ', '')
-    return array_strip_spaces.split(',')
+def _build_wmic_query_args(windows_class, windows_names, where):
+    wmic_args = ['path', windows_class]
+    if where:
+        wmic_args += ['where', where]
+    return wmic_args + ['get', ','.join(windows_names), '/value']
 
 
 def _strip_wmic_response(wmic_resp):
     """Strip and remove header row (if attribute) or call log (if method)."""
-    return [line.strip() for line in wmic_resp.split('\n') if line.strip() != ''][1:]
+    return [line for line in map(str.strip, wmic_resp.split('\n')) if line != ''][1:]
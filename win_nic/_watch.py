@@ -0,0 +1,105 @@
+﻿"""Module containing NIC change detection used by the watch methods of the network adapter classes."""
+
+from collections import namedtuple
+
+# Store the snapshot fields (or properties) compared between polls by default.
+WATCHED_FIELDS = ('net_connection_status', 'speed', 'ip_addresses')
+
+
+class NicChange(namedtuple('NicChange', ['kind', 'index', 'field', 'old', 'new', 'snapshot'])):
+
+    """Change of a NIC detected between two polls of :meth:`win_nic.NetworkAdapters.watch`.
+
+    :param str kind: ``'added'``, ``'removed'`` or ``'changed'``
+    :param int index: index of the NIC
+    :param str field: name of the changed snapshot field (``None`` if added or removed)
+    :param old: previous value of the field (``None`` if added or removed)
+    :param new: current value of the field (``None`` if added or removed)
+    :param win_nic.NicSnapshot snapshot: current snapshot of the NIC (the last one if removed)
+
+    """
+
+    __slots__ = ()
+
+
+def diff_snapshots(old_table, new_table, fields=WATCHED_FIELDS):
+    """Compare two NIC tables (dictionaries mapping index to snapshot).
+
+    :returns: changes ordered by NIC index
+    :rtype: list of win_nic.NicChange
+
+    """
+    changes = []
+    for index in sorted(set(old_table) | set(new_table)):
+        old_snapshot, new_snapshot = old_table.get(index), new_table.get(index)
+        if old_snapshot is None:
+            changes.append(NicChange('added', index, None, None, None, new_snapshot))
+        elif new_snapshot is None:
+            changes.append(NicChange('removed', index, None, None, None, old_snapshot))
+        else:
+            for field in fields:
+                old_value, new_value = getattr(old_snapshot, field), getattr(new_snapshot, field)
+                if old_value != new_value:
+                    changes.append(NicChange('changed', index, field, old_value, new_value, new_snapshot))
+    return changes
+
+
+def next_interval(current, interval, max_interval, backoff, changed):
+    """Get the seconds until the next poll.
+
+    Polling returns to the base interval after a poll that detected changes and slows down
+    (multiplying the interval by the backoff factor, up to the maximum) after a quiet or failed poll.
+
+    """
+    if changed:
+        return interval
+    return min(current * backoff, max_interval)
+
+
+class WatchSchedule:
+
+    """Poll schedule and change detection of a watch (shared by the sync and async watch methods).
+
+    Iterating yields the seconds to wait before each poll. Each poll must then be reported with
+    :meth:`update` (passing the NIC table it returned) or :meth:`failed` (passing the exception it
+    raised). ``on_update`` is called with the NIC table of every successful poll (before its
+    changes are returned).
+
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, nic_table, on_update, *, interval, max_interval, backoff, fields, max_failures, max_polls):
+        self._nic_table = nic_table
+        self._on_update = on_update
+        self._intervals = (interval, max_interval, backoff)
+        self._fields = fields
+        self._limits = (max_failures, max_polls)
+        self._current = interval
+        self._failures = 0
+
+    def __iter__(self):
+        polls = 0
+        max_polls = self._limits[1]
+        while max_polls is None or polls < max_polls:
+            yield self._current
+            polls += 1
+
+    def failed(self, error):
+        """Slow down after a failed poll (raising its exception after too many consecutive failures)."""
+        self._failures += 1
+        if self._failures >= self._limits[0]:
+            raise error
+        self._current = next_interval(self._current, *self._intervals, False)
+
+    def update(self, nic_table):
+        """Compare the NIC table of a poll against the previous one.
+
+        :returns: changes ordered by NIC index
+        :rtype: list of win_nic.NicChange
+
+        """
+        changes = diff_snapshots(self._nic_table, nic_table, self._fields)
+        self._nic_table, self._failures = nic_table, 0
+        self._on_update(nic_table)
+        self._current = next_interval(self._current, *self._intervals, bool(changes))
+        return changes
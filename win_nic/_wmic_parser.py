@@ -0,0 +1,122 @@
+﻿"""Module containing streaming parsers of WMIC output formats."""
+
+import csv
+import re
+
+_wmic_return_rx = re.compile(r'ReturnValue = (\d+);')
+
+
+def apply_converter(value, converter):
+    """Apply a converter to a parsed value (or to each element of a parsed array)."""
+    if value is None or converter is None:
+        return value
+    if isinstance(value, tuple):
+        return tuple(converter(element) for element in value)
+    return converter(value)
+
+
+def iter_csv_rows(lines, converters=None):
+    """Lazily parse WMIC output produced with ``/format:csv`` into row dictionaries.
+
+    The first non-blank line is the header. The ``Node`` column is dropped.
+
+    .. note:: WMIC does not quote CSV values, so values containing commas cannot be split
+              unambiguously. Prefer :func:`iter_value_records` for free-text properties.
+
+    :param lines: iterable of output lines (e.g. a subprocess stdout stream)
+    :param dict converters: Windows property name to callable applied to non-empty values
+
+    """
+    converters = converters or {}
+    columns = None
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        if columns is None:
+            # Resolve each column's converter once rather than once per value.
+            columns = [(position, key, converters.get(key)) for position, key in enumerate(line.split(','))
+                       if key != 'Node']
+            continue
+        values = line.split(',')
+        yield {key: apply_converter(parse_value(values[position]), converter) if position < len(values) else None
+               for position, key, converter in columns}
+
+
+def iter_value_records(lines, converters=None):
+    """Lazily parse WMIC output produced with ``/value`` into record dictionaries.
+
+    Each instance is printed as ``Name=Value`` lines. WMIC terminates lines with ``\\r\\r\\n``, so
+    blank lines do not reliably delimit instances; a new record starts when a property repeats.
+
+    :param lines: iterable of output lines (e.g. a subprocess stdout stream)
+    :param dict converters: Windows property name to callable applied to non-empty values
+
+    """
+    converters = converters or {}
+    record = {}
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        key, _, value = line.partition('=')
+        if key in record:
+            yield record
+            record = {}
+        record[key] = apply_converter(parse_value(value), converters.get(key))
+    if record:
+        yield record
+
+
+def as_array(value):
+    """Get the elements of a parsed array value as a tuple.
+
+    ``None`` is an empty array and a scalar is a one-element array. A bare ``{...}`` value (which
+    :func:`parse_value` keeps as a string, e.g. a one-element ``{10.0.0.1}`` array) is split into
+    its comma- or semicolon-separated elements.
+
+    :rtype: tuple
+
+    """
+    if value is None:
+        return ()
+    if isinstance(value, tuple):
+        return value
+    if value.startswith('{') and value.endswith('}'):
+        return tuple(element.strip() for element in re.split('[,;]', value[1:-1]) if element.strip() != '')
+    return (value,)
+
+
+def parse_return_value(wmic_resp_list):
+    """Parse the ReturnValue out parameter from the (stripped) WMIC response to a method call."""
+    raw_response = '\n'.join(wmic_resp_list)
+    return int(_wmic_return_rx.findall(raw_response)[0])
+
+
+def parse_value(raw_value):
+    """Parse a raw WMIC value.
+
+    Arrays are ``{...}`` values whose elements are quoted (default and ``/value`` formats) or
+    semicolon-separated (``/format:csv``). Other braced values (e.g. GUIDs) are plain strings.
+
+    :returns: ``None`` for empty values, a tuple of strings for arrays, or the string
+    :rtype: str or tuple or None
+
+    """
+    raw_value = raw_value.strip()
+    if raw_value == '':
+        return None
+    if raw_value.startswith('{') and raw_value.endswith('}'):
+        array_body = raw_value[1:-1]
+        if array_body.strip() == '' or '"' in array_body or ';' in array_body:
+            return _parse_array(array_body)
+    return raw_value
+
+
+def _parse_array(array_body):
+    """Parse the body of a WMIC array (quoted and comma-separated or bare and semicolon-separated)."""
+    if '"' in array_body:
+        elements = next(csv.reader([array_body], skipinitialspace=True), [])
+    else:
+        elements = array_body.split(';')
+    return tuple(element.strip() for element in elements if element.strip() != '')
@@ -0,0 +1,282 @@
+﻿"""Module containing persistent WMIC worker processes (avoiding a process launch per query)."""
+
+import base64
+import itertools
+import json
+import subprocess
+import threading
+
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+
+from win_nic import _utils
+
+
+# Each response ends with a frame line: the record separator character, the request ID and the
+# exit code (e.g. "\x1e12 0").
+_FRAME_MARKER = '\x1e'
+
+# PowerShell REPL answering WMIC-style requests (the argument subset win_nic generates) with
+# CIM cmdlets in one long-lived process and printing output in the format WMIC would print.
+POWERSHELL_WORKER_SCRIPT = r'''
+$ErrorActionPreference = 'Stop'
+[Console]::OutputEncoding = New-Object System.Text.UTF8Encoding $false
+function Format-WmicValue($value, $quoted) {
+    if ($null -eq $value) { return '' }
+    if ($value -is [bool]) { if ($value) { return 'TRUE' } else { return 'FALSE' } }
+    if ($value -is [array]) {
+        $separator = if ($quoted) { ', ' } else { ',' }
+        return '{' + (($value | ForEach-Object { '"' + $_ + '"' }) -join $separator) + '}'
+    }
+    return [string]$value
+}
+while ($null -ne ($line = [Console]::In.ReadLine())) {
+    $request = $line | ConvertFrom-Json
+    $code = 0
+    if (-not $request.ping) {
+        try {
+            $wmicArgs = @($request.args)
+            $class = $wmicArgs[1]
+            $position = 2
+            $filter = $null
+            if ($wmicArgs[$position] -eq 'where') { $filter = $wmicArgs[$position + 1]; $position += 2 }
+            $verb = $wmicArgs[$position]
+            $target = $wmicArgs[$position + 1]
+            if ($filter) { $instances = @(Get-CimInstance -ClassName $class -Filter $filter) }
+            else { $instances = @(Get-CimInstance -ClassName $class) }
+            if ($verb -eq 'get') {
+                $names = $target -split ','
+                if ($wmicArgs -contains '/value') {
+                    foreach ($instance in $instances) {
+                        [Console]::Out.WriteLine('')
+                        foreach ($name in $names) {
+                            [Console]::Out.WriteLine($name + '=' + (Format-WmicValue $instance.$name $false))
+                        }
+                    }
+                } else {
+                    [Console]::Out.WriteLine($target)
+                    foreach ($instance in $instances) {
+                        [Console]::Out.WriteLine((($names | ForEach-Object { Format-WmicValue $instance.$_ $true }) -join '  '))
+                    }
+                }
+            } elseif ($verb -eq 'call') {
+                [Console]::Out.WriteLine('Method execution successful.')
+                foreach ($instance in $instances) {
+                    $result = Invoke-CimMethod -InputObject $instance -MethodName $target
+                    [Console]::Out.WriteLine('ReturnValue = ' + $result.ReturnValue + ';')
+                }
+            } else {
+                throw "unsupported wmic verb: $verb"
+            }
+        } catch {
+            [Console]::Out.WriteLine($_.Exception.Message)
+            $code = 1
+        }
+    }
+    [Console]::Out.WriteLine([string][char]0x1e + [string]$request.id + ' ' + $code)
+    [Console]::Out.Flush()
+}
+'''
+
+POWERSHELL_WORKER_COMMAND = [
+    'powershell', '-NoProfile', '-NonInteractive', '-EncodedCommand',
+    base64.b64encode(POWERSHELL_WORKER_SCRIPT.encode('utf-16-le')).decode('ascii'),
+]
+
+
+class WorkerError(Exception):
+
+    """Persistent WMIC worker process exited or stopped responding."""
+
+
+class WmicWorker:
+
+    """One persistent WMIC worker process.
+
+    Requests are JSON lines (``{"id": 1, "args": ["path", ...]}`` or ``{"id": 2, "ping": true}``)
+    written to the worker's stdin. The worker prints each response followed by a frame line, so
+    several requests can be written before their responses are read (pipelining).
+
+    :param list command: command line starting the worker process
+    :param float health_timeout: seconds :meth:`check_health` waits for a ping response
+
+    """
+
+    def __init__(self, command=None, health_timeout=10.0):
+        self.command = list(command or POWERSHELL_WORKER_COMMAND)
+        self.health_timeout = health_timeout
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._process = None
+        self._pending = {}
+
+    @property
+    def pending(self):
+        """Get the number of requests awaiting a response.
+
+        :rtype: int
+
+        """
+        return len(self._pending)
+
+    def _start(self):
+        # The process outlives this method: it is closed by close() or killed after a timeout.
+        self._process = subprocess.Popen(  # pylint: disable=consider-using-with
+            self.command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        self._pending = {}
+        threading.Thread(target=self._read_responses, args=(self._process, self._pending), daemon=True).start()
+
+    def _read_responses(self, process, pending):
+        """Resolve the futures of requests as their framed responses arrive (reader thread)."""
+        lines = []
+        for raw_line in process.stdout:
+            line = raw_line.decode('utf-8')
+            if not line.startswith(_FRAME_MARKER):
+                lines.append(line)
+                continue
+            request_id, exit_code = line[len(_FRAME_MARKER):].split()
+            future = pending.pop(int(request_id), None)
+            if future is not None:
+                future.set_result((int(exit_code), ''.join(lines)))
+            lines = []
+        with self._lock:
+            for future in pending.values():
+                future.set_exception(WorkerError(f"worker process exited with code {process.wait()}"))
+            pending.clear()
+
+    def submit(self, wmic_args=None, ping=False):
+        """Send a request without waiting for its response.
+
+        :param list wmic_args: WMIC arguments (as passed to :func:`win_nic._utils.run_wmic_command`)
+        :param bool ping: send a health check request instead
+        :returns: future resolving to an (exit code, output) tuple
+        :rtype: concurrent.futures.Future
+
+        """
+        future = Future()
+        with self._lock:
+            if self._process is None or self._process.poll() is not None:
+                self._start()
+            request = {'id': next(self._ids)}
+            if ping:
+                request['ping'] = True
+            else:
+                request['args'] = list(wmic_args)
+            self._pending[request['id']] = future
+            try:
+                self._process.stdin.write((json.dumps(request) + '\n').encode('utf-8'))
+                self._process.stdin.flush()
+            except OSError as error:
+                self._pending.pop(request['id'], None)
+                future.set_exception(WorkerError(f"cannot write to worker process: {error}"))
+        return future
+
+    def run(self, wmic_args, timeout=None):
+        """Run a WMIC request and return its output (like ``subprocess.check_output``).
+
+        :raises subprocess.CalledProcessError: if the request failed in the worker
+        :raises subprocess.TimeoutExpired: if no response arrived in time (the worker process is
+            killed, failing its other pending requests, and the next request starts a new one)
+
+        """
+        try:
+            exit_code, output = self.submit(wmic_args).result(timeout)
+        except FutureTimeoutError as error:
+            with self._lock:
+                process, self._process = self._process, None
+            if process is not None:
+                _utils.kill_process_tree(process)
+            raise subprocess.TimeoutExpired(['wmic'] + list(wmic_args), timeout) from error
+        if exit_code:
+            raise subprocess.CalledProcessError(exit_code, ['wmic'] + list(wmic_args), output)
+        return output
+
+    def check_health(self):
+        """Ping the worker and restart it if it does not answer in time.
+
+        :returns: True if the worker was healthy, False if it was restarted
+        :rtype: bool
+
+        """
+        try:
+            self.submit(ping=True).result(self.health_timeout)
+            return True
+        except Exception:  # pylint: disable=broad-except
+            self.close()
+            return False
+
+    def close(self):
+        """Stop the worker process (the next request starts a new one)."""
+        with self._lock:
+            process, self._process = self._process, None
+        if process is not None and process.poll() is None:
+            process.stdin.close()
+            try:
+                process.wait(self.health_timeout)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+
+
+class WmicWorkerPool:
+
+    """Pool of persistent WMIC worker processes used in place of a ``wmic`` process per query.
+
+    Use the pool as a context manager (or call :meth:`install` and :meth:`close`) to route every
+    synchronous WMIC query of :class:`win_nic.Nic` and :class:`win_nic.NetworkAdapters` through it::
+
+        >>> with WmicWorkerPool(size=2):
+        ...     adapters = NetworkAdapters()
+
+    Requests go to the worker with the fewest pending requests. Workers start on first use.
+
+    :param int size: number of worker processes
+    :param list command: command line starting a worker process (defaults to a PowerShell process
+        answering requests with CIM cmdlets)
+    :param float health_timeout: seconds a health check waits for each worker
+
+    """
+
+    def __init__(self, size=1, command=None, health_timeout=10.0):
+        self.workers = [WmicWorker(command, health_timeout) for _ in range(size)]
+        self._previous_pool = None
+
+    def __enter__(self):
+        self.install()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def check_health(self):
+        """Ping every worker and restart the unresponsive ones.
+
+        :returns: number of workers that were restarted
+        :rtype: int
+
+        """
+        return sum(not worker.check_health() for worker in self.workers)
+
+    def close(self):
+        """Uninstall the pool (if installed) and stop every worker process."""
+        if _utils.wmic_worker_pool is self:
+            _utils.wmic_worker_pool = self._previous_pool
+        for worker in self.workers:
+            worker.close()
+
+    def install(self):
+        """Route synchronous WMIC queries through this pool."""
+        self._previous_pool = _utils.wmic_worker_pool
+        _utils.wmic_worker_pool = self
+
+    def run(self, wmic_args, timeout=None):
+        """Run a WMIC request on the least busy worker and return its output."""
+        return min(self.workers, key=lambda worker: worker.pending).run(wmic_args, timeout)
+
+    def submit(self, wmic_args):
+        """Send a WMIC request to the least busy worker without waiting (pipelining).
+
+        :returns: future resolving to an (exit code, output) tuple
+        :rtype: concurrent.futures.Future
+
+        """
+        return min(self.workers, key=lambda worker: worker.pending).submit(wmic_args)
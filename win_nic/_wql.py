@@ -0,0 +1,187 @@
+﻿"""Module containing WQL where clause building (from NIC attribute predicates) and evaluation."""
+
+import re
+
+from enum import Enum
+
+_token_rx = re.compile(r"""\s*(?:(?P<string>'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")|(?P<number>-?\d+)"""
+                       r"""|(?P<operator><>|!=|=|\(|\))|(?P<word>[A-Za-z_][A-Za-z0-9_]*))""")
+
+
+def build_where(predicates):
+    """Build a WQL where clause matching all predicates.
+
+    :param predicates: iterable of (Windows property name, value) tuples; a value may be a string
+        (``*`` and ``?`` wildcards match like glob patterns), a number, a bool, an enumeration
+        member, ``None`` (matches empty properties) or a list of such values (matches any of them)
+    :returns: WQL condition (``None`` if there are no predicates)
+    :rtype: str
+
+    """
+    conditions = []
+    for windows_name, value in predicates:
+        if isinstance(value, (list, tuple, set, frozenset)):
+            alternatives = [_condition(windows_name, alternative) for alternative in value]
+            if not alternatives:
+                raise ValueError(f"no values given for '{windows_name}'")
+            conditions.append(alternatives[0] if len(alternatives) == 1 else '(' + ' OR '.join(alternatives) + ')')
+        else:
+            conditions.append(_condition(windows_name, value))
+    return ' AND '.join(conditions) or None
+
+
+def quote(value):
+    """Quote a string as a WQL string literal.
+
+    :rtype: str
+
+    """
+    return "'" + value.replace('\\', '\\\\').replace("'", "\\'") + "'"
+
+
+def _condition(windows_name, value):
+    if value is None:
+        return f'{windows_name} IS NULL'
+    if isinstance(value, bool):
+        return f"{windows_name}={'TRUE' if value else 'FALSE'}"
+    if isinstance(value, Enum):
+        value = value.value
+    if isinstance(value, int):
+        return f'{windows_name}={value}'
+    if isinstance(value, str):
+        if '*' in value or '?' in value:
+            return f'{windows_name} LIKE {quote(_like_pattern(value))}'
+        return f'{windows_name}={quote(value)}'
+    raise TypeError(f"cannot compare '{windows_name}' with {type(value).__name__} value {value!r}")
+
+
+def _like_pattern(glob_pattern):
+    """Translate a glob pattern to a WQL LIKE pattern (escaping the LIKE wildcards)."""
+    translated = {'*': '%', '?': '_', '%': '[%]', '_': '[_]', '[': '[[]'}
+    return ''.join(translated.get(character, character) for character in glob_pattern)
+
+
+def compile_where(where):
+    """Compile the WQL where clause subset built by :func:`build_where` into a predicate.
+
+    Supports ``=``, ``<>``/``!=``, ``IS [NOT] NULL`` and ``LIKE`` comparisons of properties with
+    string, number and boolean literals, combined with ``AND``, ``OR``, ``NOT`` and parentheses.
+    String comparisons are case-insensitive (as in WMI).
+
+    :returns: callable accepting a dictionary of raw (WMIC formatted) property values
+    :raises ValueError: if the condition is not in the supported subset
+
+    """
+    tokens = _tokenize(where)
+    predicate, position = _parse_or(tokens, 0, where)
+    if position != len(tokens):
+        raise ValueError(f"unsupported WQL condition '{where}'")
+    return predicate
+
+
+def _tokenize(where):
+    tokens = []
+    position = 0
+    while where[position:].strip():
+        match = _token_rx.match(where, position)
+        if match is None:
+            raise ValueError(f"unsupported WQL condition '{where}'")
+        kind = match.lastgroup
+        text = match.group(kind)
+        tokens.append((kind, text.upper() if kind == 'word' and text.upper() in _KEYWORDS else text))
+        position = match.end()
+    return tokens
+
+
+_KEYWORDS = ('AND', 'OR', 'NOT', 'IS', 'NULL', 'LIKE', 'TRUE', 'FALSE')
+
+
+def _parse_or(tokens, position, where):
+    predicate, position = _parse_and(tokens, position, where)
+    while position < len(tokens) and tokens[position] == ('word', 'OR'):
+        right, position = _parse_and(tokens, position + 1, where)
+        predicate = _either(predicate, right)
+    return predicate, position
+
+
+def _parse_and(tokens, position, where):
+    predicate, position = _parse_factor(tokens, position, where)
+    while position < len(tokens) and tokens[position] == ('word', 'AND'):
+        right, position = _parse_factor(tokens, position + 1, where)
+        predicate = _both(predicate, right)
+    return predicate, position
+
+
+def _parse_factor(tokens, position, where):
+    token = tokens[position] if position < len(tokens) else (None, None)
+    if token == ('word', 'NOT'):
+        predicate, position = _parse_factor(tokens, position + 1, where)
+        return (lambda instance: not predicate(instance)), position
+    if token == ('operator', '('):
+        predicate, position = _parse_or(tokens, position + 1, where)
+        if tokens[position:position + 1] != [('operator', ')')]:
+            raise ValueError(f"unsupported WQL condition '{where}'")
+        return predicate, position + 1
+    if token[0] != 'word' or token[1] in _KEYWORDS:
+        raise ValueError(f"unsupported WQL condition '{where}'")
+    name = token[1]
+    operator = tokens[position + 1] if position + 1 < len(tokens) else (None, None)
+    if operator == ('word', 'IS'):
+        negated = tokens[position + 2:position + 3] == [('word', 'NOT')]
+        if tokens[position + 2 + negated:position + 3 + negated] != [('word', 'NULL')]:
+            raise ValueError(f"unsupported WQL condition '{where}'")
+        return _is_null(name, negated), position + 3 + negated
+    literal = tokens[position + 2] if position + 2 < len(tokens) else (None, None)
+    if operator == ('word', 'LIKE') and literal[0] == 'string':
+        return _like(name, _unquote(literal[1])), position + 3
+    if operator[0] == 'operator' and operator[1] in ('=', '<>', '!=') and literal[0] in ('string', 'number', 'word'):
+        predicate = _equals(name, literal)
+        if operator[1] != '=':
+            return (lambda instance: _raw(instance, name) is not None and not predicate(instance)), position + 3
+        return predicate, position + 3
+    raise ValueError(f"unsupported WQL condition '{where}'")
+
+
+def _either(left, right):
+    return lambda instance: left(instance) or right(instance)
+
+
+def _both(left, right):
+    return lambda instance: left(instance) and right(instance)
+
+
+def _raw(instance, name):
+    """Get a raw property value of an instance by case-insensitive name (``None`` if empty)."""
+    for windows_name, value in instance.items():
+        if windows_name.lower() == name.lower():
+            return None if value in (None, '') else value
+    return None
+
+
+def _is_null(name, negated):
+    return lambda instance: (_raw(instance, name) is None) != negated
+
+
+def _equals(name, literal):
+    kind, text = literal
+    if kind == 'number':
+        number = int(text)
+        return lambda instance: str(_raw(instance, name)).lstrip('+') == str(number)
+    if kind == 'word':
+        if text not in ('TRUE', 'FALSE'):
+            raise ValueError(f"unsupported WQL literal '{text}'")
+        return lambda instance: str(_raw(instance, name)).upper() == text
+    expected = _unquote(text).casefold()
+    return lambda instance: _raw(instance, name) is not None and str(_raw(instance, name)).casefold() == expected
+
+
+def _like(name, pattern):
+    regex = re.compile(''.join('.*' if part == '%' else '.' if part == '_' else re.escape(part[1:-1])
+                               if part.startswith('[') else re.escape(part)
+                               for part in re.findall(r'\[[^\]]*\]|%|_|[^%_\[]+', pattern)),
+                       re.IGNORECASE | re.DOTALL)
+    return lambda instance: _raw(instance, name) is not None and regex.fullmatch(str(_raw(instance, name))) is not None
+
+
+def _unquote(text):
+    return re.sub(r'\\(.)', r'\1', text[1:-1])
@@ -0,0 +1,89 @@
+"""Module containing fake wmic and netsh executables for subprocess-level tests."""
+
+import json
+import os
+import shutil
+import stat
+import sys
+import tempfile
+
+_FAKE_EXECUTABLE = '''#!{python}
+import json
+import os
+import sys
+import time
+
+command = ' '.join([os.path.basename(sys.argv[0])] + sys.argv[1:])
+with open({log_path!r}, 'a', encoding='utf-8') as log:
+    log.write(json.dumps(['start', time.time(), command]) + '\\n')
+time.sleep({delay!r})
+with open({responses_path!r}, encoding='utf-8') as responses_file:
+    responses = json.load(responses_file)
+with open({log_path!r}, 'a', encoding='utf-8') as log:
+    log.write(json.dumps(['end', time.time(), command]) + '\\n')
+if command not in responses:
+    sys.stderr.write('unexpected command: ' + command + '\\n')
+    sys.exit(1)
+sys.stdout.write(responses[command])
+'''
+
+
+class FakeExecutables:
+
+    """Context manager placing fake ``wmic`` and ``netsh`` executables first on PATH.
+
+    :param dict responses: command line (executable name and arguments joined by spaces) to
+        standard output; unexpected command lines exit with status 1
+    :param float delay: seconds each invocation sleeps (to simulate process latency)
+
+    """
+
+    def __init__(self, responses, delay=0.0):
+        self.responses = responses
+        self.delay = delay
+        self._directory = None
+        self._original_path = None
+
+    def __enter__(self):
+        self._directory = tempfile.mkdtemp()
+        responses_path = os.path.join(self._directory, 'responses.json')
+        with open(responses_path, 'w', encoding='utf-8') as responses_file:
+            json.dump(self.responses, responses_file)
+        for name in ('wmic', 'netsh'):
+            executable_path = os.path.join(self._directory, name)
+            with open(executable_path, 'w', encoding='utf-8') as executable:
+                executable.write(_FAKE_EXECUTABLE.format(python=sys.executable, delay=self.delay,
+                                                         log_path=self._log_path,
+                                                         responses_path=responses_path))
+            os.chmod(executable_path, os.stat(executable_path).st_mode | stat.S_IEXEC)
+        self._original_path = os.environ.get('PATH', '')
+        os.environ['PATH'] = self._directory + os.pathsep + self._original_path
+        return self
+
+    def __exit__(self, *exc_info):
+        os.environ['PATH'] = self._original_path
+        shutil.rmtree(self._directory)
+
+    @property
+    def _log_path(self):
+        return os.path.join(self._directory, 'calls.log')
+
+    def _events(self):
+        if not os.path.exists(self._log_path):
+            return []
+        with open(self._log_path, encoding='utf-8') as log:
+            return [json.loads(line) for line in log]
+
+    @property
+    def calls(self):
+        """Get the command lines invoked so far (in start order)."""
+        return [command for event, _, command in self._events() if event == 'start']
+
+    @property
+    def max_concurrency(self):
+        """Get the largest number of invocations that were running at the same time."""
+        running = max_running = 0
+        for event, _, _ in sorted(self._events(), key=lambda entry: (entry[1], entry[0] == 'start')):
+            running += 1 if event == 'start' else -1
+            max_running = max(max_running, running)
+        return max_running
@@ -0,0 +1,40 @@
+"""Scripted stand-in for the persistent WMIC worker process.
+
+Usage: ``python fake_worker.py <responses JSON path>``. Requests whose arguments are ``pid`` are
+answered with the process ID, ``hang`` blocks the worker for a minute, and ``exit`` terminates the worker.
+
+"""
+
+import json
+import os
+import sys
+import time
+
+
+def main(responses_path):
+    """Answer JSON line requests with framed canned responses."""
+    with open(responses_path, encoding='utf-8') as responses_file:
+        responses = json.load(responses_file)
+    for line in sys.stdin:
+        request = json.loads(line)
+        command = ' '.join(request.get('args', []))
+        exit_code = 0
+        if request.get('ping'):
+            output = ''
+        elif command == 'pid':
+            output = f'{os.getpid()}\n'
+        elif command == 'hang':
+            time.sleep(60)
+            continue
+        elif command == 'exit':
+            sys.exit(3)
+        elif command in responses:
+            output = responses[command]
+        else:
+            output, exit_code = f'unexpected command: {command}\n', 1
+        sys.stdout.write(f'{output}\x1e{request["id"]} {exit_code}\n')
+        sys.stdout.flush()
+
+
+if __name__ == '__main__':
+    main(sys.argv[1])
@@ -0,0 +1,57 @@
+"""Module containing asynchronous network adapters class unit tests."""
+
+import asyncio
+import io
+import os
+from unittest import TestCase, skipUnless
+
+from win_nic import AsyncNetworkAdapters, AsyncNic, NetworkAdapters
+
+from .fake_executables import FakeExecutables
+from .test_async_nic import _run
+
+
+# pylint: disable=line-too-long
+_WIN32_NETWORKADAPTER_COLUMNS = ('Index,AdapterTypeID,Availability,Caption,ConfigManagerErrorCode,ConfigManagerUserConfig,Description,DeviceID,ErrorCleared,ErrorDescription,GUID,Installed,InterfaceIndex,'
+                                 'LastErrorCode,MACAddress,Manufacturer,Name,NetConnectionID,NetConnectionStatus,PhysicalAdapter,PNPDeviceID,PowerManagementSupported,ProductName,ServiceName,Speed')
+_RESPONSES = {
+    'wmic path win32_networkadapter get ' + _WIN32_NETWORKADAPTER_COLUMNS + ' /value': (
+        '\r\r\n\r\r\nIndex=0\r\r\nName=Ethernet Adapter\r\r\nNetConnectionID=Local Area Connection\r\r\nSpeed=1000000000\r\r\n'
+        '\r\r\n\r\r\nIndex=1\r\r\nName=Wi-Fi Adapter\r\r\nNetConnectionID=Wireless Area Connection\r\r\nSpeed=\r\r\n'),
+    'wmic path win32_networkadapterconfiguration get Index,IPAddress /value': (
+        '\r\r\n\r\r\nIndex=0\r\r\nIPAddress={"192.168.0.2"}\r\r\n\r\r\n\r\r\nIndex=1\r\r\nIPAddress=\r\r\n'),
+    'wmic path win32_networkadapter where index=0 get Speed': 'Speed\r\r\n1000000000\r\r\n\r\r\n',
+    'wmic path win32_networkadapter where index=1 get Speed': 'Speed\r\r\n300000000\r\r\n\r\r\n',
+}
+
+
+@skipUnless(os.name == 'posix', "fake executables require a POSIX shell")
+class TestAsyncNetworkAdapters(TestCase):
+
+    """Execute asynchronous network adapters class unit tests against a fake wmic executable."""
+
+    def test_create(self):
+        """Test create method of AsyncNetworkAdapters."""
+        with FakeExecutables(_RESPONSES, delay=0.2) as fakes:
+            test_adapters = _run(AsyncNetworkAdapters.create())
+            self.assertEqual(len(fakes.calls), 2)
+            self.assertEqual(fakes.max_concurrency, 2)
+        self.assertEqual(test_adapters.nic_connection_id_map, {'Local Area Connection': 0, 'Wireless Area Connection': 1})
+        self.assertEqual(test_adapters.nic_table[0].ip_addresses, ['192.168.0.2'])
+        self.assertNotIsInstance(test_adapters, NetworkAdapters)
+        self.assertFalse(hasattr(test_adapters, 'reconcile'))
+        stream = io.StringIO()
+        test_adapters.dump(stream, output_format='csv')
+        self.assertEqual(stream.getvalue().splitlines()[1:], ['0,Ethernet Adapter,Local Area Connection',
+                                                              '1,Wi-Fi Adapter,Wireless Area Connection'])
+
+    def test_get_nics(self):
+        """Test get_nic and get_nics methods of AsyncNetworkAdapters."""
+        async def read_speeds():
+            test_adapters = await AsyncNetworkAdapters.create(concurrency=1)
+            self.assertIsInstance(test_adapters.get_nic(name='Wi-Fi Adapter'), AsyncNic)
+            return await asyncio.gather(*[nic.speed for nic in test_adapters.get_nics()])
+
+        with FakeExecutables(_RESPONSES, delay=0.05) as fakes:
+            self.assertEqual(_run(read_speeds()), [1000000000, 300000000])
+            self.assertEqual(fakes.max_concurrency, 1)
@@ -0,0 +1,112 @@
+"""Module containing asynchronous NIC class unit tests."""
+
+import asyncio
+import os
+import tempfile
+from unittest import TestCase, skipUnless
+from unittest.mock import patch
+
+from win_nic import AsyncNic
+from win_nic.enums.nic_net_connection_status import NicNetConnectionStatus
+
+from .fake_executables import FakeExecutables
+
+
+# pylint: disable=line-too-long
+_RESPONSES = {
+    'wmic path win32_networkadapter where index=0 get Caption': 'Caption\r\r\n[00000000] Dummy Adapter\r\r\n\r\r\n',
+    'wmic path win32_networkadapter where index=0 get MACAddress': 'MACAddress\r\r\n00:00:00:00:00:00\r\r\n\r\r\n',
+    'wmic path win32_networkadapter where index=0 get NetConnectionID': 'NetConnectionID\r\r\nLocal Area Connection 0\r\r\n\r\r\n',
+    'wmic path win32_networkadapter where index=0 get NetConnectionStatus': 'NetConnectionStatus\r\r\n2\r\r\n\r\r\n',
+    'wmic path win32_networkadapter where index=0 get Speed': 'Speed\r\r\n1000000000\r\r\n\r\r\n',
+    'wmic path win32_networkadapterconfiguration where index=0 get IPAddress': 'IPAddress\r\r\n{"192.168.0.2", "0:0:0:0:0:0:0:1"}\r\r\n\r\r\n',
+    'wmic path win32_networkadapter where index=0 call Disable': 'Method execution successful.\r\r\nOut Parameters:\r\r\ninstance of __PARAMETERS\r\r\n{\r\r\n        ReturnValue = 5;\r\r\n};\r\r\n',
+    'wmic path win32_networkadapter where index=0 call Enable': 'Method execution successful.\r\r\nOut Parameters:\r\r\ninstance of __PARAMETERS\r\r\n{\r\r\n        ReturnValue = 0;\r\r\n};\r\r\n',
+    'netsh interface ipv4 set address name=Local Area Connection 0 source=dhcp': '',
+    'netsh interface ipv4 set address name=Local Area Connection 0 static 192.168.0.2 255.255.255.0 192.168.0.1': '',
+    'netsh interface ipv4 add dnsserver name=Local Area Connection 0 8.8.8.8': '',
+}
+
+
+def _run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+# pylint: disable=too-many-public-methods
+@skipUnless(os.name == 'posix', "fake executables require a POSIX shell")
+class TestAsyncNic(TestCase):
+
+    """Execute asynchronous NIC class unit tests against fake wmic and netsh executables."""
+
+    def setUp(self):
+        """Instantiate an asynchronous NIC."""
+        self.test_nic = AsyncNic(index=0)
+
+    def test_attribute(self):
+        """Test awaitable attribute access of the AsyncNic class."""
+        with FakeExecutables(_RESPONSES):
+            self.assertEqual(_run(self.test_nic.speed), 1000000000)
+            self.assertEqual(_run(self.test_nic.net_connection_status), NicNetConnectionStatus(2))
+            self.assertEqual(_run(self.test_nic.ip_addresses), ['192.168.0.2', '0:0:0:0:0:0:0:1'])
+            self.assertTrue(_run(self.test_nic.enabled_ctrl_panel))
+
+    def test_get_runs_concurrently(self):
+        """Test that get method of the AsyncNic class queries attributes concurrently."""
+        with FakeExecutables(_RESPONSES, delay=0.3) as fakes:
+            values = _run(self.test_nic.get('caption', 'speed', 'mac_address'))
+            self.assertEqual(values, ['[00000000] Dummy Adapter', 1000000000, '00:00:00:00:00:00'])
+            self.assertEqual(fakes.max_concurrency, 3)
+
+    def test_concurrency_limit(self):
+        """Test that a shared semaphore limits the number of concurrent processes."""
+        async def read_limited():
+            limited_nic = AsyncNic(0, asyncio.Semaphore(1))
+            return await limited_nic.get('caption', 'speed', 'mac_address')
+
+        with FakeExecutables(_RESPONSES, delay=0.1) as fakes:
+            _run(read_limited())
+            self.assertEqual(fakes.max_concurrency, 1)
+
+    def test_methods(self):
+        """Test asynchronous methods of the AsyncNic class."""
+        with FakeExecutables(_RESPONSES) as fakes:
+            self.assertEqual(_run(self.test_nic.disable()), 5)
+            self.assertEqual(_run(self.test_nic.enable()), 0)
+            self.assertEqual(_run(self.test_nic.use_dhcp()), 0)
+            self.assertEqual(_run(self.test_nic.set_static_address('192.168.0.2', '255.255.255.0', '192.168.0.1')), 0)
+            self.assertEqual(_run(self.test_nic.add_dns_server('8.8.8.8')), 0)
+            self.assertIn('netsh interface ipv4 add dnsserver name=Local Area Connection 0 8.8.8.8', fakes.calls)
+            self.assertEqual(_run(self.test_nic.add_dns_server('8.8.4.4')), 1)
+
+    def test_shell_metacharacters(self):
+        """Test that connection names reach netsh verbatim instead of being interpreted by a shell."""
+        marker_path = os.path.join(tempfile.mkdtemp(), 'injected')
+        connection_id = f'Lab & echo injected > {marker_path}'
+        responses = dict(_RESPONSES, **{
+            'wmic path win32_networkadapter where index=0 get NetConnectionID':
+                f'NetConnectionID\r\r\n{connection_id}\r\r\n\r\r\n',
+            f'netsh interface ipv4 set address name={connection_id} source=dhcp': '',
+        })
+        with FakeExecutables(responses) as fakes:
+            self.assertEqual(_run(self.test_nic.use_dhcp()), 0)
+            self.assertIn(f'netsh interface ipv4 set address name={connection_id} source=dhcp', fakes.calls)
+        self.assertFalse(os.path.exists(marker_path))
+
+    def test_netsh_argv(self):
+        """Test that netsh receives one argument per token, as the synchronous NIC passes them."""
+        with FakeExecutables(_RESPONSES):
+            with patch('asyncio.create_subprocess_exec', side_effect=asyncio.create_subprocess_exec) as create:
+                self.assertEqual(_run(self.test_nic.use_dhcp()), 0)
+        self.assertEqual(create.call_args[0], ('netsh', 'interface', 'ipv4', 'set', 'address',
+                                               'name=Local Area Connection 0', 'source=dhcp'))
+
+    def test_missing_attribute(self):
+        """Test attribute exception handling of the AsyncNic class."""
+        with self.assertRaises(AttributeError):
+            self.test_nic.not_an_attribute  # pylint: disable=pointless-statement
+        with self.assertRaises(AttributeError):
+            self.test_nic.speed = 0
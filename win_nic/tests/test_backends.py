@@ -0,0 +1,82 @@
+"""Module containing query backend unit tests."""
+
+import os
+import tempfile
+from unittest import TestCase
+
+from win_nic import FakeBackend, NetworkAdapters, Nic, RecordingBackend, ReplayBackend
+from win_nic.enums.nic_net_connection_status import NicNetConnectionStatus
+
+
+def _fake_backend():
+    return FakeBackend({
+        'win32_networkadapter': [
+            {'Index': '0', 'Name': 'Ethernet Adapter', 'NetConnectionID': 'Local Area Connection',
+             'NetConnectionStatus': '2', 'Speed': '1000000000', 'PhysicalAdapter': 'TRUE'},
+            {'Index': '1', 'Name': 'Wi-Fi Adapter', 'NetConnectionID': 'Wireless Area Connection',
+             'NetConnectionStatus': '7', 'PhysicalAdapter': 'TRUE'},
+        ],
+        'win32_networkadapterconfiguration': [
+            {'Index': '0', 'IPAddress': ('192.168.0.2', 'fe80::1')},
+            {'Index': '1'},
+        ],
+    }, method_return_values={'Enable': 5})
+
+
+# pylint: disable=too-many-public-methods
+class TestBackends(TestCase):
+
+    """Execute query backend unit tests."""
+
+    def test_fake_backend(self):
+        """Test NetworkAdapters and Nic on the FakeBackend class."""
+        backend = _fake_backend()
+        test_adapters = NetworkAdapters(backend=backend)
+        self.assertEqual(test_adapters.nic_connection_id_map,
+                         {'Local Area Connection': 0, 'Wireless Area Connection': 1})
+        test_nic = test_adapters.get_nic(index=1)
+        self.assertEqual(test_nic.net_connection_status, NicNetConnectionStatus(7))
+        self.assertEqual(test_nic.disable(), 0)
+        self.assertEqual(test_nic.net_connection_status, NicNetConnectionStatus(0))
+        self.assertEqual(test_nic.enable(), 5)
+        self.assertEqual(test_nic.use_dhcp(), 0)
+        self.assertEqual(Nic(0, backend=backend).ip_addresses, ['192.168.0.2', 'fe80::1'])
+        self.assertEqual([call[0] for call in backend.calls],
+                         ['query', 'query', 'call_method', 'get_property', 'call_method', 'run_netsh', 'get_property'])
+        self.assertIn(('run_netsh', 'set address name="Wireless Area Connection" source=dhcp'), backend.calls)
+
+    def test_fake_backend_scalar_array(self):
+        """Test that a scalar or bare one-element IPAddress array is one address."""
+        for ip_address in ('10.0.0.1', '{10.0.0.1}'):
+            backend = _fake_backend()
+            backend.instances['win32_networkadapterconfiguration'][1]['IPAddress'] = ip_address
+            self.assertEqual(Nic(1, backend=backend).ip_addresses, ['10.0.0.1'])
+            self.assertEqual(NetworkAdapters(backend=backend).nic_table[1].ip_addresses, ['10.0.0.1'])
+
+    def test_fake_backend_missing_value(self):
+        """Test missing attribute handling of Nic on the FakeBackend class."""
+        with self.assertRaises(AttributeError):
+            Nic(1, backend=_fake_backend()).speed  # pylint: disable=expression-not-assigned
+        self.assertEqual(_fake_backend().query('win32_networkadapter', ['Index'], "name='ethernet adapter'"),
+                         [{'Index': '0'}])
+        with self.assertRaises(ValueError):
+            _fake_backend().query('win32_networkadapter', ['Name'], 'speed > 100')
+
+    def test_record_replay(self):
+        """Test the RecordingBackend and ReplayBackend classes."""
+        recording_backend = RecordingBackend(_fake_backend())
+        recorded_adapters = NetworkAdapters(backend=recording_backend)
+        recorded_nic = recorded_adapters.get_nic(index=1)
+        recorded_values = [recorded_nic.disable(), Nic(1, backend=recording_backend).net_connection_status]
+
+        recording_path = os.path.join(tempfile.mkdtemp(), 'recording.json')
+        recording_backend.save(recording_path)
+        replay_backend = ReplayBackend(recording_path)
+        replayed_adapters = NetworkAdapters(backend=replay_backend)
+        replayed_nic = replayed_adapters.get_nic(index=1)
+        self.assertEqual(replayed_adapters.nic_table, recorded_adapters.nic_table)
+        self.assertEqual(replayed_adapters.nic_table[0].ip_addresses, ['192.168.0.2', 'fe80::1'])
+        self.assertEqual([replayed_nic.disable(), Nic(1, backend=replay_backend).net_connection_status],
+                         recorded_values)
+        with self.assertRaises(LookupError):
+            replayed_nic.use_dhcp()
@@ -0,0 +1,78 @@
+"""Module containing bulk NIC operation unit tests."""
+
+import threading
+import time
+from unittest import TestCase
+from unittest.mock import patch
+
+from win_nic import NetworkAdapters, Nic
+
+
+_RUNNING = {'now': 0, 'max': 0}
+_LOCK = threading.Lock()
+
+
+# pylint: disable=unused-argument
+def _mock_check_output(args):
+    command = ' '.join(args)
+    with _LOCK:
+        _RUNNING['now'] += 1
+        _RUNNING['max'] = max(_RUNNING['max'], _RUNNING['now'])
+    time.sleep(0.05)
+    with _LOCK:
+        _RUNNING['now'] -= 1
+    return_values = {
+        'wmic path win32_networkadapter where index=0 call Disable': 0,
+        'wmic path win32_networkadapter where index=0 call Enable': 0,
+        'wmic path win32_networkadapter where index=1 call Disable': 5,
+        'wmic path win32_networkadapter where index=2 call Disable': 0,
+    }
+    return bytes('Method execution successful.\nOut Parameters:\ninstance of __PARAMETERS\n{\n'
+                 f'        ReturnValue = {return_values[command]};\n}};', 'utf-8')
+
+
+# pylint: disable=too-many-public-methods
+class TestBulk(TestCase):
+
+    """Execute bulk NIC operation unit tests."""
+
+    def setUp(self):
+        """Reset the concurrency counters."""
+        _RUNNING.update(now=0, max=0)
+
+    @patch('subprocess.check_output', side_effect=_mock_check_output)
+    def test_bulk(self, mocked_check_output):
+        """Test bulk method of NetworkAdapters."""
+        nics = [Nic(0), Nic(1), Nic(2)]
+        results = NetworkAdapters.bulk([(nics[0], 'disable'), (nics[1], 'disable', ()), (nics[2], 'disable'),
+                                        (nics[0], 'enable')])
+        self.assertEqual([(result.nic.index, result.operation, result.return_value) for result in results],
+                         [(0, 'disable', 0), (1, 'disable', 5), (2, 'disable', 0), (0, 'enable', 0)])
+        self.assertEqual([result.succeeded for result in results], [True, False, True, True])
+        self.assertEqual(_RUNNING['max'], 3)
+        # The enable of NIC 0 must start after its disable finished.
+        self.assertGreaterEqual(results[3].start, results[0].start + results[0].duration)
+
+    @patch('subprocess.check_output', side_effect=_mock_check_output)
+    def test_bulk_max_workers(self, mocked_check_output):
+        """Test max_workers parameter of the bulk method of NetworkAdapters."""
+        NetworkAdapters.bulk([(Nic(index), 'disable') for index in range(3)], max_workers=1)
+        self.assertEqual(_RUNNING['max'], 1)
+
+    @patch('subprocess.check_output', side_effect=_mock_check_output)
+    def test_bulk_stop_on_error(self, mocked_check_output):
+        """Test stop_on_error parameter of the bulk method of NetworkAdapters."""
+        failing_nic = Nic(1)
+        results = NetworkAdapters.bulk([(failing_nic, 'disable'), (failing_nic, 'enable'), (Nic(3), 'enable')],
+                                       stop_on_error=True)
+        self.assertEqual(results[0].return_value, 5)
+        self.assertTrue(results[1].skipped)
+        self.assertIsInstance(results[2].exception, KeyError)
+        self.assertEqual(mocked_check_output.call_count, 2)
+
+    def test_bulk_invalid_operation(self):
+        """Test that bulk method of NetworkAdapters rejects non-operations."""
+        with self.assertRaises(ValueError):
+            NetworkAdapters.bulk([(Nic(0), '_call_win32_networkadapter', ('Disable',))])
+        with self.assertRaises(ValueError):
+            NetworkAdapters.bulk([(Nic(0), 'speed')])
@@ -0,0 +1,62 @@
+"""Module containing on-disk snapshot cache unit tests."""
+
+import os
+import tempfile
+import time
+from unittest import TestCase
+
+from win_nic import NetworkAdapters, SnapshotCache
+from win_nic.tests.test_backends import _fake_backend
+
+
+class TestSnapshotCache(TestCase):
+
+    """Execute on-disk snapshot cache unit tests."""
+
+    def setUp(self):
+        """Create an empty cache directory."""
+        self.cache = SnapshotCache(tempfile.mkdtemp(), host='test-host')
+
+    def test_cache(self):
+        """Test that a valid cache replaces enumeration with one index query."""
+        backend = _fake_backend()
+        first_adapters = NetworkAdapters(backend=backend, cache=self.cache)
+        self.assertEqual([call[0] for call in backend.calls], ['query', 'query'])
+        self.assertTrue(os.path.exists(self.cache.path))
+
+        backend.calls.clear()
+        cached_adapters = NetworkAdapters(backend=backend, cache=self.cache)
+        self.assertEqual(cached_adapters.nic_table, first_adapters.nic_table)
+        self.assertEqual(backend.calls, [('query', 'win32_networkadapter', ('Index',), None)])
+        test_nic = cached_adapters.get_nic(connection_id='Local Area Connection')
+        self.assertTrue(test_nic.physical_adapter)
+        self.assertEqual(len(backend.calls), 1)
+        self.assertEqual(test_nic.speed, 1000000000)
+        self.assertEqual(backend.calls[-1][0], 'get_property')
+
+        backend.calls.clear()
+        NetworkAdapters(backend=backend, cache=SnapshotCache(self.cache.directory, 'test-host', validate=False))
+        self.assertEqual(backend.calls, [])
+
+    def test_invalid_cache(self):
+        """Test that adding or removing an adapter invalidates the cache."""
+        backend = _fake_backend()
+        NetworkAdapters(backend=backend, cache=self.cache)
+        backend.instances['win32_networkadapter'].pop()
+        self.assertEqual(list(NetworkAdapters(backend=backend, cache=self.cache).nic_table), [0])
+        self.assertEqual(list(NetworkAdapters(backend=_fake_backend(), cache=self.cache).nic_table), [0, 1])
+        self.cache.clear()
+        self.cache.clear()
+        self.assertFalse(os.path.exists(self.cache.path))
+
+    def test_background_refresh(self):
+        """Test that a stale cache is used and refreshed in the background."""
+        backend = _fake_backend()
+        NetworkAdapters(backend=backend, cache=self.cache)
+        backend.instances['win32_networkadapter'][0]['Name'] = 'Renamed Adapter'
+        stale_cache = SnapshotCache(self.cache.directory, 'test-host', max_age=0.0)
+        time.sleep(0.01)
+        self.assertIn('Ethernet Adapter', NetworkAdapters(backend=backend, cache=stale_cache).nic_name_map)
+        stale_cache.wait()
+        self.assertIsNone(stale_cache.refresh_error)
+        self.assertIn('Renamed Adapter', NetworkAdapters(backend=backend, cache=self.cache).nic_name_map)
@@ -0,0 +1,66 @@
+"""Module containing coalescing backend unit tests."""
+
+import threading
+from unittest import TestCase
+
+from win_nic import CoalescingBackend, NetworkAdapters, Nic
+from win_nic.tests.test_backends import _fake_backend
+
+
+def _read_concurrently(reads):
+    """Call the read functions in threads started at the same moment and collect their results."""
+    barrier = threading.Barrier(len(reads))
+    results = [None] * len(reads)
+
+    def read(position):
+        barrier.wait()
+        try:
+            results[position] = reads[position]()
+        except Exception as error:  # pylint: disable=broad-except
+            results[position] = error
+
+    threads = [threading.Thread(target=read, args=(position,)) for position in range(len(reads))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+class TestCoalescing(TestCase):
+
+    """Execute coalescing backend unit tests."""
+
+    def test_merge_property_reads(self):
+        """Test merging concurrent reads of several attributes of several NICs into one query."""
+        fake_backend = _fake_backend()
+        backend = CoalescingBackend(fake_backend, window=0.05)
+        ethernet_nic, wifi_nic = Nic(0, backend=backend), Nic(1, backend=backend)
+        results = _read_concurrently([lambda: ethernet_nic.name, lambda: ethernet_nic.speed,
+                                      lambda: ethernet_nic.net_connection_status, lambda: wifi_nic.name,
+                                      lambda: wifi_nic.speed])
+        self.assertEqual(results[:2], ['Ethernet Adapter', 1000000000])
+        self.assertEqual(results[2].value, 2)
+        self.assertEqual(results[3], 'Wi-Fi Adapter')
+        self.assertIsInstance(results[4], AttributeError)
+        self.assertEqual(fake_backend.calls, [
+            ('query', 'win32_networkadapter', ('Index', 'Name', 'NetConnectionStatus', 'Speed'), 'index=0 or index=1'),
+        ])
+        self.assertEqual((backend.request_count, backend.query_count), (5, 1))
+
+    def test_single_flight(self):
+        """Test sharing the result of identical in-flight requests."""
+        fake_backend = _fake_backend()
+        fake_backend.latency = 0.05
+        backend = CoalescingBackend(fake_backend, window=0.0)
+        results = _read_concurrently([lambda: NetworkAdapters(backend=backend).nic_connection_id_map] * 4)
+        self.assertEqual(results, [{'Local Area Connection': 0, 'Wireless Area Connection': 1}] * 4)
+        self.assertEqual((backend.request_count, backend.query_count), (8, 2))
+
+    def test_pass_through(self):
+        """Test passing method calls and netsh commands through."""
+        fake_backend = _fake_backend()
+        test_nic = Nic(1, backend=CoalescingBackend(fake_backend))
+        self.assertEqual(test_nic.enable(), 5)
+        self.assertEqual(test_nic.use_dhcp(), 0)
+        self.assertEqual([call[0] for call in fake_backend.calls], ['call_method', 'query', 'run_netsh'])
@@ -0,0 +1,147 @@
+"""Unit tests for the NicConfiguration class."""
+
+import subprocess
+
+from unittest import TestCase
+from unittest.mock import patch
+
+from win_nic import CircuitOpenError, Nic
+from win_nic.tests.test_backends import _fake_backend
+
+
+class TestConfiguration(TestCase):
+
+    """Execute NicConfiguration unit tests."""
+
+    def test_commands(self):
+        """Test netsh commands generated by the builder."""
+        configuration = (Nic(1, backend=_fake_backend()).configure()
+                         .static_address('192.168.0.3', '255.255.255.0', '192.168.0.1')
+                         .dns_servers('192.168.0.1', '8.8.8.8')
+                         .add_dns_server('8.8.4.4'))
+        self.assertEqual(configuration.commands(), [
+            'set address name="Wireless Area Connection" static 192.168.0.3 255.255.255.0 192.168.0.1',
+            'set dnsservers name="Wireless Area Connection" source=static address=192.168.0.1 register=primary '
+            'validate=no',
+            'add dnsservers name="Wireless Area Connection" address=8.8.8.8 index=2 validate=no',
+            'add dnsservers name="Wireless Area Connection" address=8.8.4.4 validate=no',
+        ])
+
+    def test_apply(self):
+        """Test applying a configuration as one netsh batch."""
+        backend = _fake_backend()
+        test_nic = Nic(1, backend=backend)
+        result = (test_nic.configure()
+                  .static_address('192.168.0.3', '255.255.255.0', '192.168.0.1')
+                  .dns_servers('192.168.0.1', '8.8.8.8')
+                  .apply())
+        self.assertTrue(result.succeeded)
+        self.assertFalse(result.rolled_back)
+        self.assertEqual([step.applied for step in result.steps], [True, True])
+        self.assertEqual([call[0] for call in backend.calls].count('run_netsh_script'), 1)
+        self.assertEqual(test_nic.ip_addresses, ['192.168.0.3'])
+
+    def test_apply_rollback(self):
+        """Test restoring the prior configuration after a failed step."""
+        backend = _fake_backend()
+        backend.instances['win32_networkadapterconfiguration'][0].update(
+            {'DHCPEnabled': 'FALSE', 'IPSubnet': ('255.255.255.0', '64'), 'DNSServerSearchOrder': ('192.168.0.1',)})
+        backend.netsh_exit_codes['add dnsservers name="Local Area Connection" address=8.8.8.8 index=2 validate=no'] = 1
+        test_nic = Nic(0, backend=backend)
+        result = (test_nic.configure()
+                  .static_address('192.168.0.3', '255.255.255.0', '192.168.0.1')
+                  .dns_servers('192.168.0.1', '8.8.8.8')
+                  .apply())
+        self.assertFalse(result.succeeded)
+        self.assertEqual(result.exit_code, 1)
+        self.assertEqual([step.applied for step in result.steps], [True, False])
+        self.assertTrue(result.rolled_back)
+        self.assertEqual(result.rollback_exit_code, 0)
+        self.assertEqual([call[0] for call in backend.calls].count('run_netsh_script'), 2)
+        self.assertEqual(test_nic.ip_addresses, ['192.168.0.2'])
+        configuration = backend.instances['win32_networkadapterconfiguration'][0]
+        self.assertEqual(configuration['DNSServerSearchOrder'], ('192.168.0.1',))
+        self.assertIsNone(configuration['DefaultIPGateway'])
+
+    def test_apply_without_rollback(self):
+        """Test leaving a failed configuration in place when rollback is disabled."""
+        backend = _fake_backend()
+        backend.netsh_exit_codes['set address name="Wireless Area Connection" source=dhcp'] = 1
+        result = Nic(1, backend=backend).configure().dhcp().apply(rollback=False, verify=False)
+        self.assertEqual(result.steps[0].applied, None)
+        self.assertFalse(result.succeeded)
+        self.assertFalse(result.rolled_back)
+        self.assertEqual([call[0] for call in backend.calls], ['get_property', 'run_netsh_script'])
+
+    def test_apply_rollback_full(self):
+        """Test restoring every prior address, gateway and DNS server."""
+        backend = _fake_backend()
+        backend.instances['win32_networkadapterconfiguration'][0].update(
+            {'DHCPEnabled': 'FALSE', 'IPAddress': ('192.168.0.2', '192.168.1.2', 'fe80::1'),
+             'IPSubnet': ('255.255.255.0', '255.255.0.0', '64'), 'DefaultIPGateway': ('192.168.0.1', '192.168.1.1'),
+             'DNSServerSearchOrder': None})
+        backend.netsh_exit_codes['set dnsservers name="Local Area Connection" source=static address=8.8.8.8 '
+                                 'register=primary validate=no'] = 1
+        result = (Nic(0, backend=backend).configure()
+                  .static_address('192.168.0.3', '255.255.255.0', '192.168.0.1')
+                  .dns_servers('8.8.8.8')
+                  .apply())
+        self.assertTrue(result.rolled_back)
+        self.assertEqual(result.rollback_exit_code, 0)
+        configuration = backend.instances['win32_networkadapterconfiguration'][0]
+        self.assertEqual(configuration['IPAddress'], ('192.168.0.2', '192.168.1.2'))
+        self.assertEqual(configuration['IPSubnet'], ('255.255.255.0', '255.255.0.0'))
+        self.assertEqual(configuration['DefaultIPGateway'], ('192.168.0.1', '192.168.1.1'))
+        self.assertIsNone(configuration['DNSServerSearchOrder'])
+        self.assertNotIn('set dnsservers name="Local Area Connection" source=dhcp', backend.calls[-1][1])
+
+    def test_apply_rollback_on_error(self):
+        """Test restoring the prior configuration when the batch raises."""
+        backend = _fake_backend()
+        backend.instances['win32_networkadapterconfiguration'][0].update(
+            {'DHCPEnabled': 'FALSE', 'IPSubnet': ('255.255.255.0', '64'), 'DNSServerSearchOrder': ('192.168.0.1',)})
+        run_netsh_script = backend.run_netsh_script
+
+        def time_out(netsh_args_list):
+            run_netsh_script(netsh_args_list[:1])
+            raise subprocess.TimeoutExpired('netsh', 30)
+
+        test_nic = Nic(0, backend=backend)
+        configuration = test_nic.configure().static_address('192.168.0.3', '255.255.255.0').dns_servers('8.8.8.8')
+        with patch.object(backend, 'run_netsh_script', side_effect=lambda args: (
+                time_out(args) if args == configuration.commands() else run_netsh_script(args))):
+            with self.assertRaises(subprocess.TimeoutExpired):
+                configuration.apply()
+        self.assertEqual(test_nic.ip_addresses, ['192.168.0.2'])
+        with patch.object(backend, 'run_netsh_script', side_effect=CircuitOpenError('circuit open')) as script:
+            with self.assertRaises(CircuitOpenError):
+                configuration.apply()
+        self.assertEqual(script.call_count, 1)
+
+    def test_apply_rollback_dhcp(self):
+        """Test restoring DHCP-assigned DNS servers, and only the parts of the configuration a batch changes."""
+        backend = _fake_backend()
+        backend.instances['win32_networkadapterconfiguration'][0].update(
+            {'DHCPEnabled': 'TRUE', 'DNSServerSearchOrder': ('192.168.0.1',)})
+        backend.netsh_exit_codes['add dnsservers name="Local Area Connection" address=8.8.4.4 index=2 validate=no'] = 1
+        result = Nic(0, backend=backend).configure().dns_servers('8.8.8.8', '8.8.4.4').apply()
+        self.assertTrue(result.rolled_back)
+        self.assertEqual(backend.calls[-1][1], ('set dnsservers name="Local Area Connection" source=dhcp',))
+
+    def test_apply_without_prior_state(self):
+        """Test refusing to apply with rollback when the prior configuration cannot be read."""
+        backend = _fake_backend()
+        backend.instances['win32_networkadapterconfiguration'] = []
+        with self.assertRaises(AttributeError):
+            Nic(0, backend=backend).configure().dhcp().apply()
+        self.assertNotIn('run_netsh_script', [call[0] for call in backend.calls])
+
+    def test_apply_failed_restore(self):
+        """Test that a failing restore does not hide the exception of the batch."""
+        backend = _fake_backend()
+        configuration = Nic(0, backend=backend).configure().dhcp()
+        with patch.object(backend, 'run_netsh_script', side_effect=[subprocess.TimeoutExpired('netsh', 30),
+                                                                     OSError('restore failed')]) as script:
+            with self.assertRaises(subprocess.TimeoutExpired):
+                configuration.apply()
+        self.assertEqual(script.call_count, 2)
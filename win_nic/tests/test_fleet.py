@@ -0,0 +1,88 @@
+"""Unit tests for the Fleet class."""
+
+import subprocess
+import time
+
+from unittest import TestCase
+from unittest.mock import patch
+
+from win_nic import ExecutionPolicy, Fleet, WmicBackend
+from win_nic.tests.test_backends import _fake_backend
+
+
+def _fake_transport(latencies, failures=()):
+    """Get a transport reaching fake hosts with the given latencies (seconds per call)."""
+    def transport(host):
+        if host in failures:
+            raise ConnectionError(f"cannot reach host '{host}'")
+        backend = _fake_backend()
+        backend.latency = latencies[host]
+        return backend
+    return transport
+
+
+class TestFleet(TestCase):
+
+    """Execute Fleet unit tests."""
+
+    def test_adapters(self):
+        """Test streaming network adapters of every host as the hosts finish."""
+        fleet = Fleet(['slow', 'fast', 'down'], _fake_transport({'slow': 0.1, 'fast': 0.0}, failures=['down']))
+        results = list(fleet.adapters())
+        self.assertEqual([result.host for result in results][-1], 'slow')
+        self.assertEqual(sorted(result.host for result in results), ['down', 'fast', 'slow'])
+        for result in results:
+            if result.host == 'down':
+                self.assertFalse(result.succeeded)
+                self.assertIsInstance(result.exception, ConnectionError)
+            else:
+                self.assertTrue(result.succeeded)
+                self.assertEqual(result.value.get_nic(index=0).name, 'Ethernet Adapter')
+
+    def test_run_max_workers(self):
+        """Test bounding the number of hosts running at once."""
+        hosts = [f'host-{number}' for number in range(6)]
+        fleet = Fleet(hosts, _fake_transport(dict.fromkeys(hosts, 0.05)), max_workers=2)
+        start = time.monotonic()
+        results = list(fleet.run(lambda adapters: adapters.get_nic(connection_id='Wireless Area Connection').disable()))
+        self.assertGreaterEqual(time.monotonic() - start, 0.3)
+        self.assertEqual([result.value for result in results], [0] * 6)
+
+    def test_run_timeout(self):
+        """Test reporting hosts that do not finish in time."""
+        fleet = Fleet(['hung', 'fast'], _fake_transport({'hung': 1.0, 'fast': 0.0}), max_workers=1, timeout=0.1)
+        results = list(fleet.adapters())
+        self.assertEqual([result.host for result in results], ['hung', 'fast'])
+        self.assertIsInstance(results[0].exception, TimeoutError)
+        self.assertAlmostEqual(results[0].duration, 0.1, delta=0.05)
+        self.assertTrue(results[1].succeeded)
+
+    def test_host_policies(self):
+        """Test that unreachable hosts open only their own circuit breakers."""
+        def check_output(args):
+            if args[1].startswith('/node:down'):
+                raise subprocess.CalledProcessError(1, args)
+            return b'\r\r\nIndex=0\r\r\n'
+
+        hosts = ['down-1', 'down-2', 'up-1', 'up-2']
+        fleet = Fleet(hosts, max_workers=1, policy=ExecutionPolicy(failure_threshold=1))
+        with patch('subprocess.check_output', side_effect=check_output):
+            results = {result.host: result for result in fleet.adapters()}
+        self.assertEqual([results[host].succeeded for host in hosts], [False, False, True, True])
+        self.assertEqual(sorted(fleet.policies), hosts)
+        self.assertTrue(fleet.policies['down-1'].circuit_open)
+        self.assertFalse(fleet.policies['up-1'].circuit_open)
+        self.assertIsNot(fleet.host_policy('up-1'), fleet.host_policy('up-2'))
+        self.assertIs(Fleet(hosts, policy=lambda host: None).host_policy('up-1'), None)
+
+    @patch('subprocess.call', return_value=0)
+    @patch('subprocess.check_output', return_value=b'\r\r\nIndex=0\r\r\nName=Ethernet\r\r\n')
+    def test_wmic_node(self, mock_check_output, mock_call):
+        """Test reaching a remote host with the WMIC /node switch and netsh -r."""
+        backend = WmicBackend(node='host-1')
+        self.assertEqual(backend.query('win32_networkadapter', ['Index', 'Name']), [{'Index': '0', 'Name': 'Ethernet'}])
+        mock_check_output.assert_called_with(['wmic', '/node:host-1', 'path', 'win32_networkadapter', 'get',
+                                              'Index,Name', '/value'])
+        backend.run_netsh('set address name="Ethernet" source=dhcp')
+        self.assertEqual(mock_call.call_args[0][0], ['netsh', '-r', 'host-1', 'interface', 'ipv4', 'set', 'address',
+                                                     'name=Ethernet', 'source=dhcp'])
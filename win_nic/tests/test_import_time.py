@@ -0,0 +1,69 @@
+"""Module containing package import time budget tests."""
+
+import os
+import subprocess
+import sys
+from unittest import TestCase
+
+# Store the import time budgets as multiples of reference imports measured in the same run (absolute
+# budgets fail on slow or busy machines), and the modules that must only be imported when the
+# feature needing them is used.
+IMPORT_BUDGET = ('import json', 1)
+NIC_IMPORT_BUDGET = ('import asyncio', 2)
+DEFERRED_MODULES = ('asyncio', 'concurrent.futures', 'ipaddress', 'json', 'texttable')
+
+
+def _import_times(statement, runs=5):
+    """Get the best cumulative import time (in microseconds) of every module imported by a statement.
+
+    Modules imported by the statement itself (rather than by another module) are keyed with a
+    leading ``'^'``.
+
+    """
+    package_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    best_times = {}
+    for _ in range(runs):
+        stderr = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement], cwd=package_root,
+                                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, check=True).stderr.decode('utf-8')
+        for line in stderr.splitlines():
+            if not line.startswith('import time:') or 'cumulative' in line:
+                continue
+            _, cumulative, module = line[len('import time:'):].split('|')
+            for key in [module.strip()] + (['^' + module.strip()] if module[1] != ' ' else []):
+                best_times[key] = min(best_times.get(key, float('inf')), int(cumulative))
+    return best_times
+
+
+def _statement_import_time(statement, startup_modules):
+    """Get the time (in microseconds) spent importing the modules a statement adds to interpreter startup."""
+    return sum(duration for key, duration in _import_times(statement).items()
+               if key.startswith('^') and key[1:] not in startup_modules)
+
+
+class TestImportTime(TestCase):
+
+    """Fail when importing the package gets slower or eagerly imports optional dependencies."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Measure the modules imported at interpreter startup."""
+        cls.startup_modules = _import_times('pass')
+
+    def assert_import_time(self, statement, budget):
+        """Assert that a statement imports within a multiple of a reference statement's import time."""
+        reference, factor = budget
+        self.assertLessEqual(_statement_import_time(statement, self.startup_modules),
+                             factor * _statement_import_time(reference, self.startup_modules))
+
+    def test_import_package(self):
+        """Test the time taken by importing the package."""
+        self.assert_import_time('import win_nic', IMPORT_BUDGET)
+        import_times = _import_times('import win_nic')
+        self.assertFalse([module for module in import_times if module.startswith('win_nic._')])
+        self.assertFalse([module for module in DEFERRED_MODULES if module in import_times])
+
+    def test_import_nic(self):
+        """Test the time taken by importing the synchronous NIC classes."""
+        self.assert_import_time('from win_nic import NetworkAdapters, Nic', NIC_IMPORT_BUDGET)
+        import_times = _import_times('from win_nic import NetworkAdapters, Nic')
+        self.assertFalse([module for module in DEFERRED_MODULES if module in import_times])
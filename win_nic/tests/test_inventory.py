@@ -0,0 +1,59 @@
+"""Module containing inventory export and import unit tests."""
+
+import os
+import tempfile
+from unittest import TestCase
+
+from win_nic import NetworkAdapters, Nic, iter_inventory
+from win_nic.enums.nic_net_connection_status import NicNetConnectionStatus
+from win_nic.tests.test_backends import _fake_backend
+
+
+class TestInventory(TestCase):
+
+    """Execute inventory export and import unit tests."""
+
+    def setUp(self):
+        """Export the NICs of a fake host."""
+        self.inventory_path = os.path.join(tempfile.mkdtemp(), 'inventory.jsonl')
+        self.test_adapters = NetworkAdapters(backend=_fake_backend())
+        self.test_adapters.export(self.inventory_path)
+
+    def test_load(self):
+        """Test that a loaded inventory reproduces the NIC table and serves NIC reads offline."""
+        for use_mmap in (True, False):
+            loaded_adapters = NetworkAdapters.load(self.inventory_path, use_mmap=use_mmap)
+            self.assertEqual(loaded_adapters.nic_table, self.test_adapters.nic_table)
+        test_nic = loaded_adapters.get_nic(connection_id='Wireless Area Connection')
+        self.assertEqual(test_nic.net_connection_status, NicNetConnectionStatus(7))
+        self.assertEqual(Nic(0, backend=loaded_adapters.backend).ip_addresses, ['192.168.0.2', 'fe80::1'])
+        self.assertEqual(Nic(0, backend=loaded_adapters.backend).speed, 1000000000)
+        with self.assertRaises(NotImplementedError):
+            test_nic.disable()
+        with self.assertRaises(NotImplementedError):
+            test_nic.use_dhcp()
+
+    def test_multi_host(self):
+        """Test streaming reads of a multi-host inventory."""
+        self.test_adapters.export(self.inventory_path, host='host-a')
+        self.test_adapters.export(self.inventory_path, host='host-b', append=True)
+        self.assertEqual([(host, snapshot.index) for host, snapshot in iter_inventory(self.inventory_path)],
+                         [('host-a', 0), ('host-a', 1), ('host-b', 0), ('host-b', 1)])
+        self.assertEqual(NetworkAdapters.load(self.inventory_path, host='host-b').nic_table,
+                         self.test_adapters.nic_table)
+        with self.assertRaises(ValueError):
+            NetworkAdapters.load(self.inventory_path)
+
+    def test_invalid_file(self):
+        """Test that files other than inventories are rejected."""
+        with open(self.inventory_path, 'w', encoding='utf-8') as inventory_file:
+            inventory_file.write('[0]\n')
+        with self.assertRaises(ValueError):
+            list(iter_inventory(self.inventory_path))
+        with open(self.inventory_path, 'w', encoding='utf-8') as inventory_file:
+            inventory_file.write('{"format": "other"}\n')
+        with self.assertRaises(ValueError):
+            list(iter_inventory(self.inventory_path))
+        with open(self.inventory_path, 'w', encoding='utf-8'):
+            pass
+        self.assertEqual(list(iter_inventory(self.inventory_path)), [])
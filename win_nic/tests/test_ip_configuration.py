@@ -0,0 +1,86 @@
+"""Module containing IP configuration unit tests."""
+
+from ipaddress import ip_address, ip_interface
+from unittest import TestCase
+
+from win_nic import NetworkAdapters, Nic, WmicProperty
+from win_nic.tests.test_backends import _fake_backend
+
+
+def _configured_backend():
+    backend = _fake_backend()
+    backend.instances['win32_networkadapterconfiguration'][0].update({
+        'IPAddress': ('192.168.0.2', 'fe80::1c2f:3a4b:5c6d:7e8f'), 'IPSubnet': ('255.255.255.0', '64'),
+        'DefaultIPGateway': ('192.168.0.1',), 'DNSServerSearchOrder': ('192.168.0.1', '8.8.8.8'),
+        'DHCPEnabled': 'TRUE', 'DHCPServer': '192.168.0.1',
+    })
+    return backend
+
+
+class TestIpConfiguration(TestCase):
+
+    """Execute IP configuration unit tests."""
+
+    def test_ip_configuration(self):
+        """Test ip_configuration attribute of Nic."""
+        backend = _configured_backend()
+        test_nic = Nic(0, backend=backend)
+        configuration = test_nic.ip_configuration
+        self.assertEqual(configuration.interfaces, (ip_interface('192.168.0.2/24'),
+                                                    ip_interface('fe80::1c2f:3a4b:5c6d:7e8f/64')))
+        self.assertEqual(configuration.ipv4_interfaces[0].network, ip_interface('192.168.0.0/24').network)
+        self.assertEqual(configuration.ipv6_interfaces[0].network.prefixlen, 64)
+        self.assertEqual(configuration.addresses[0], ip_address('192.168.0.2'))
+        self.assertEqual(configuration.gateways, (ip_address('192.168.0.1'),))
+        self.assertEqual(configuration.dns_servers, (ip_address('192.168.0.1'), ip_address('8.8.8.8')))
+        self.assertIs(configuration.dhcp_enabled, True)
+        self.assertEqual(configuration.dhcp_server, ip_address('192.168.0.1'))
+        self.assertIs(test_nic.ip_configuration, configuration)
+        self.assertEqual(len(backend.calls), 1)
+        test_nic.use_dhcp()
+        self.assertIsNot(test_nic.ip_configuration, configuration)
+
+    def test_refresh_ip_configuration(self):
+        """Test that refreshing or invalidating every attribute covers ip_configuration."""
+        backend = _configured_backend()
+        test_nic = Nic(0, backend=backend)
+        self.assertIs(test_nic.ip_configuration.dhcp_enabled, True)
+        backend.instances['win32_networkadapterconfiguration'][0]['DHCPEnabled'] = 'FALSE'
+        test_nic.refresh()
+        calls = len(backend.calls)
+        self.assertIs(test_nic.ip_configuration.dhcp_enabled, False)
+        self.assertEqual(len(backend.calls), calls)
+        backend.instances['win32_networkadapterconfiguration'][0]['DHCPEnabled'] = 'TRUE'
+        test_nic.invalidate()
+        self.assertIs(test_nic.ip_configuration.dhcp_enabled, True)
+        self.assertIsInstance(Nic.ip_configuration, WmicProperty)
+
+    def test_missing_ip_configuration(self):
+        """Test the error raised for a NIC without IP configuration (fetched or cached by a refresh)."""
+        backend = _configured_backend()
+        del backend.instances['win32_networkadapterconfiguration'][0]
+        test_nic = Nic(0, backend=backend)
+        with self.assertRaisesRegex(AttributeError, 'IP configuration of NIC with index 0'):
+            test_nic.ip_configuration  # pylint: disable=pointless-statement
+        test_nic.refresh()
+        with self.assertRaisesRegex(AttributeError, "attribute 'ip_configuration'"):
+            test_nic.ip_configuration  # pylint: disable=pointless-statement
+
+    def test_empty_ip_configuration(self):
+        """Test ip_configuration attribute of Nic without addresses."""
+        configuration = Nic(1, backend=_configured_backend()).ip_configuration
+        self.assertEqual((configuration.interfaces, configuration.gateways, configuration.dns_servers),
+                         ((), (), ()))
+        self.assertIsNone(configuration.dhcp_server)
+        with self.assertRaises(AttributeError):
+            Nic(5, backend=_configured_backend()).ip_configuration  # pylint: disable=expression-not-assigned
+
+    def test_ip_configurations(self):
+        """Test ip_configurations method of NetworkAdapters reading every NIC with one query."""
+        backend = _configured_backend()
+        test_adapters = NetworkAdapters(backend=backend)
+        configurations = test_adapters.ip_configurations()
+        self.assertEqual(sorted(configurations), [0, 1])
+        self.assertEqual(configurations[0].interfaces[0], ip_interface('192.168.0.2/24'))
+        self.assertEqual(backend.calls[-1][0:2], ('query', 'win32_networkadapterconfiguration'))
+        self.assertEqual(len(backend.calls), 3)
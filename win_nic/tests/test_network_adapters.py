@@ -1,13 +1,16 @@
 """Module containing network adapters class unit tests."""
 
 import sys
+import time
 from unittest import TestCase
 from unittest.mock import patch
 from io import StringIO
 
 from baseline import Baseline
 
-from .. import _network_adapters
+from .. import _backends, _network_adapters
+from .test_backends import _fake_backend
+from ..enums.nic_net_connection_status import NicNetConnectionStatus
 
 
 # pylint: disable=too-many-public-methods, unused-argument
@@ -15,19 +18,27 @@ class TestNic(TestCase):
 
     """Execute network adapters class unit tests."""
 
-    # pylint: disable=no-self-argument
+    # pylint: disable=no-self-argument, line-too-long
     def _mock_check_output(args):
         command = ' '.join(args)
+        win32_networkadapter_columns = ['Index', 'AdapterTypeID', 'Availability', 'Caption', 'ConfigManagerErrorCode', 'ConfigManagerUserConfig', 'Description', 'DeviceID', 'ErrorCleared',
+                                        'ErrorDescription', 'GUID', 'Installed', 'InterfaceIndex', 'LastErrorCode', 'MACAddress', 'Manufacturer', 'Name', 'NetConnectionID',
+                                        'NetConnectionStatus', 'PhysicalAdapter', 'PNPDeviceID', 'PowerManagementSupported', 'ProductName', 'ServiceName', 'Speed']
+        win32_networkadapter_rows = [
+            ['0', '0', '3', '[00000000] Ethernet Adapter', '0', 'FALSE', 'Ethernet Adapter', '0', '', '', '{00000000-0000-0000-0000-000000000000}', 'TRUE', '11', '',
+             '00:00:00:00:00:00', 'Acme Corporation', 'Ethernet Adapter', 'Local Area Connection', '2', 'TRUE', 'PCI\\ETHERNET', 'TRUE', 'Ethernet Adapter', 'ethservice', '1000000000'],
+            ['1', '9', '2', '[00000001] Wi-Fi Adapter', '0', 'FALSE', 'Wi-Fi Adapter', '1', '', '', '{11111111-1111-1111-1111-111111111111}', 'TRUE', '12', '',
+             '11:11:11:11:11:11', 'Acme Corporation', 'Wi-Fi Adapter', 'Wireless Area Connection', '7', 'TRUE', 'PCI\\WIFI', 'TRUE', 'Wi-Fi Adapter', 'wifiservice', ''],
+            ['2', '', '3', '[00000002] WAN Miniport', '0', 'FALSE', 'WAN Miniport', '2', '', '', '', 'TRUE', '13', '',
+             '', 'Microsoft', 'WAN Miniport', '', '', 'FALSE', 'SWD\\MSRRAS', 'FALSE', 'WAN Miniport', 'RasSstp', ''],
+        ]
         wmic_responses = {
-            'wmic nic get Index,Name': 'Index  Name\n0      Ethernet Adapter\n1      Wi-Fi Adapter',
-            'wmic nic get Index, Name, NetConnectionID': ('Index  Name                           ' +
-                                                          '            NetConnectionID\n0      Et' +
-                                                          'hernet Adapter                        ' +
-                                                          ' Local Area Connection\n1      Wi-Fi A' +
-                                                          'dapter                                ' +
-                                                          ' Wireless Area Connection'),
-            'wmic nic get Index,NetConnectionID': ('Index  NetConnectionID\n0      Local Area Con' +
-                                                   'nection\n1      Wireless Area Connection'),
+            'wmic path win32_networkadapter get ' + ','.join(win32_networkadapter_columns) + ' /value': ''.join(
+                '\r\r\n\r\r\n' + ''.join(f'{column}={value}\r\r\n' for column, value in zip(win32_networkadapter_columns, row))
+                for row in win32_networkadapter_rows),
+            'wmic path win32_networkadapterconfiguration get Index,IPAddress /value': (
+                '\r\r\n\r\r\nIndex=0\r\r\nIPAddress={"192.168.0.2","0:0:0:0:0:0:0:1"}\r\r\n'
+                '\r\r\n\r\r\nIndex=1\r\r\nIPAddress=\r\r\n\r\r\n\r\r\nIndex=2\r\r\nIPAddress=\r\r\n'),
         }
         return bytes(wmic_responses[command], 'utf-8')
 
@@ -45,22 +56,151 @@ class TestNic(TestCase):
         _printed = sys.stdout.getvalue()
         sys.stdout = _stdout
         self.assertEqual(_printed, Baseline("""
-            +-------+------------------+---------------------------+
-            | Index |       Name       |       Connection ID       |
-            +=======+==================+===========================+
-            | 0     | Ethernet Adapter |  Local Area Connection    |
-            +-------+------------------+---------------------------+
-            | 1     | Wi-Fi Adapter    |  Wireless Area Connection |
-            +-------+------------------+---------------------------+
+            +-------+------------------+--------------------------+
+            | Index |       Name       |      Connection ID       |
+            +=======+==================+==========================+
+            | 0     | Ethernet Adapter | Local Area Connection    |
+            +-------+------------------+--------------------------+
+            | 1     | Wi-Fi Adapter    | Wireless Area Connection |
+            +-------+------------------+--------------------------+
+            | 2     | WAN Miniport     |                          |
+            +-------+------------------+--------------------------+
 
             """))
 
+    @patch('subprocess.check_output', side_effect=_mock_check_output)
+    def test_dump_formats(self, mocked_check_output):
+        """Test dump method of NetworkAdapters with other columns, formats and pages."""
+        stream = StringIO()
+        self.test_adapters.dump(stream, columns=['index', 'net_connection_status'], output_format='csv')
+        self.assertEqual(stream.getvalue(), 'index,net_connection_status\n0,CONNECTED\n1,MEDIA_DISCONNECTED\n2,\n')
+        stream = StringIO()
+        self.test_adapters.dump(stream, columns=['index', 'mac_address'], output_format='ndjson')
+        self.assertEqual(stream.getvalue().splitlines()[1], '{"index": 1, "mac_address": "11:11:11:11:11:11"}')
+        stream = StringIO()
+        self.test_adapters.dump(stream, columns=['index'], page_size=2)
+        self.assertEqual(stream.getvalue().count('Index'), 2)
+        with self.assertRaises(ValueError):
+            self.test_adapters.dump(stream, columns=['_ip_address_raw'])
+        with self.assertRaises(ValueError):
+            self.test_adapters.dump(stream, output_format='xml')
+        mocked_check_output.assert_not_called()
+
+    def test_dump_on_class(self):
+        """Test dump method called on the NetworkAdapters class (a static method in earlier releases)."""
+        previous_backend = _backends.default_backend
+        _backends.set_default_backend(_fake_backend())
+        try:
+            stream = StringIO()
+            _network_adapters.NetworkAdapters.dump(stream, output_format='csv')
+        finally:
+            _backends.set_default_backend(previous_backend)
+        self.assertEqual(stream.getvalue().splitlines(), ['index,name,net_connection_id',
+                                                          '0,Ethernet Adapter,Local Area Connection',
+                                                          '1,Wi-Fi Adapter,Wireless Area Connection'])
+
+    def test_iter_rows_refresh(self):
+        """Test iter_rows method of NetworkAdapters streaming rows from one new query."""
+        backend = _fake_backend()
+        test_adapters = _network_adapters.NetworkAdapters(backend=backend)
+        rows = test_adapters.iter_rows(['index', 'name', 'speed'], refresh=True)
+        self.assertEqual(list(rows), [(0, 'Ethernet Adapter', 1000000000), (1, 'Wi-Fi Adapter', None)])
+        self.assertEqual(backend.calls[-1], ('query', 'win32_networkadapter', ('Index', 'Name', 'Speed'), None))
+
+    def test_query(self):
+        """Test query method of NetworkAdapters filtering inside WMI with one query."""
+        backend = _fake_backend()
+        backend.instances['win32_networkadapter'].append(
+            {'Index': '2', 'Name': "O'Brien Adapter", 'NetConnectionStatus': '2', 'PhysicalAdapter': 'FALSE'})
+        nics = _network_adapters.NetworkAdapters.query(
+            physical_adapter=True, net_connection_status=[NicNetConnectionStatus.CONNECTED, NicNetConnectionStatus(0)],
+            columns=['index', 'name', 'speed'], backend=backend)
+        self.assertEqual([nic.index for nic in nics], [0])
+        self.assertEqual((nics[0].name, nics[0].speed), ('Ethernet Adapter', 1000000000))
+        self.assertEqual(backend.calls, [('query', 'win32_networkadapter', ('Index', 'Name', 'Speed'),
+                                          'PhysicalAdapter=TRUE AND (NetConnectionStatus=2 OR NetConnectionStatus=0)')])
+        query = _network_adapters.NetworkAdapters.query
+        self.assertEqual([nic.index for nic in query(name="o'brien*", backend=backend)], [2])
+        self.assertEqual(backend.calls[-1][3], "Name LIKE 'o\\'brien%'")
+        self.assertEqual([nic.index for nic in query(speed=None, backend=backend)], [1, 2])
+        self.assertEqual(len(query(backend=backend)), 3)
+        with self.assertRaises(TypeError):
+            query(ip_address_raw='192.168.0.2', backend=backend)
+        with self.assertRaises(TypeError):
+            query(speed=1.5, backend=backend)
+
+    @patch('subprocess.check_output', side_effect=_mock_check_output)
+    def test_get_nic(self, mocked_check_output):
+        """Test get_nic method of NetworkAdapters."""
+        self.assertEqual(self.test_adapters.get_nic(index=1).index, 1)
+        self.assertEqual(self.test_adapters.get_nic(name='Wi-Fi Adapter').index, 1)
+        self.assertEqual(self.test_adapters.get_nic(connection_id='Local Area Connection').index, 0)
+        self.assertEqual(self.test_adapters.get_nic(guid='{11111111-1111-1111-1111-111111111111}').index, 1)
+        self.assertEqual(self.test_adapters.get_nic(mac_address='00:00:00:00:00:00').index, 0)
+        self.assertEqual(self.test_adapters.get_nic(index=0, name='Wi-Fi Adapter').index, 0)
+        self.assertEqual(self.test_adapters.get_nic(name='wi-fi adapter').index, 1)
+        self.assertEqual(self.test_adapters.get_nic(mac_address='11-11-11-11-11-11').index, 1)
+        self.assertEqual(self.test_adapters.get_nic(interface_index=13).index, 2)
+        self.assertEqual(self.test_adapters.get_nic(pnp_device_id='PCI\\WIFI').index, 1)
+        with self.assertRaises(KeyError):
+            self.test_adapters.get_nic(name='Missing Adapter')
+        with self.assertRaises(NameError):
+            self.test_adapters.get_nic()
+
+    @patch('subprocess.check_output', side_effect=_mock_check_output)
+    def test_get_nics(self, mocked_check_output):
+        """Test get_nics method of NetworkAdapters."""
+        def indexes(**criteria):
+            return [nic.index for nic in self.test_adapters.get_nics(**criteria)]
+
+        self.assertEqual(indexes(), [0, 1, 2])
+        self.assertEqual(indexes(name='WAN*'), [2])
+        self.assertEqual(indexes(name='*adapter'), [0, 1])
+        self.assertEqual(indexes(connection_id='*Area Connection', pnp_device_id='pci\\e*'), [0])
+        self.assertEqual(indexes(mac_address='11111111111?'), [1])
+        self.assertEqual(indexes(name='W[!A]*'), [1])
+        self.assertEqual(indexes(index=0, name='Wi-Fi*'), [])
+        self.assertEqual(indexes(connection_id='Missing*'), [])
+        self.assertEqual(self.test_adapters.get_nics(interface_index=11)[0].name, 'Ethernet Adapter')
+        with self.assertRaises(TypeError):
+            self.test_adapters.get_nics(speed=0)
+
+    @patch('subprocess.check_output', side_effect=_mock_check_output)
+    def test_get_nic_served_from_table(self, mocked_check_output):
+        """Test that NICs returned by get_nic read attributes from the enumerated table."""
+        wifi_nic = self.test_adapters.get_nic(connection_id='Wireless Area Connection')
+        self.assertEqual(wifi_nic.net_connection_status, NicNetConnectionStatus(7))
+        self.assertEqual(wifi_nic.interface_index, 12)
+        self.assertEqual(wifi_nic.mac_address, '11:11:11:11:11:11')
+        with self.assertRaises(AttributeError):
+            wifi_nic.speed  # pylint: disable=pointless-statement
+        mocked_check_output.assert_not_called()
+
+    def test_get_nic_table_expiry(self):
+        """Test that values cached from the NIC table expire counting from the enumeration."""
+        backend = _fake_backend()
+        test_adapters = _network_adapters.NetworkAdapters(backend=backend)
+        backend.instances['win32_networkadapter'][0].update(NetConnectionStatus='7', NetConnectionID='LAN')
+        with patch('time.monotonic', return_value=time.monotonic() + 61):
+            test_nic = test_adapters.get_nic(index=0)
+            self.assertEqual(test_nic.net_connection_status, NicNetConnectionStatus(7))
+            test_nic.use_dhcp()
+        self.assertEqual(backend.calls[-1], ('run_netsh', 'set address name="LAN" source=dhcp'))
+
     @patch('subprocess.check_output', side_effect=_mock_check_output)
     def test_nic_name_map(self, mocked_check_output):
         """Test nic_name_map attribute of NetworkAdapters."""
         self.assertEqual(str(sorted(self.test_adapters.nic_name_map,
                                     key=self.test_adapters.nic_name_map.get)),
-                         Baseline("""['Ethernet Adapter', 'Wi-Fi Adapter']"""))
+                         Baseline("""['Ethernet Adapter', 'Wi-Fi Adapter', 'WAN Miniport']"""))
+
+    @patch('subprocess.check_output', side_effect=_mock_check_output)
+    def test_nic_table(self, mocked_check_output):
+        """Test nic_table attribute of NetworkAdapters."""
+        self.assertEqual(sorted(self.test_adapters.nic_table), [0, 1, 2])
+        self.assertEqual(self.test_adapters.nic_table[0].ip_addresses, ['192.168.0.2', '0:0:0:0:0:0:0:1'])
+        self.assertIsNone(self.test_adapters.nic_table[2].adapter_type)
+        self.assertEqual(sorted(self.test_adapters.nic_mac_address_map.values()), [0, 1])
 
     @patch('subprocess.check_output', side_effect=_mock_check_output)
     def test_nic_connection_id_map(self, mocked_check_output):
@@ -1,12 +1,13 @@
 """Module containing NIC class unit tests."""
 
+import subprocess
 import textwrap
 from unittest import TestCase
 from unittest.mock import patch
 
 from baseline import Baseline
 
-from win_nic import Nic
+from win_nic import Nic, NoCache, WmicProperty
 from win_nic.enums.nic_adapter_type import NicAdapterType
 from win_nic.enums.nic_availability import NicAvailability
 from win_nic.enums.nic_net_connection_status import NicNetConnectionStatus
@@ -55,6 +56,25 @@ class TestNic(TestCase):
         }
         return bytes(wmic_responses[command], 'utf-8')
 
+    # pylint: disable=no-self-argument, line-too-long
+    def _mock_check_output_value(args):
+        command = ' '.join(args)
+        win32_networkadapter_values = [
+            ('Index', '0'), ('AdapterTypeID', '0'), ('Availability', '3'), ('Caption', '[00000000] Dummy Adapter'), ('ConfigManagerErrorCode', '0'),
+            ('ConfigManagerUserConfig', 'FALSE'), ('Description', 'Dummy Adapter'), ('DeviceID', '0'), ('ErrorCleared', 'TRUE'), ('ErrorDescription', ''),
+            ('GUID', '{ABCDEFGH-IJKL-MNOP-QRST-UVWXYZ01234}'), ('Installed', 'TRUE'), ('InterfaceIndex', '1'), ('LastErrorCode', ''),
+            ('MACAddress', '00:00:00:00:00:00'), ('Manufacturer', 'Acme Corporation'), ('Name', 'Acme 1234 Gigabit Network Connection'),
+            ('NetConnectionID', 'Local Area Connection 0'), ('NetConnectionStatus', '2'), ('PhysicalAdapter', 'TRUE'), ('PNPDeviceID', 'PCI\\DUMMY_STUFF\\0123456789'),
+            ('PowerManagementSupported', 'TRUE'), ('ProductName', 'Dummy Adapter'), ('ServiceName', 'dummyservice'), ('Speed', '1000000000'),
+        ]
+        wmic_responses = {
+            'wmic path win32_networkadapter where index=0 get ' + ','.join(name for name, _ in win32_networkadapter_values) + ' /value': (
+                '\r\r\n\r\r\n' + ''.join(f'{name}={value}\r\r\n' for name, value in win32_networkadapter_values) + '\r\r\n\r\r\n'),
+            'wmic path win32_networkadapterconfiguration where index=0 get Index,IPAddress /value': (
+                '\r\r\n\r\r\nIndex=0\r\r\nIPAddress={"192.168.0.2","0:0:0:0:0:0:0:1"}\r\r\n\r\r\n\r\r\n'),
+        }
+        return bytes(wmic_responses[command], 'utf-8')
+
     # pylint: disable=no-self-argument, line-too-long
     def _mock_null_atr(args):
         command = ' '.join(args)
@@ -70,11 +90,11 @@ class TestNic(TestCase):
     def _mock_call(args, stdout):
         netsh_base_cmd = 'netsh interface ipv4 '
         netsh_responses = {
-            netsh_base_cmd + 'add dnsserver name="Local Area Connection 0" 8.8.8.8': '0',
-            netsh_base_cmd + 'set address name="Local Area Connection 0" source=dhcp': '0',
-            netsh_base_cmd + 'set address name="Local Area Connection 0" static 192.168.0.2 255.255.255.0 192.168.0.1': '0',
+            netsh_base_cmd + 'add dnsserver "name=Local Area Connection 0" 8.8.8.8': '0',
+            netsh_base_cmd + 'set address "name=Local Area Connection 0" source=dhcp': '0',
+            netsh_base_cmd + 'set address "name=Local Area Connection 0" static 192.168.0.2 255.255.255.0 192.168.0.1': '0',
         }
-        return bytes(netsh_responses[args], 'utf-8')
+        return bytes(netsh_responses[subprocess.list2cmdline(args)], 'utf-8')
 
     @patch('subprocess.check_output', side_effect=_mock_check_output)
     def setUp(self, mocked_check_output):  # pylint: disable=arguments-differ
@@ -97,6 +117,33 @@ class TestNic(TestCase):
         """Test availability property of the Nic class."""
         self.assertEqual(self.test_nic.availability, NicAvailability(3))
 
+    @patch('subprocess.check_output', side_effect=_mock_check_output)
+    def test_cache(self, mocked_check_output):
+        """Test attribute caching of the Nic class."""
+        self.assertEqual(self.test_nic.guid, self.test_nic.guid)
+        self.assertEqual(mocked_check_output.call_count, 1)
+        uncached_nic = Nic(index=0, cache_ttls={'guid': 0})
+        self.assertEqual(uncached_nic.guid, uncached_nic.guid)
+        self.assertEqual(mocked_check_output.call_count, 3)
+
+    @patch('subprocess.check_output', side_effect=_mock_check_output)
+    def test_cache_invalidation(self, mocked_check_output):
+        """Test attribute cache invalidation of the Nic class."""
+        self.test_nic.net_connection_status  # pylint: disable=pointless-statement
+        self.test_nic.guid  # pylint: disable=pointless-statement
+        self.test_nic.enable()
+        self.test_nic.net_connection_status  # pylint: disable=pointless-statement
+        self.test_nic.guid  # pylint: disable=pointless-statement
+        self.assertEqual(mocked_check_output.call_count, 4)
+        self.test_nic.invalidate('guid')
+        self.test_nic.guid  # pylint: disable=pointless-statement
+        self.assertEqual(mocked_check_output.call_count, 5)
+        self.test_nic.refresh('guid', 'speed')
+        self.assertEqual(mocked_check_output.call_count, 7)
+        self.test_nic.invalidate()
+        self.test_nic.speed  # pylint: disable=pointless-statement
+        self.assertEqual(mocked_check_output.call_count, 8)
+
     @patch('subprocess.check_output', side_effect=_mock_check_output)
     def test_caption(self, mocked_check_output):
         """Test caption property of the Nic class."""
@@ -122,8 +169,8 @@ class TestNic(TestCase):
         'device_id', 'error_cleared', 'error_description', 'guid', 'index', 'installed',
         'interface_index', 'last_error_code', 'mac_address', 'manufacturer', 'name',
         'net_connection_id', 'net_connection_status', 'physical_adapter',
-        'pnp_device_id', 'power_management_supported', 'product_name', 'service_name',
-        'speed']
+        'pnp_device_id', 'policy', 'power_management_supported', 'product_name',
+        'service_name', 'speed']
         """)
 
     def test_dunder_repr(self):
@@ -142,6 +189,35 @@ class TestNic(TestCase):
         self.assertEqual(self.test_nic.description,
                          Baseline("""Dummy Adapter"""))
 
+    def test_descriptors(self):
+        """Test the property descriptors of the Nic class."""
+        self.assertIsInstance(Nic.speed, WmicProperty)
+        self.assertEqual((Nic.speed.windows_name, Nic.speed.windows_class, Nic.speed.python_type),
+                         ('Speed', 'win32_networkadapter', int))
+        self.assertEqual(repr(Nic.net_connection_status), Baseline(
+            """<WmicProperty net_connection_status (win32_networkadapter.NetConnectionStatus, NicNetConnectionStatus)>"""))
+        self.assertIs(Nic.net_connection_status.converter('2'), NicNetConnectionStatus.CONNECTED)
+        self.assertIs(Nic.physical_adapter.converter('FALSE'), False)
+        self.assertEqual({name: (prop.windows_name, prop.windows_class, prop.python_type)
+                          for name, prop in vars(Nic).items() if isinstance(prop, WmicProperty)
+                          and name in Nic._wmic_properties},  # pylint: disable=protected-access
+                         Nic._wmic_properties)  # pylint: disable=protected-access
+        with self.assertRaisesRegex(AttributeError, "'Nic' object has no attribute 'bogus'"):
+            self.test_nic.bogus  # pylint: disable=pointless-statement,no-member
+
+        fetched = []
+
+        class UncachedNic(Nic):
+
+            """NIC fetching its speed on every access."""
+
+            speed = WmicProperty('speed', 'Speed', 'win32_networkadapter', int,
+                                 fetch=lambda nic, prop: fetched.append(prop.name) or 100, cache=NoCache())
+
+        uncached_nic = UncachedNic(0)
+        self.assertEqual([uncached_nic.speed, uncached_nic.speed], [100, 100])
+        self.assertEqual(fetched, ['speed', 'speed'])
+
     @patch('subprocess.check_output', side_effect=_mock_check_output)
     def test_device_id(self, mocked_check_output):
         """Test device_id property of the Nic class."""
@@ -239,6 +315,16 @@ class TestNic(TestCase):
         self.assertEqual(str(self.test_nic.ip_addresses),
                          Baseline("""['192.168.0.2', '0:0:0:0:0:0:0:1']"""))
 
+    @patch('subprocess.check_output', side_effect=_mock_check_output_value)
+    def test_prefetch(self, mocked_check_output):
+        """Test prefetch mode of the Nic class."""
+        prefetched_nic = Nic(index=0, prefetch=True)
+        self.assertEqual(prefetched_nic.net_connection_status, NicNetConnectionStatus(2))
+        self.assertEqual(prefetched_nic.ip_addresses, ['192.168.0.2', '0:0:0:0:0:0:0:1'])
+        with self.assertRaises(AttributeError):
+            prefetched_nic.error_description  # pylint: disable=pointless-statement
+        self.assertEqual(mocked_check_output.call_count, 2)
+
     @patch('subprocess.check_output', side_effect=_mock_check_output)
     def test_pnp_device_id(self, mocked_check_output):
         """Test pnp_device_id property of the Nic class."""
@@ -269,6 +355,21 @@ class TestNic(TestCase):
         self.assertEqual(self.test_nic.service_name,
                          Baseline("""dummyservice"""))
 
+    @patch('subprocess.check_output', side_effect=_mock_check_output_value)
+    def test_snapshot(self, mocked_check_output):
+        """Test snapshot method of the Nic class."""
+        snapshot = self.test_nic.snapshot()
+        self.assertEqual(mocked_check_output.call_count, 2)
+        self.assertEqual(snapshot.adapter_type, NicAdapterType(0))
+        self.assertEqual(snapshot.availability, NicAvailability(3))
+        self.assertIs(snapshot.config_manager_user_config, False)
+        self.assertIsNone(snapshot.error_description)
+        self.assertEqual(snapshot.speed, 1000000000)
+        self.assertEqual(snapshot.pnp_device_id, Baseline("""PCI\\DUMMY_STUFF\\0123456789"""))
+        self.assertEqual(str(snapshot.ip_addresses), Baseline("""['192.168.0.2', '0:0:0:0:0:0:0:1']"""))
+        with self.assertRaises(AttributeError):
+            snapshot.speed = 0
+
     @patch('subprocess.check_output', side_effect=_mock_check_output)
     def test_speed(self, mocked_check_output):
         """Test speed property of the Nic class."""
@@ -0,0 +1,53 @@
+"""Module containing NicTable class unit tests."""
+
+from unittest import TestCase
+
+from win_nic import NetworkAdapters, NicTable
+from win_nic.enums.nic_net_connection_status import NicNetConnectionStatus
+from win_nic._nic import _build_snapshots
+from win_nic.tests.test_backends import _fake_backend
+
+
+class TestNicTable(TestCase):
+
+    """Execute NicTable class unit tests."""
+
+    def setUp(self):
+        """Instantiate a table of the NICs of two hosts."""
+        self.snapshots = list(NetworkAdapters(backend=_fake_backend()).nic_table.values())
+        self.test_table = NicTable(self.snapshots * 2)
+
+    def test_rows(self):
+        """Test row and column access of NicTable."""
+        self.assertEqual(len(self.test_table), 4)
+        self.assertEqual(list(self.test_table), self.snapshots * 2)
+        self.assertEqual(self.test_table[1], self.snapshots[1])
+        self.assertEqual(self.test_table.column('index'), (0, 1, 0, 1))
+        self.assertEqual(len(NicTable()), 0)
+        self.assertEqual(list(NicTable()), [])
+
+    def test_where(self):
+        """Test filters of NicTable."""
+        connected = self.test_table.where(physical_adapter=True,
+                                          net_connection_status=NicNetConnectionStatus.CONNECTED)
+        self.assertEqual(connected.column('name'), ('Ethernet Adapter', 'Ethernet Adapter'))
+        self.assertEqual(connected.where(index=1).column('name'), ())
+        physical = self.test_table.where(physical_adapter=True)
+        self.assertEqual(list(physical.where(index=1)), [self.snapshots[1]] * 2)
+        self.assertEqual(physical.where(index=0)[1], self.snapshots[0])
+        self.assertEqual(self.test_table.where(speed=lambda speed: speed is None).column('index'), (1, 1))
+        self.assertEqual(self.test_table.count(physical_adapter=True), 4)
+        self.assertEqual(self.test_table.count(name='Missing Adapter'), 0)
+        self.assertEqual(NicTable().count(index=0), 0)
+        with self.assertRaises(AttributeError):
+            self.test_table.where(missing_field=0)
+
+    def test_interned_strings(self):
+        """Test that snapshots of different enumerations share repeated strings."""
+        def build_snapshot():
+            record = {'Index': 0, 'Name': ''.join(['Ethernet', ' Adapter']), 'IPAddress': (''.join(['fe80', '::1']),)}
+            return _build_snapshots([('win32_networkadapter', [record])])[0]
+
+        first_snapshot, second_snapshot = build_snapshot(), build_snapshot()
+        self.assertIs(first_snapshot.name, second_snapshot.name)
+        self.assertIs(first_snapshot.ip_address_raw[0], second_snapshot.ip_address_raw[0])
@@ -0,0 +1,132 @@
+"""Module containing execution policy unit tests."""
+
+import subprocess
+import tempfile
+import time
+from unittest import TestCase
+from unittest.mock import patch
+
+from win_nic import CircuitOpenError, ExecutionPolicy, NetworkAdapters, Nic, SnapshotCache, set_default_policy
+
+from .fake_executables import FakeExecutables
+
+
+_NAME_COMMAND = ['wmic', 'path', 'win32_networkadapter', 'where', 'index=0', 'get', 'Name']
+_ROWS_COMMAND = ['wmic', 'path', 'win32_networkadapter', 'get', 'Index,Name', '/value']
+
+
+def _failing_check_output(*return_codes):
+    """Get a check_output side effect failing with the given exit codes before answering."""
+    remaining = list(return_codes)
+
+    def check_output(args):
+        if remaining:
+            raise subprocess.CalledProcessError(remaining.pop(0), args)
+        return b'Name\r\r\nEthernet Adapter\r\r\n'
+    return check_output
+
+
+class TestPolicy(TestCase):
+
+    """Execute execution policy unit tests."""
+
+    def test_retry_transient_error(self):
+        """Test retrying a WMIC invocation failing with a transient WMI error."""
+        policy = ExecutionPolicy(retries=2, retry_delay=0.0)
+        with patch('subprocess.check_output', side_effect=_failing_check_output(0x80041013)) as mocked:
+            self.assertEqual(Nic(0, policy=policy).name, 'Ethernet Adapter')
+        self.assertEqual(mocked.call_count, 2)
+        self.assertEqual(policy.metrics, {'calls': 1, 'attempts': 2, 'retries': 1})
+
+    def test_no_retry_permanent_error(self):
+        """Test giving up on a WMIC invocation failing with a permanent error."""
+        policy = ExecutionPolicy(retries=2, retry_delay=0.0)
+        with patch('subprocess.check_output', side_effect=_failing_check_output(0x80041002)) as mocked:
+            with self.assertRaises(subprocess.CalledProcessError):
+                Nic(0, policy=policy).name  # pylint: disable=expression-not-assigned
+        self.assertEqual(mocked.call_count, 1)
+        self.assertEqual(policy.metrics['failures'], 1)
+
+    def test_circuit_breaker(self):
+        """Test rejecting invocations after repeated failures until the reset timeout passes."""
+        policy = ExecutionPolicy(failure_threshold=2, reset_timeout=0.1)
+        test_nic = Nic(0, policy=policy, cache_ttls={'name': 0})
+        with patch('subprocess.check_output', side_effect=_failing_check_output(1, 1)) as mocked:
+            for _ in range(2):
+                with self.assertRaises(subprocess.CalledProcessError):
+                    test_nic.name  # pylint: disable=pointless-statement
+            self.assertTrue(policy.circuit_open)
+            with self.assertRaises(CircuitOpenError):
+                test_nic.name  # pylint: disable=pointless-statement
+            self.assertEqual(mocked.call_count, 2)
+            time.sleep(0.1)
+            self.assertEqual(test_nic.name, 'Ethernet Adapter')
+        self.assertFalse(policy.circuit_open)
+        self.assertEqual(policy.metrics['rejected'], 1)
+        self.assertEqual(policy.metrics['circuit_opened'], 1)
+
+    def test_timeout(self):
+        """Test killing a hung WMIC process and retrying until the deadline."""
+        policy = ExecutionPolicy(timeout=0.3, deadline=1.0, retries=5, retry_delay=0.05)
+        with FakeExecutables({' '.join(_NAME_COMMAND): 'Name\nEthernet Adapter\n'}, delay=10.0):
+            start = time.monotonic()
+            with self.assertRaises(subprocess.TimeoutExpired):
+                Nic(0, policy=policy).name  # pylint: disable=expression-not-assigned
+            self.assertLess(time.monotonic() - start, 2.0)
+        self.assertGreaterEqual(policy.metrics['timeouts'], 2)
+        self.assertEqual(policy.metrics['retries'], policy.metrics['attempts'] - 1)
+
+    def test_timeout_success(self):
+        """Test answering a WMIC invocation within the timeout."""
+        policy = ExecutionPolicy(timeout=10.0)
+        with FakeExecutables({' '.join(_NAME_COMMAND): 'Name\nEthernet Adapter\n'}):
+            self.assertEqual(Nic(0, policy=policy).name, 'Ethernet Adapter')
+
+    def test_default_policy(self):
+        """Test the default policy applying to network adapters without their own policy."""
+        policy = ExecutionPolicy()
+        set_default_policy(policy)
+        try:
+            with patch('subprocess.check_output', return_value=b'\r\r\nIndex=0\r\r\n'):
+                test_adapters = NetworkAdapters()
+        finally:
+            set_default_policy(None)
+        self.assertEqual(policy.metrics['calls'], 2)
+        self.assertIs(test_adapters.get_nic(index=0).policy, None)
+
+    def test_nic_policy_inherited(self):
+        """Test NICs returned by network adapters running under the adapters' policy."""
+        policy = ExecutionPolicy()
+        with patch('subprocess.check_output', return_value=b'\r\r\nIndex=0\r\r\n'):
+            test_adapters = NetworkAdapters(policy=policy)
+        self.assertIs(test_adapters.get_nic(index=0).policy, policy)
+        self.assertEqual(policy.metrics['calls'], 2)
+
+    def test_adapters_policy(self):
+        """Test watch, iter_rows and cache validation running under the adapters' policy."""
+        policy, default_policy = ExecutionPolicy(), ExecutionPolicy()
+        set_default_policy(default_policy)
+        try:
+            with patch('subprocess.check_output', return_value=b'\r\r\nIndex=0\r\r\n'):
+                test_adapters = NetworkAdapters(policy=policy, cache=SnapshotCache(tempfile.mkdtemp()))
+                self.assertEqual(list(test_adapters.watch(interval=0.0, max_polls=2)), [])
+                NetworkAdapters(policy=policy, cache=test_adapters.cache)
+        finally:
+            set_default_policy(None)
+        self.assertEqual(policy.metrics['calls'], 7)
+        self.assertEqual(default_policy.metrics['calls'], 0)
+
+    def test_iter_rows_policy(self):
+        """Test streamed WMIC queries going through admission, failure counting and the circuit breaker."""
+        policy = ExecutionPolicy(failure_threshold=1)
+        with patch('subprocess.check_output', return_value=b'\r\r\nIndex=0\r\r\n'):
+            test_adapters = NetworkAdapters(policy=policy)
+        with FakeExecutables({' '.join(_ROWS_COMMAND): '\r\r\nIndex=0\r\r\nName=Ethernet Adapter\r\r\n'}):
+            self.assertEqual(list(test_adapters.iter_rows(['index', 'name'], refresh=True)), [(0, 'Ethernet Adapter')])
+        self.assertEqual(policy.metrics['calls'], 3)
+        with FakeExecutables({}):
+            with self.assertRaises(subprocess.CalledProcessError):
+                list(test_adapters.iter_rows(['index', 'name'], refresh=True))
+        self.assertEqual(policy.metrics['failures'], 1)
+        with self.assertRaises(CircuitOpenError):
+            list(test_adapters.iter_rows(['index', 'name'], refresh=True))
@@ -0,0 +1,100 @@
+"""Module containing instrumentation and profiling unit tests."""
+
+import asyncio
+import math
+import subprocess
+from unittest import TestCase
+from unittest.mock import patch
+
+from win_nic import AsyncNic, ExecutionPolicy, NetworkAdapters, Nic, add_hook, profile, remove_hook
+from win_nic._profiling import call_site, current_call_site, current_policy
+from win_nic.tests.test_backends import _fake_backend
+
+
+# pylint: disable=unused-argument
+class TestProfiling(TestCase):
+
+    """Execute instrumentation and profiling unit tests."""
+
+    def test_profile(self):
+        """Test call sites and counters collected by the profile context manager."""
+        backend = _fake_backend()
+        with profile() as profiler:
+            test_nic = NetworkAdapters(backend=backend).get_nic(index=1)
+            test_nic.disable()
+            test_nic.add_dns_server('8.8.8.8')
+            test_nic.net_connection_status  # pylint: disable=pointless-statement
+        Nic(0, backend=backend).name  # pylint: disable=expression-not-assigned
+
+        self.assertEqual([(event.kind, event.call_site) for event in profiler.events],
+                         [('wmic', 'NetworkAdapters.refresh'), ('wmic', 'NetworkAdapters.refresh'),
+                          ('wmic', 'Nic.disable'), ('netsh', 'Nic.add_dns_server'),
+                          ('wmic', 'Nic.net_connection_status')])
+        self.assertEqual(profiler.counters, {'wmic': 4, 'netsh': 1})
+        self.assertEqual(sum(profiler.histogram((0.5,)).values()), 5)
+        self.assertEqual(list(profiler.histogram((0.5,))), [0.5, math.inf])
+        self.assertEqual([row[:2] for row in sorted(profiler.call_sites())],
+                         [('NetworkAdapters.refresh', 2), ('Nic.add_dns_server', 1), ('Nic.disable', 1),
+                          ('Nic.net_connection_status', 1)])
+        self.assertIn('NetworkAdapters.refresh', profiler.report())
+
+    @patch('subprocess.call', return_value=1)
+    @patch('subprocess.check_output', side_effect=[b'Name\nDummy Adapter',
+                                                   subprocess.CalledProcessError(44135, 'wmic')])
+    def test_hooks(self, mock_check_output, mock_call):
+        """Test the exit codes and output sizes of WMIC and netsh invocations passed to hooks."""
+        events = []
+        add_hook(events.append)
+        try:
+            test_nic = Nic(0)
+            self.assertEqual(test_nic.name, 'Dummy Adapter')
+            with self.assertRaises(subprocess.CalledProcessError):
+                test_nic.disable()
+            object.__setattr__(test_nic, '_cache', {'net_connection_id': ('Ethernet', math.inf)})
+            self.assertEqual(test_nic.use_dhcp(), 1)
+        finally:
+            remove_hook(events.append)
+
+        self.assertEqual([(event.call_site, event.exit_code, event.output_size) for event in events],
+                         [('Nic.name', 0, 18), ('Nic.disable', 44135, None), ('Nic.use_dhcp', 1, None)])
+        self.assertEqual(events[0].args, ('wmic', 'path', 'win32_networkadapter', 'where', 'index=0', 'get', 'Name'))
+        self.assertEqual(events[2].args[-4:], ('set', 'address', 'name=Ethernet', 'source=dhcp'))
+
+    def test_task_isolation(self):
+        """Test that concurrent asyncio tasks see the call sites and policies they were entered with."""
+        policies = [ExecutionPolicy(), ExecutionPolicy()]
+        seen = []
+
+        async def task(name, policy):
+            with call_site(name, policy):
+                await asyncio.sleep(0)
+                await asyncio.sleep(0)
+                seen.append((current_call_site(), current_policy()))
+
+        async def run_tasks():
+            await asyncio.gather(task('first', policies[0]), task('second', policies[1]))
+
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(run_tasks())
+        finally:
+            loop.close()
+        self.assertEqual(sorted(seen, key=lambda entry: entry[0]), [('first', policies[0]), ('second', policies[1])])
+        self.assertIsNone(current_call_site())
+
+    def test_async_nic_policy(self):
+        """Test that AsyncNic invocations run under the NIC's execution policy."""
+        policy = ExecutionPolicy()
+        seen = []
+
+        async def run_wmic_command_async(wmic_args, semaphore=None):
+            seen.append((current_call_site(), current_policy()))
+            return ['1000']
+
+        loop = asyncio.new_event_loop()
+        try:
+            with patch('win_nic._async_nic.run_wmic_command_async', run_wmic_command_async):
+                self.assertEqual(loop.run_until_complete(AsyncNic(0, policy=policy).speed), 1000)
+        finally:
+            loop.close()
+        self.assertEqual(seen, [('AsyncNic.speed', policy)])
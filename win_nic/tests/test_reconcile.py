@@ -0,0 +1,71 @@
+"""Module containing desired-state reconciliation unit tests."""
+
+from unittest import TestCase
+
+from win_nic import NetworkAdapters
+from win_nic.tests.test_backends import _fake_backend
+
+
+def _spec():
+    return {
+        'Local Area Connection': {'address': '192.168.0.10/24', 'gateway': '192.168.0.1',
+                                  'dns_servers': ['192.168.0.1', '8.8.8.8']},
+        'wireless area connection': {'enabled': False, 'dhcp': True},
+    }
+
+
+class TestReconcile(TestCase):
+
+    """Execute desired-state reconciliation unit tests."""
+
+    def test_reconcile(self):
+        """Test reconcile method of NetworkAdapters converging and then changing nothing."""
+        backend = _fake_backend()
+        test_adapters = NetworkAdapters(backend=backend)
+        enumeration_calls = len(backend.calls)
+
+        plan = test_adapters.reconcile(_spec(), dry_run=True)
+        self.assertEqual([(action.key, action.operation, action.args) for action in plan.actions], [
+            ('Local Area Connection', 'set_static_address', ('192.168.0.10', '255.255.255.0', '192.168.0.1')),
+            ('Local Area Connection', 'set_dns_servers', ('192.168.0.1', '8.8.8.8')),
+            ('wireless area connection', 'use_dhcp', ()),
+            ('wireless area connection', 'disable', ()),
+        ])
+        self.assertIsNone(plan.results)
+        self.assertEqual(plan.plan().splitlines()[0], "Local Area Connection: set_static_address('192.168.0.10', "
+                                                      "'255.255.255.0', '192.168.0.1')  # DHCP is enabled")
+        self.assertEqual([call[0] for call in backend.calls[enumeration_calls:]], ['query', 'query'])
+
+        result = test_adapters.reconcile(_spec())
+        self.assertTrue(result.changed)
+        self.assertTrue(result.succeeded)
+        self.assertEqual(len(result.results), 4)
+
+        calls = len(backend.calls)
+        result = test_adapters.reconcile(_spec())
+        self.assertFalse(result.changed)
+        self.assertEqual(result.results, [])
+        self.assertEqual([call[0] for call in backend.calls[calls:]], ['query', 'query'])
+
+    def test_reconcile_dns_servers(self):
+        """Test reconcile method of NetworkAdapters appending missing DNS servers."""
+        backend = _fake_backend()
+        backend.instances['win32_networkadapterconfiguration'][0]['DNSServerSearchOrder'] = ('192.168.0.1',)
+        test_adapters = NetworkAdapters(backend=backend)
+        calls = len(backend.calls)
+        result = test_adapters.reconcile({'Local Area Connection': {'dns_servers': ['192.168.0.1', '8.8.8.8']}})
+        self.assertEqual([(action.operation, action.args) for action in result.actions],
+                         [('add_dns_server', ('8.8.8.8',))])
+        self.assertEqual([call[0] for call in backend.calls[calls:]], ['query', 'run_netsh'])
+        self.assertFalse(test_adapters.reconcile({'Local Area Connection': {'dns_servers': ['192.168.0.1',
+                                                                                            '8.8.8.8']}}).changed)
+
+    def test_reconcile_errors(self):
+        """Test reconcile method of NetworkAdapters rejecting invalid specifications."""
+        test_adapters = NetworkAdapters(backend=_fake_backend())
+        with self.assertRaises(KeyError):
+            test_adapters.reconcile({'Bluetooth Connection': {'enabled': True}})
+        with self.assertRaises(TypeError):
+            test_adapters.reconcile({'Local Area Connection': {'speed': 100}})
+        with self.assertRaises(ValueError):
+            test_adapters.reconcile({'Local Area Connection': {'dhcp': True, 'address': '192.168.0.10/24'}})
@@ -0,0 +1,75 @@
+"""Module containing NIC change watch unit tests."""
+
+from unittest import TestCase
+from unittest.mock import patch
+
+from win_nic import AsyncNetworkAdapters, NetworkAdapters
+from win_nic.enums.nic_net_connection_status import NicNetConnectionStatus
+from win_nic._nic import _query_snapshots
+from win_nic.tests.test_async_nic import _run
+from win_nic.tests.test_backends import _fake_backend
+
+
+class TestWatch(TestCase):
+
+    """Execute NIC change watch unit tests."""
+
+    def test_watch(self):
+        """Test the change events and poll intervals of the watch method."""
+        backend = _fake_backend()
+        adapters = backend.instances['win32_networkadapter']
+        test_adapters = NetworkAdapters(backend=backend)
+
+        def link_up():
+            adapters[1]['NetConnectionStatus'] = '2'
+            backend.instances['win32_networkadapterconfiguration'][0]['IPAddress'] = ('192.168.0.3',)
+
+        mutations = [link_up, None, lambda: adapters.append({'Index': '2', 'Name': 'VPN Adapter'}), adapters.pop]
+        sleeps = []
+
+        def sleep(seconds):
+            sleeps.append(seconds)
+            if len(sleeps) <= len(mutations) and mutations[len(sleeps) - 1]:
+                mutations[len(sleeps) - 1]()
+
+        with patch('time.sleep', side_effect=sleep):
+            changes = list(test_adapters.watch(interval=1.0, max_interval=4.0, backoff=2.0, max_polls=7))
+
+        self.assertEqual([change[:5] for change in changes], [
+            ('changed', 0, 'ip_addresses', ['192.168.0.2', 'fe80::1'], ['192.168.0.3']),
+            ('changed', 1, 'net_connection_status', NicNetConnectionStatus(7), NicNetConnectionStatus(2)),
+            ('added', 2, None, None, None),
+            ('removed', 2, None, None, None),
+        ])
+        self.assertEqual(changes[2].snapshot.name, 'VPN Adapter')
+        self.assertEqual(sleeps, [1.0, 1.0, 2.0, 1.0, 1.0, 2.0, 4.0])
+        self.assertEqual(len(backend.calls), 2 * 8)
+        self.assertEqual(test_adapters.nic_table[0].ip_addresses, ['192.168.0.3'])
+
+    def test_watch_failures(self):
+        """Test that the watch method backs off after failed polls and raises after too many."""
+        test_adapters = NetworkAdapters(backend=_fake_backend())
+        with patch('time.sleep') as mock_sleep, patch('win_nic._network_adapters._query_snapshots',
+                                                      side_effect=OSError('wmic failed')):
+            with self.assertRaises(OSError):
+                list(test_adapters.watch(interval=1.0, backoff=3.0, max_failures=3))
+        self.assertEqual([call[0][0] for call in mock_sleep.call_args_list], [1.0, 3.0, 9.0])
+
+    def test_async_watch(self):
+        """Test the change events of the asynchronous watch method."""
+        backend = _fake_backend()
+        tables = [_query_snapshots(backend=backend)]
+        backend.instances['win32_networkadapter'][0]['Speed'] = '100000000'
+        tables.append(_query_snapshots(backend=backend))
+
+        async def query_snapshots(**_):
+            return tables.pop(0)
+
+        async def watch():
+            test_adapters = AsyncNetworkAdapters()
+            with patch('win_nic._async_network_adapters._query_snapshots_async', side_effect=query_snapshots):
+                await test_adapters.refresh()
+                return [change async for change in test_adapters.watch(interval=0.0, max_polls=1)]
+
+        changes = _run(watch())
+        self.assertEqual([change[:5] for change in changes], [('changed', 0, 'speed', 1000000000, 100000000)])
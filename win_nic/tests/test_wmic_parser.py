@@ -0,0 +1,62 @@
+"""Module containing WMIC output parser unit tests."""
+
+from unittest import TestCase
+
+from baseline import Baseline
+
+from .. import _wmic_parser
+
+
+# pylint: disable=too-many-public-methods
+class TestWmicParser(TestCase):
+
+    """Execute WMIC output parser unit tests."""
+
+    def test_iter_csv_rows(self):
+        """Test iter_csv_rows function."""
+        wmic_output = ('\r\r\nNode,Index,IPAddress,Name\r\r\nPC,0,{192.168.0.2;fe80::1},Ethernet  Adapter\r\r\n'
+                       'PC,1,,Wi-Fi Adapter\r\r\n')
+        rows = _wmic_parser.iter_csv_rows(wmic_output.splitlines(), {'Index': int})
+        self.assertEqual(str(list(rows)), Baseline("""
+            [{'Index': 0, 'IPAddress': ('192.168.0.2', 'fe80::1'), 'Name': 'Ethernet  Adapter'}, {'Index': 1, 'IPAddress': None, 'Name': 'Wi-Fi Adapter'}]
+            """))
+
+    def test_iter_value_records(self):
+        """Test iter_value_records function."""
+        wmic_output = ('\r\r\n\r\r\nIndex=0\r\r\nIPAddress={"192.168.0.2","fe80::1"}\r\r\n'
+                       'Name=Acme, Inc.  Adapter\r\r\n'
+                       '\r\r\n\r\r\nIndex=1\r\r\nIPAddress=\r\r\nName=\r\r\n\r\r\n\r\r\n')
+        records = _wmic_parser.iter_value_records(wmic_output.splitlines(), {'Index': int})
+        self.assertEqual(str(list(records)), Baseline("""
+            [{'Index': 0, 'IPAddress': ('192.168.0.2', 'fe80::1'), 'Name': 'Acme, Inc.  Adapter'}, {'Index': 1, 'IPAddress': None, 'Name': None}]
+            """))
+
+    def test_iter_value_records_is_lazy(self):
+        """Test that iter_value_records yields records before consuming all lines."""
+        consumed = []
+
+        def lines():
+            for line in ['Index=0', 'Name=A', 'Index=1', 'Name=B']:
+                consumed.append(line)
+                yield line
+
+        records = _wmic_parser.iter_value_records(lines())
+        self.assertEqual(next(records), {'Index': '0', 'Name': 'A'})
+        self.assertEqual(len(consumed), 3)
+
+    def test_parse_value(self):
+        """Test parse_value function."""
+        self.assertIsNone(_wmic_parser.parse_value('  '))
+        self.assertEqual(_wmic_parser.parse_value('{ABCDEFGH-IJKL}'), '{ABCDEFGH-IJKL}')
+        self.assertEqual(_wmic_parser.parse_value('{"192.168.0.2", "0:0:0:0:0:0:0:1"}'),
+                         ('192.168.0.2', '0:0:0:0:0:0:0:1'))
+        self.assertEqual(_wmic_parser.parse_value('{"a,b", "c d"}'), ('a,b', 'c d'))
+        self.assertEqual(_wmic_parser.parse_value('{}'), ())
+
+    def test_as_array(self):
+        """Test as_array function."""
+        self.assertEqual(_wmic_parser.as_array(None), ())
+        self.assertEqual(_wmic_parser.as_array('10.0.0.1'), ('10.0.0.1',))
+        self.assertEqual(_wmic_parser.as_array(_wmic_parser.parse_value('{10.0.0.1}')), ('10.0.0.1',))
+        self.assertEqual(_wmic_parser.as_array(_wmic_parser.parse_value('{"10.0.0.1", "fe80::1"}')),
+                         ('10.0.0.1', 'fe80::1'))
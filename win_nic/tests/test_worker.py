@@ -0,0 +1,82 @@
+"""Module containing persistent WMIC worker unit tests."""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from win_nic import Nic, WmicWorker, WmicWorkerPool, WorkerError
+
+
+# pylint: disable=line-too-long
+_RESPONSES = {
+    'path win32_networkadapter where index=0 get Speed': 'Speed\r\r\n1000000000\r\r\n\r\r\n',
+    'path win32_networkadapter where index=0 get Caption': 'Caption\r\r\n[00000000] Dummy Adapter\r\r\n\r\r\n',
+    'path win32_networkadapter where index=0 call Disable': 'Method execution successful.\r\r\nReturnValue = 5;\r\r\n',
+}
+
+
+# pylint: disable=too-many-public-methods, unused-argument
+class TestWorker(TestCase):
+
+    """Execute persistent WMIC worker unit tests against a scripted stand-in worker."""
+
+    def setUp(self):
+        """Write the canned responses and build the stand-in worker command line."""
+        responses_file = tempfile.NamedTemporaryFile('w', encoding='utf-8', suffix='.json', delete=False)
+        with responses_file:
+            json.dump(_RESPONSES, responses_file)
+        self.addCleanup(os.remove, responses_file.name)
+        self.command = [sys.executable, os.path.join(os.path.dirname(__file__), 'fake_worker.py'),
+                        responses_file.name]
+
+    def test_run(self):
+        """Test run method of the WmicWorker class."""
+        worker = WmicWorker(self.command)
+        self.addCleanup(worker.close)
+        self.assertEqual(worker.run(['path', 'win32_networkadapter', 'where', 'index=0', 'get', 'Speed']),
+                         'Speed\r\r\n1000000000\r\r\n\r\r\n')
+        with self.assertRaises(subprocess.CalledProcessError):
+            worker.run(['path', 'win32_networkadapter', 'where', 'index=9', 'get', 'Speed'])
+
+    def test_pipelining(self):
+        """Test that several requests can be in flight on one worker process."""
+        worker = WmicWorker(self.command)
+        self.addCleanup(worker.close)
+        futures = [worker.submit(['pid']) for _ in range(5)]
+        self.assertEqual(len({future.result(10)[1] for future in futures}), 1)
+
+    def test_health_check_restarts_worker(self):
+        """Test check_health method of the WmicWorker class."""
+        worker = WmicWorker(self.command, health_timeout=0.5)
+        self.addCleanup(worker.close)
+        first_pid = worker.run(['pid'], 10)
+        self.assertTrue(worker.check_health())
+        worker.submit(['hang'])
+        # The stand-in answers in order, so a ping queued behind a hung request times out.
+        self.assertFalse(worker.check_health())
+        self.assertNotEqual(worker.run(['pid'], 10), first_pid)
+
+    def test_worker_exit(self):
+        """Test that pending requests fail when the worker process exits."""
+        worker = WmicWorker(self.command)
+        self.addCleanup(worker.close)
+        with self.assertRaises(WorkerError):
+            worker.submit(['exit']).result(10)
+        self.assertEqual(worker.run(['path', 'win32_networkadapter', 'where', 'index=0', 'call', 'Disable'], 10),
+                         'Method execution successful.\r\r\nReturnValue = 5;\r\r\n')
+
+    @patch('subprocess.check_output', side_effect=AssertionError("wmic must not be launched"))
+    def test_pool_serves_nic(self, mocked_check_output):
+        """Test that an installed WmicWorkerPool serves Nic queries without launching wmic."""
+        with WmicWorkerPool(size=2, command=self.command) as pool:
+            test_nic = Nic(0)
+            self.assertEqual(test_nic.speed, 1000000000)
+            self.assertEqual(test_nic.caption, '[00000000] Dummy Adapter')
+            self.assertEqual(test_nic.disable(), 5)
+            self.assertEqual(pool.check_health(), 0)
+        with self.assertRaises(AssertionError):
+            Nic(0).speed  # pylint: disable=expression-not-assigned
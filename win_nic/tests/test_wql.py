@@ -0,0 +1,32 @@
+"""Module containing WQL where clause unit tests."""
+
+from unittest import TestCase
+
+from win_nic._wql import build_where, compile_where, quote
+from win_nic.enums.nic_net_connection_status import NicNetConnectionStatus
+
+
+class TestWql(TestCase):
+
+    """Execute WQL where clause unit tests."""
+
+    def test_build_where(self):
+        """Test building where clauses from predicates."""
+        self.assertEqual(quote("it's C:\\"), "'it\\'s C:\\\\'")
+        self.assertEqual(build_where([('NetConnectionStatus', NicNetConnectionStatus.CONNECTED),
+                                      ('Installed', False), ('NetConnectionID', 'vEthernet (*)_?')]),
+                         "NetConnectionStatus=2 AND Installed=FALSE AND NetConnectionID LIKE 'vEthernet (%)[_]_'")
+        self.assertIsNone(build_where([]))
+        with self.assertRaises(ValueError):
+            build_where([('Index', [])])
+
+    def test_compile_where(self):
+        """Test evaluating where clauses against raw property values."""
+        instance = {'Index': '3', 'Name': "O'Brien", 'PhysicalAdapter': 'TRUE', 'Speed': None}
+        self.assertTrue(compile_where("name = 'o\\'brien' AND physicaladapter=TRUE")(instance))
+        self.assertTrue(compile_where("NOT (Index=1 OR Index=2) AND Speed IS NULL")(instance))
+        self.assertFalse(compile_where("Name <> 'o\\'brien' OR Name LIKE 'B%'")(instance))
+        self.assertTrue(compile_where("Name IS NOT NULL AND Name LIKE '_\\'b%'")(instance))
+        for where in ('Speed > 100', 'Index=', '(Index=1', 'Index=1 Index=2'):
+            with self.assertRaises(ValueError):
+                compile_where(where)